@@ -0,0 +1,161 @@
+"""
+Analysis Memoization
+
+Content-addressed cache for deterministic per-article analysis results
+(risk analysis, relevance checks). Syndicated stories arrive from several
+providers with identical text; they share one key and are analyzed once.
+
+Two tiers:
+    - bounded in-process LRU
+    - optional persistent MongoDB collection (one document per key)
+
+Keys include the analyzer version, so a config change never returns a stale
+result.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(kind: str, version: str, *parts: Optional[str]) -> str:
+    """
+    Hash analyzer inputs into a cache key.
+
+    Parts are case-folded only: both analyzers lowercase their input, but
+    whitespace and punctuation can change which phrases match, so they are
+    kept as-is.
+    """
+    digest = hashlib.sha256(f"{kind}\x1f{version}".encode("utf-8"))
+    for part in parts:
+        digest.update(b"\x1e")
+        digest.update((part or "").lower().encode("utf-8"))
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Bounded LRU in front of an optional MongoDB collection.
+
+    Counters distinguish memory hits, persistent-store hits and misses so the
+    saved work can be reported per run (see snapshot/delta).
+    """
+
+    def __init__(self, kind: str, maxsize: int = 10000, collection=None):
+        self.kind = kind
+        self.maxsize = maxsize
+        self.collection = collection
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[dict]:
+        """Look up the in-process tier only"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return value
+
+    def put(self, key: str, value: dict):
+        """Store in the in-process tier only"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def record_miss(self, count: int = 1):
+        with self._lock:
+            self.misses += count
+
+    def record_hit(self, count: int = 1):
+        """Count lookups answered without analysis, e.g. duplicates within a batch"""
+        with self._lock:
+            self.memory_hits += count
+
+    async def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        """
+        Look up keys in memory, then the remainder in one store query.
+
+        Keys not found in either tier are counted as misses. Store errors
+        are logged and treated as misses; the cache never fails analysis.
+        """
+        found = {}
+        missing = []
+        for key in dict.fromkeys(keys):
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                missing.append(key)
+
+        if missing and self.collection is not None:
+            try:
+                async for doc in self.collection.find({"_id": {"$in": missing}}, {"result": 1}):
+                    found[doc["_id"]] = doc["result"]
+                    self.put(doc["_id"], doc["result"])
+            except Exception as e:
+                logger.warning(f"[AnalysisCache] {self.kind} store lookup failed: {str(e)}")
+            with self._lock:
+                self.store_hits += sum(1 for key in missing if key in found)
+
+        self.record_miss(sum(1 for key in missing if key not in found))
+        return found
+
+    async def put_many(self, items: Dict[str, dict]):
+        """Store results in memory and, if configured, the persistent tier"""
+        for key, value in items.items():
+            self.put(key, value)
+        if items and self.collection is not None:
+            now = datetime.now(timezone.utc)
+            try:
+                await self.collection.bulk_write([
+                    UpdateOne(
+                        {"_id": key},
+                        {"$setOnInsert": {"kind": self.kind, "result": value, "createdAt": now}},
+                        upsert=True
+                    )
+                    for key, value in items.items()
+                ], ordered=False)
+            except Exception as e:
+                logger.warning(f"[AnalysisCache] {self.kind} store write failed: {str(e)}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "memoryHits": self.memory_hits,
+                "storeHits": self.store_hits,
+                "misses": self.misses,
+            }
+
+    def delta(self, since: dict) -> dict:
+        """Counter changes since an earlier snapshot, with the hit rate"""
+        now = self.snapshot()
+        delta = {name: now[name] - since.get(name, 0) for name in now}
+        lookups = delta["memoryHits"] + delta["storeHits"] + delta["misses"]
+        delta["hitRate"] = round((lookups - delta["misses"]) / lookups * 100, 1) if lookups else 0
+        return delta
+
+    def stats(self) -> dict:
+        stats = self.delta({})
+        with self._lock:
+            stats["entries"] = len(self._entries)
+        stats["maxsize"] = self.maxsize
+        stats["persistent"] = self.collection is not None
+        return stats
@@ -0,0 +1,397 @@
+"""
+Shared HTTP Client
+
+One pooled httpx client for every outbound request: news provider APIs, the
+article scraper and the Google cache / Wayback Machine fallbacks. A fresh
+client per call pays DNS, TCP and TLS setup every time; the shared pool keeps
+connections alive per host and reuses them.
+
+    - timeout profiles per use case (TIMEOUT_PROFILES), applied per request
+    - at most `max_per_host` requests in flight per host, so a batch of
+      scrapes against one site reuses a few kept-alive connections instead of
+      opening one each
+    - a DNS result cache in front of the connection backend (TLS still
+      verifies the original host name), with Happy Eyeballs connection
+      racing over the cached addresses
+    - optional HTTP/2 (needs the h2 package, i.e. httpx[http2])
+    - request, connection and DNS counters plus the live pool state, see
+      metrics()
+
+The server starts the pool at startup and closes it at shutdown; outside the
+server it is created on first use.
+"""
+
+import asyncio
+import contextlib
+import importlib.util
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import httpcore
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Use case -> request settings. Timeouts match the per-call clients they replace.
+TIMEOUT_PROFILES = {
+    "api": {"timeout": httpx.Timeout(30.0), "follow_redirects": False},
+    "scrape": {"timeout": httpx.Timeout(15.0), "follow_redirects": True},
+    "archive": {"timeout": httpx.Timeout(10.0), "follow_redirects": True},
+}
+
+# Seconds before the next address of a host is tried while earlier attempts
+# are still connecting (RFC 8305 "Connection Attempt Delay")
+HAPPY_EYEBALLS_DELAY = 0.25
+
+# httpcore exceptions and the httpx exceptions raised for them, most specific first
+_MAPPED_ERRORS = [
+    (getattr(httpcore, name), getattr(httpx, name)) for name in (
+        "ConnectTimeout", "ReadTimeout", "WriteTimeout", "PoolTimeout", "TimeoutException",
+        "ConnectError", "ReadError", "WriteError", "NetworkError", "ProxyError", "UnsupportedProtocol",
+        "RemoteProtocolError", "LocalProtocolError", "ProtocolError",
+    )
+]
+
+
+@contextlib.contextmanager
+def map_httpcore_errors():
+    """Re-raise httpcore exceptions as their httpx counterparts"""
+    try:
+        yield
+    except Exception as e:
+        for core_type, httpx_type in _MAPPED_ERRORS:
+            if isinstance(e, core_type):
+                raise httpx_type(str(e)) from e
+        raise
+
+
+def interleave_families(addresses: List[str]) -> List[str]:
+    """Addresses alternating between IPv6 and IPv4, starting with the family of the first (RFC 8305)"""
+    if not addresses:
+        return []
+    first = ":" in addresses[0]
+    same = [address for address in addresses if (":" in address) == first]
+    other = [address for address in addresses if (":" in address) != first]
+    ordered = []
+    for index in range(max(len(same), len(other))):
+        ordered.extend(family[index] for family in (same, other) if index < len(family))
+    return ordered
+
+
+class HttpCounters:
+    """Cumulative request, connection and DNS counters (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.requests: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.connections_opened = 0
+        self.connections_by_host: Dict[str, int] = {}
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    def record_request(self, profile: str, failed: bool = False):
+        with self._lock:
+            self.requests[profile] = self.requests.get(profile, 0) + 1
+            if failed:
+                self.errors[profile] = self.errors.get(profile, 0) + 1
+
+    def record_connection(self, host: str):
+        with self._lock:
+            self.connections_opened += 1
+            self.connections_by_host[host] = self.connections_by_host.get(host, 0) + 1
+
+    def record_dns(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.dns_hits += 1
+            else:
+                self.dns_misses += 1
+
+    def to_dict(self, top_hosts: int = 20) -> dict:
+        with self._lock:
+            requests = sum(self.requests.values())
+            hosts = sorted(self.connections_by_host.items(), key=lambda item: -item[1])[:top_hosts]
+            return {
+                "uptimeSeconds": round(time.time() - self.started_at),
+                "requests": requests,
+                "requestsByProfile": dict(self.requests),
+                "errorsByProfile": dict(self.errors),
+                "connectionsOpened": self.connections_opened,
+                # Requests served on an already open connection
+                "connectionReuse": round(1 - self.connections_opened / requests, 4) if requests else None,
+                "connectionsByHost": dict(hosts),
+                "dnsHits": self.dns_hits,
+                "dnsMisses": self.dns_misses,
+            }
+
+
+class CachingResolverBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend that resolves host names through a TTL cache and counts
+    new connections. Connection attempts race over the addresses (Happy
+    Eyeballs): the next one starts when the previous fails or after
+    happy_eyeballs_delay, and the first to connect wins. The connection pool
+    passes the original host name on for TLS, so certificates are verified
+    against it, not the address.
+    """
+
+    def __init__(self, counters: HttpCounters, ttl: float = 300.0, backend: Optional[httpcore.AsyncNetworkBackend] = None,
+                 happy_eyeballs_delay: float = HAPPY_EYEBALLS_DELAY):
+        self.counters = counters
+        self.ttl = ttl
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache: Dict[str, Tuple[float, List[str]]] = {}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses of host, from the cache while fresh"""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+        cached = self._cache.get(host)
+        if cached is not None and cached[0] > time.monotonic():
+            self.counters.record_dns(hit=True)
+            return cached[1]
+        self.counters.record_dns(hit=False)
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = interleave_families(list(dict.fromkeys(info[4][0] for info in infos)))
+        self._cache[host] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    async def connect_tcp(self, host: str, port: int, timeout: Optional[float] = None,
+                          local_address: Optional[str] = None, socket_options=None) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self.resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        try:
+            stream = await self._race(addresses, port, timeout=timeout, local_address=local_address, socket_options=socket_options)
+        except (httpcore.ConnectError, httpcore.ConnectTimeout):
+            # Addresses may have changed since they were cached
+            self._cache.pop(host, None)
+            raise
+        if stream is None:
+            raise httpcore.ConnectError(f"No addresses for {host}")
+        self.counters.record_connection(host)
+        return stream
+
+    async def _race(self, addresses: List[str], port: int, **kwargs) -> Optional[httpcore.AsyncNetworkStream]:
+        """First stream to connect, staggering the attempts; the others are cancelled or closed"""
+        pending = set()
+        winner: Optional[httpcore.AsyncNetworkStream] = None
+        losers: List[httpcore.AsyncNetworkStream] = []
+        error: Optional[BaseException] = None
+
+        def collect(done):
+            nonlocal winner, error
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif winner is None:
+                    winner = task.result()
+                else:
+                    losers.append(task.result())
+
+        try:
+            for address in addresses:
+                pending.add(asyncio.ensure_future(self._backend.connect_tcp(address, port, **kwargs)))
+                done, pending = await asyncio.wait(pending, timeout=self.happy_eyeballs_delay, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+                if winner is not None:
+                    return winner
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                collect(done)
+        finally:
+            for task in pending:
+                task.cancel()
+            for result in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(result, httpcore.AsyncNetworkStream):
+                    losers.append(result)
+            for stream in losers:
+                await stream.aclose()
+        if winner is None and error is not None:
+            raise error
+        return winner
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+class PooledResponseStream(httpx.AsyncByteStream):
+    """Body of a PooledTransport response; closing it ends the request"""
+
+    def __init__(self, transport: "PooledTransport", stream):
+        self._transport = transport
+        self._stream = stream
+        self._closed = False
+
+    async def __aiter__(self):
+        with map_httpcore_errors():
+            async for part in self._stream:
+                yield part
+
+    async def aclose(self):
+        if not self._closed:
+            self._closed = True
+            self._transport.in_flight -= 1
+            with map_httpcore_errors():
+                await self._stream.aclose()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an httpcore connection pool that uses a
+    CachingResolverBackend. Wraps the pool through its public API only,
+    and counts the requests in flight (sent, body not yet closed).
+    """
+
+    def __init__(self, network_backend: httpcore.AsyncNetworkBackend, limits: httpx.Limits, http2: bool = False):
+        self.http2 = http2
+        self.in_flight = 0
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        self.in_flight += 1
+        try:
+            with map_httpcore_errors():
+                response = await self.pool.handle_async_request(core_request)
+        except BaseException:
+            self.in_flight -= 1
+            raise
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=PooledResponseStream(self, response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        await self.pool.aclose()
+
+    def pool_state(self) -> dict:
+        """Open connections by state, and requests waiting for one"""
+        connections = self.pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        active = len(connections) - idle
+        return {
+            "open": len(connections),
+            "idle": idle,
+            "active": active,
+            "inFlight": self.in_flight,
+            # An HTTP/1.1 connection serves one request at a time; HTTP/2
+            # multiplexes, so the queue cannot be told apart from the outside
+            "waiting": None if self.http2 else max(0, self.in_flight - active),
+        }
+
+
+class HttpClientPool:
+    """
+    The shared client. get()/request() take a TIMEOUT_PROFILES name and
+    return the fully read httpx.Response, like the per-call clients did.
+    """
+
+    def __init__(self, max_connections: int = 100, max_keepalive: int = 50, keepalive_expiry: float = 30.0,
+                 max_per_host: int = 6, http2: bool = False, dns_ttl: float = 300.0):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_per_host = max_per_host
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("[HTTP] HTTP/2 requested but the h2 package is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.dns_ttl = dns_ttl
+        self.counters = HttpCounters()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[PooledTransport] = None
+        # Per-host semaphores, dropped once a host has nothing in flight
+        self._host_limits: Dict[str, Tuple[asyncio.Semaphore, List[int]]] = {}
+
+    def start(self) -> httpx.AsyncClient:
+        """Create the client (if not running) and return it"""
+        if self._client is None or self._client.is_closed:
+            backend = CachingResolverBackend(self.counters, ttl=self.dns_ttl)
+            self._transport = PooledTransport(backend, self.limits, http2=self.http2)
+            self._client = httpx.AsyncClient(transport=self._transport)
+            # Semaphores belong to the event loop the client was started on
+            self._host_limits = {}
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._transport = None
+
+    async def request(self, method: str, url: str, profile: str = "api", **kwargs) -> httpx.Response:
+        client = self.start()
+        settings = {**TIMEOUT_PROFILES[profile], **kwargs}
+        host = httpx.URL(url).host
+        entry = self._host_limits.get(host)
+        if entry is None:
+            entry = self._host_limits[host] = (asyncio.Semaphore(self.max_per_host), [0])
+        limit, in_flight = entry
+        in_flight[0] += 1
+        try:
+            async with limit:
+                response = await client.request(method, url, **settings)
+        except Exception:
+            self.counters.record_request(profile, failed=True)
+            raise
+        finally:
+            in_flight[0] -= 1
+            if not in_flight[0] and self._host_limits.get(host) is entry:
+                del self._host_limits[host]
+        self.counters.record_request(profile)
+        return response
+
+    async def get(self, url: str, profile: str = "api", **kwargs) -> httpx.Response:
+        return await self.request("GET", url, profile, **kwargs)
+
+    def metrics(self) -> dict:
+        """Pool configuration, live pool state and cumulative counters"""
+        return {
+            "http2": self.http2,
+            "maxConnections": self.limits.max_connections,
+            "maxKeepalive": self.limits.max_keepalive_connections,
+            "keepaliveExpiry": self.limits.keepalive_expiry,
+            "maxPerHost": self.max_per_host,
+            "dnsTtl": self.dns_ttl,
+            "profiles": {name: settings["timeout"].read for name, settings in TIMEOUT_PROFILES.items()},
+            "pool": self._transport.pool_state() if self._transport is not None and self._client is not None else None,
+            **self.counters.to_dict(),
+        }
@@ -0,0 +1,438 @@
+"""
+ML Risk Engine
+
+CPU-only model for the "ml" engine slot: a hashing-trick featurizer and one
+logistic head per output, evaluated with NumPy over whole batches.
+
+Heads:
+    - one per risk category (multi-label)
+    - one per time horizon (argmax)
+    - risk score and recent risk score (score / 100 as a soft label)
+
+Weights live in a .npy file loaded with mmap_mode="r", so every process that
+loads the same model shares the page cache instead of holding its own copy.
+Labels are bootstrapped from the rule engine's stored outputs.
+
+Usage:
+    python ml_risk_engine.py train --out models/risk_ml
+    python ml_risk_engine.py train --out models/risk_ml --limit 50000 --epochs 5
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import string
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from risk_engine import (
+    DEFAULT_SCORING_POLICY,
+    RISK_CATEGORIES,
+    TIME_HORIZONS,
+    RiskAnalysis,
+    ScoringPolicy,
+    article_published_at,
+    category_mask,
+    category_strength_array,
+)
+from text_normalization import DEFAULT_TEXT_BUDGET, apply_text_budget, normalize_article
+
+logger = logging.getLogger(__name__)
+
+ROOT_DIR = Path(__file__).parent
+DEFAULT_MODEL_PATH = ROOT_DIR / "models" / "risk_ml"
+
+WEIGHTS_FILE = "weights.npy"
+METADATA_FILE = "model.json"
+
+# Tokens are whitespace-separated after punctuation (other than $ % -) becomes a space
+TOKEN_SEPARATORS = str.maketrans({char: " " for char in string.punctuation if char not in "$%-"})
+
+# Salts keep title tokens, bigrams and the source apart from body unigrams
+TITLE_SALT = 0x9E3779B1
+BIGRAM_MULTIPLIER = 1000003
+SOURCE_PREFIX = "source:"
+
+
+# ============== FEATURIZER ==============
+
+class HashingFeaturizer:
+    """
+    Maps article batches to a sparse (articles x n_features) matrix in CSR form.
+
+    Features are body unigrams and bigrams, title unigrams (hashed apart from
+    body ones) and the source name, weighted log(1 + count) and L2-normalized
+    per article. Hashes use crc32, so they are stable across processes.
+    """
+
+    # Distinct tokens whose hashes are kept between batches
+    token_cache_size = 200000
+
+    def __init__(self, n_features: int = 1 << 18):
+        self.n_features = n_features
+        self._token_hashes: Dict[str, int] = {}
+
+    def _hash_tokens(self, tokens: List[str]) -> np.ndarray:
+        cache = self._token_hashes
+        if len(cache) > self.token_cache_size:
+            cache.clear()
+        for token in set(tokens).difference(cache):
+            cache[token] = zlib.crc32(token.encode("utf-8"))
+        return np.fromiter(map(cache.__getitem__, tokens), dtype=np.uint64, count=len(tokens))
+
+    def transform(self, articles: List[dict]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns:
+            (indptr, indices, data) of the CSR feature matrix
+        """
+        n = len(articles)
+        body_tokens, title_tokens, source_tokens = [], [], []
+        body_lengths = np.zeros(n, dtype=np.int64)
+        title_lengths = np.zeros(n, dtype=np.int64)
+        for row, article in enumerate(articles):
+            normalized = normalize_article(article)
+            tokens = normalized.title.translate(TOKEN_SEPARATORS).split()
+            title_tokens.extend(tokens)
+            title_lengths[row] = len(tokens)
+            body_tokens.extend(tokens)
+            tokens = normalized.body.translate(TOKEN_SEPARATORS).split()
+            body_tokens.extend(tokens)
+            body_lengths[row] = title_lengths[row] + len(tokens)
+            source_tokens.append(SOURCE_PREFIX + normalized.source)
+
+        # Bigrams pair consecutive tokens of the same article
+        body = self._hash_tokens(body_tokens)
+        body_rows = np.repeat(np.arange(n, dtype=np.int64), body_lengths)
+        same_article = body_rows[:-1] == body_rows[1:]
+        bigrams = (body[:-1] * np.uint64(BIGRAM_MULTIPLIER) ^ body[1:])[same_article]
+        has_source = np.array([token != SOURCE_PREFIX for token in source_tokens], dtype=bool)
+
+        rows = np.concatenate((
+            body_rows,
+            body_rows[:-1][same_article],
+            np.repeat(np.arange(n, dtype=np.int64), title_lengths),
+            np.flatnonzero(has_source),
+        ))
+        hashes = np.concatenate((
+            body,
+            bigrams,
+            self._hash_tokens(title_tokens) ^ np.uint64(TITLE_SALT),
+            self._hash_tokens(source_tokens)[has_source],
+        ))
+        columns = (hashes % np.uint64(self.n_features)).astype(np.int64)
+        cells, counts = np.unique(rows * self.n_features + columns, return_counts=True)
+        indptr = np.searchsorted(cells // self.n_features, np.arange(n + 1))
+        indices = cells % self.n_features
+        data = np.log1p(counts).astype(np.float32)
+
+        norms = np.zeros(n, dtype=np.float32)
+        nonempty = indptr[:-1] < indptr[1:]
+        if len(data):
+            norms[nonempty] = np.sqrt(np.add.reduceat(data * data, indptr[:-1][nonempty]))
+        data /= np.repeat(np.where(norms > 0, norms, 1), np.diff(indptr))
+        return indptr, indices, data
+
+
+def _sparse_dot(indptr: np.ndarray, indices: np.ndarray, data: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """CSR matrix times dense (n_features x heads) weights"""
+    n = len(indptr) - 1
+    result = np.zeros((n, weights.shape[1]), dtype=np.float32)
+    if len(indices):
+        nonempty = indptr[:-1] < indptr[1:]
+        result[nonempty] = np.add.reduceat(weights[indices] * data[:, None], indptr[:-1][nonempty], axis=0)
+    return result
+
+
+def _sigmoid(logits: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(logits, -30, 30)))
+
+
+# ============== MODEL ==============
+
+def model_heads(categories: Iterable[str]) -> List[str]:
+    """Output heads in weight-column order"""
+    return (
+        [f"category:{category}" for category in categories]
+        + [f"horizon:{horizon}" for horizon in TIME_HORIZONS]
+        + ["score", "recent_score"]
+    )
+
+
+def head_targets(risk_data: List[dict], heads: List[str]) -> np.ndarray:
+    """Training targets (articles x heads) from stored rule engine outputs"""
+    targets = np.zeros((len(risk_data), len(heads)), dtype=np.float32)
+    column = {head: i for i, head in enumerate(heads)}
+    for row, result in enumerate(risk_data):
+        for category in result.get("risk_categories") or []:
+            if f"category:{category}" in column:
+                targets[row, column[f"category:{category}"]] = 1
+        horizon = f"horizon:{result.get('time_horizon') or 'NEAR_2_8W'}"
+        if horizon in column:
+            targets[row, column[horizon]] = 1
+        score = result.get("risk_score") or 0
+        targets[row, column["score"]] = score / 100
+        targets[row, column["recent_score"]] = (result.get("recent_risk_score") or score) / 100
+    return targets
+
+
+def train_model(articles: List[dict], risk_data: List[dict], out: Path,
+                categories: Optional[List[str]] = None, n_features: int = 1 << 18,
+                epochs: int = 5, batch_size: int = 256, learning_rate: float = 0.5,
+                l2: float = 1e-6, seed: int = 0, label_source: str = "") -> dict:
+    """
+    Fit all heads with minibatch AdaGrad on the logistic loss and save the model.
+
+    Args:
+        articles: Article dicts (title, fullContent/summary, source)
+        risk_data: Rule engine output for each article (the labels)
+        out: Model directory; weights.npy and model.json are written there
+        categories: Category heads; defaults to the built-in categories plus
+            any other category found in the labels
+        label_source: Engine version the labels came from, for the metadata
+
+    Returns:
+        Model metadata
+    """
+    if categories is None:
+        # Built-in categories first, then any custom ones the labels use
+        labelled = {category for result in risk_data for category in result.get("risk_categories") or []}
+        categories = RISK_CATEGORIES + sorted(labelled - set(RISK_CATEGORIES))
+    heads = model_heads(categories)
+    featurizer = HashingFeaturizer(n_features)
+    targets = head_targets(risk_data, heads)
+
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((n_features, len(heads)), dtype=np.float32)
+    bias = np.zeros(len(heads), dtype=np.float32)
+    # Start each head at its base rate
+    base_rate = np.clip(targets.mean(axis=0), 1e-3, 1 - 1e-3) if len(targets) else np.full(len(heads), 0.5)
+    bias[:] = np.log(base_rate / (1 - base_rate))
+    weight_sq = np.full_like(weights, 1e-8)
+    bias_sq = np.full_like(bias, 1e-8)
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(articles))
+        losses = []
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            indptr, indices, data = featurizer.transform([articles[i] for i in batch])
+            probabilities = _sigmoid(_sparse_dot(indptr, indices, data, weights) + bias)
+            target = targets[batch]
+            error = (probabilities - target) / len(batch)
+            losses.append(float(-np.mean(
+                target * np.log(probabilities + 1e-7) + (1 - target) * np.log(1 - probabilities + 1e-7)
+            )))
+
+            # Sparse gradient: only touched feature rows are updated
+            rows = np.repeat(np.arange(len(batch)), np.diff(indptr))
+            touched, inverse = np.unique(indices, return_inverse=True)
+            gradient = np.zeros((len(touched), len(heads)), dtype=np.float32)
+            np.add.at(gradient, inverse, error[rows] * data[:, None])
+            gradient += l2 * weights[touched]
+            weight_sq[touched] += gradient * gradient
+            weights[touched] -= learning_rate * gradient / np.sqrt(weight_sq[touched])
+
+            bias_gradient = error.sum(axis=0)
+            bias_sq += bias_gradient * bias_gradient
+            bias -= learning_rate * bias_gradient / np.sqrt(bias_sq)
+        logger.info(f"[MLRiskEngine] epoch {epoch + 1}/{epochs}: loss {np.mean(losses) if losses else 0:.4f}")
+
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    np.save(out / WEIGHTS_FILE, np.vstack((weights, bias[None, :])))
+    digest = hashlib.sha256((out / WEIGHTS_FILE).read_bytes()).hexdigest()[:16]
+    metadata = {
+        "version": f"ml-{digest}",
+        "heads": heads,
+        "categories": list(categories),
+        "nFeatures": n_features,
+        "samples": len(articles),
+        "epochs": epochs,
+        "labelSource": label_source,
+        "trainedAt": datetime.now(timezone.utc).isoformat(),
+    }
+    (out / METADATA_FILE).write_text(json.dumps(metadata, indent=2))
+    return metadata
+
+
+# ============== ENGINE ==============
+
+class MLRiskEngine:
+    """
+    Batched inference with a trained hashing model.
+
+    Produces the same RiskAnalysis fields as the rule engine; bands come from
+    the scoring policy. There is no text feature record or term index, so
+    features is None and trigger_terms is empty.
+    """
+
+    def __init__(self, path: Path = DEFAULT_MODEL_PATH, policy: Optional[ScoringPolicy] = None,
+                 threshold: float = 0.5, batch_size: int = 500):
+        path = Path(path)
+        if not (path / WEIGHTS_FILE).exists():
+            raise FileNotFoundError(
+                f"No ML risk model at {path}; train one with `python ml_risk_engine.py train --out {path}`"
+            )
+        self.path = path
+        self.metadata = json.loads((path / METADATA_FILE).read_text())
+        self.version = self.metadata["version"]
+        self.categories: List[str] = self.metadata["categories"]
+        self.heads: List[str] = self.metadata["heads"]
+        self.policy = policy or DEFAULT_SCORING_POLICY
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.featurizer = HashingFeaturizer(self.metadata["nFeatures"])
+
+        # Memory-mapped: pages are read on demand and shared between processes
+        matrix = np.load(path / WEIGHTS_FILE, mmap_mode="r")
+        self.weights = matrix[:-1]
+        self.bias = np.array(matrix[-1])
+
+        column = {head: i for i, head in enumerate(self.heads)}
+        self._category_columns = np.array([column[f"category:{c}"] for c in self.categories])
+        self._horizon_columns = np.array([column[f"horizon:{h}"] for h in TIME_HORIZONS])
+        self._score_column = column["score"]
+        self._recent_column = column["recent_score"]
+
+    def analyze(self, article: dict) -> RiskAnalysis:
+        return self.analyze_batch([article])[0]
+
+    def analyze_batch(self, articles: List[dict]) -> List[RiskAnalysis]:
+        """Analyze articles in input order, batch_size at a time"""
+        results = []
+        for start in range(0, len(articles), self.batch_size):
+            results.extend(self._analyze_batch(articles[start:start + self.batch_size]))
+        return results
+
+    def predict(self, articles: List[dict]) -> np.ndarray:
+        """Head probabilities (articles x heads)"""
+        indptr, indices, data = self.featurizer.transform(articles)
+        return _sigmoid(_sparse_dot(indptr, indices, data, self.weights) + self.bias)
+
+    def _analyze_batch(self, articles: List[dict]) -> List[RiskAnalysis]:
+        if not articles:
+            return []
+        probabilities = self.predict(articles)
+        category_p = probabilities[:, self._category_columns]
+        horizons = np.argmax(probabilities[:, self._horizon_columns], axis=1)
+        scores = np.rint(probabilities[:, self._score_column] * 100).astype(int)
+        recent_scores = np.maximum(scores, np.rint(probabilities[:, self._recent_column] * 100).astype(int))
+        # Confidence: how decided the category heads are, 50 (coin flip) to 100
+        confidence = np.rint(np.maximum(category_p, 1 - category_p).mean(axis=1) * 100).astype(int)
+
+        results = []
+        for row, article in enumerate(articles):
+            detected = [self.categories[i] for i in np.flatnonzero(category_p[row] >= self.threshold)]
+            score, recent_score = int(scores[row]), int(recent_scores[row])
+            strength = {
+                category: int(round(float(category_p[row, self.categories.index(category)]) * 100))
+                for category in detected
+            }
+            results.append(RiskAnalysis(
+                risk_score=score,
+                risk_band=self.policy.band(score),
+                risk_categories=detected,
+                confidence=int(confidence[row]),
+                time_horizon=TIME_HORIZONS[horizons[row]],
+                category_strength=strength,
+                recent_risk_score=recent_score,
+                recent_risk_band=self.policy.band(recent_score),
+                risk_category_mask=category_mask(detected),
+                category_strength_array=category_strength_array(strength),
+                published_at=article_published_at(article),
+            ))
+        return results
+
+
+# ============== TRAINING COMMAND ==============
+
+# Article fields needed for training: text inputs and the stored rule output
+TRAINING_PROJECTION = {
+    "_id": 0, "title": 1, "fullContent": 1, "summary": 1, "source": 1,
+    "risk_score": 1, "recent_risk_score": 1, "risk_categories": 1, "time_horizon": 1,
+    "riskEngineVersion": 1,
+}
+
+# Training reads at most this many articles unless --limit says otherwise,
+# each with its content cut to the text budget, so memory stays bounded
+DEFAULT_TRAINING_LIMIT = 100000
+DEFAULT_TRAINING_TEXT_BUDGET = DEFAULT_TEXT_BUDGET or 5000
+
+
+def load_training_data(mongo_url: str, db_name: str, limit: int = DEFAULT_TRAINING_LIMIT,
+                       text_budget: int = DEFAULT_TRAINING_TEXT_BUDGET) -> Tuple[List[dict], str]:
+    """
+    Read articles scored by the rule engine from news_articles.
+
+    Articles are read in cursor batches and each one's content is cut to
+    `text_budget` characters (see apply_text_budget) as it arrives, so only
+    the budgeted text is held. A limit or budget of 0 means no bound.
+
+    Returns:
+        (articles, label source) where label source names the most common
+        riskEngineVersion among the labels
+    """
+    from pymongo import MongoClient
+
+    client = MongoClient(mongo_url)
+    try:
+        cursor = client[db_name].news_articles.find(
+            {"riskEngineVersion": {"$exists": True}, "risk_score": {"$exists": True}},
+            TRAINING_PROJECTION
+        ).sort("riskAnalyzedAt", -1)
+        if limit:
+            cursor = cursor.limit(limit)
+        articles = []
+        for article in cursor.batch_size(1000):
+            for field in ("fullContent", "summary"):
+                if article.get(field):
+                    article[field] = apply_text_budget(article[field], text_budget)[0]
+            articles.append(article)
+    finally:
+        client.close()
+    versions: Dict[str, int] = {}
+    for article in articles:
+        versions[article["riskEngineVersion"]] = versions.get(article["riskEngineVersion"], 0) + 1
+    label_source = max(versions, key=versions.get) if versions else ""
+    return articles, label_source
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the ML risk engine from stored rule engine outputs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train = subparsers.add_parser("train")
+    train.add_argument("--out", type=Path, default=DEFAULT_MODEL_PATH, help="Model directory")
+    train.add_argument("--limit", type=int, default=DEFAULT_TRAINING_LIMIT,
+                       help=f"Use at most this many (most recently scored) articles; "
+                            f"0 for all (default {DEFAULT_TRAINING_LIMIT})")
+    train.add_argument("--text-budget", type=int, default=DEFAULT_TRAINING_TEXT_BUDGET,
+                       help=f"Content characters kept per article; 0 for all (default {DEFAULT_TRAINING_TEXT_BUDGET})")
+    train.add_argument("--epochs", type=int, default=5)
+    train.add_argument("--features", type=int, default=1 << 18, help="Hashed feature space size")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    from dotenv import load_dotenv
+    load_dotenv(ROOT_DIR / '.env')
+
+    articles, label_source = load_training_data(
+        os.environ['MONGO_URL'], os.environ['DB_NAME'], args.limit, args.text_budget
+    )
+    if not articles:
+        raise SystemExit("No rule-scored articles found in news_articles")
+    logger.info(f"[MLRiskEngine] training on {len(articles)} articles labelled by {label_source}")
+    metadata = train_model(
+        articles, articles, args.out,
+        n_features=args.features, epochs=args.epochs, label_source=label_source
+    )
+    logger.info(f"[MLRiskEngine] saved {metadata['version']} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
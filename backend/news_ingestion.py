@@ -0,0 +1,596 @@
+"""
+News Ingestion Pipeline
+
+Provider adapters and the staged pipeline that turns their results into
+stored articles:
+
+    fetch -> normalize -> dedupe -> relevance -> sink
+
+The unit of work is one provider's result list for one query (a
+ProviderBatch). Stages run as concurrent tasks connected by bounded queues,
+so while one batch is being written the next is being checked and further
+requests are in flight; a slow sink fills the queues and pauses fetching
+(backpressure). Each stage records batches, items in/out, busy time and a
+per-batch latency histogram.
+
+Adding a provider means writing one ProviderAdapter: the request URL, where
+the results are in the response, and the mapping of one result to article
+fields. The pipeline adds the fields every article shares (id, apiSource,
+normalizedLink, fetchedAt, isHidden).
+
+Incremental fetching: each (query, provider) pair has a high-water mark,
+the newest publish time seen and a fingerprint of the last response.
+Providers that can filter by time (GDELT) are asked only for items newer
+than the mark, less WATERMARK_OVERLAP; a response whose fingerprint is
+unchanged skips all per-article stages. The sink stores the new marks once
+the batch is written.
+
+The pipeline knows nothing about the database: relevance, the seen-link
+check, the stored marks and the sink are passed in by the server.
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from risk_shadow import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Batches buffered between two stages
+DEFAULT_QUEUE_SIZE = 8
+# GDELT answers more than one request per 5 seconds with an error message
+GDELT_MIN_INTERVAL = 5.0
+# Incremental requests re-read this far before the high-water mark, for
+# items indexed late
+WATERMARK_OVERLAP = timedelta(hours=1)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """UTC datetime of an ISO 8601 timestamp, None if missing or invalid"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def normalize_url(url: str) -> str:
+    """Normalize URL for duplicate detection - remove trailing slashes, www, etc."""
+    if not url:
+        return ""
+    url = url.lower().strip()
+    # Remove trailing slash
+    url = url.rstrip('/')
+    # Remove www. prefix
+    if '://www.' in url:
+        url = url.replace('://www.', '://')
+    # Remove query parameters for comparison (optional - be careful with this)
+    return url
+
+
+# ============== PROVIDER ADAPTERS ==============
+
+class ProviderAdapter(ABC):
+    """
+    One news API. Subclasses set `name` and implement url(), results() and
+    to_article(); fetch() may be overridden for anything else. Adapters
+    whose url() honors `since` set supports_since.
+
+    The provider's limits: at most `concurrency` requests in flight during a
+    run, and consecutive requests started at least `min_interval` seconds
+    apart (across all of the adapter's workers).
+    """
+
+    name = ""
+    headers: Optional[dict] = None
+    supports_since = False
+
+    def __init__(self, http_pool, concurrency: int = 1, min_interval: float = 0.0):
+        self.http_pool = http_pool
+        self.concurrency = max(1, concurrency)
+        self.min_interval = max(0.0, min_interval)
+        self._pace_lock = asyncio.Lock()
+        self._next_request = 0.0
+
+    def limits(self) -> dict:
+        return {"concurrency": self.concurrency, "minInterval": self.min_interval}
+
+    async def pace(self):
+        """Wait until min_interval has passed since the previous request started"""
+        if not self.min_interval:
+            return
+        async with self._pace_lock:
+            wait = self._next_request - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_request = time.monotonic() + self.min_interval
+
+    @abstractmethod
+    def url(self, query: str, since: Optional[datetime] = None) -> str:
+        """Request URL for a query (items newer than `since` if supports_since)"""
+
+    @abstractmethod
+    def results(self, data: dict) -> List[dict]:
+        """The result list of a decoded response"""
+
+    def published_at(self, result: dict) -> Optional[datetime]:
+        """Publish time of a result, if the provider gives one"""
+        return None
+
+    @abstractmethod
+    def to_article(self, result: dict, query: str) -> Optional[Tuple[dict, Tuple[str, str, str]]]:
+        """
+        (provider-specific article fields, relevance inputs) of one result,
+        or None to skip it. The fields must include "link" and "queries";
+        relevance inputs are (title, snippet, source name).
+        """
+
+    def fingerprint(self, results: List[dict]) -> str:
+        """Order-insensitive hash of the links and titles of a response"""
+        entries = []
+        for result in results:
+            mapped = self.to_article(result, "")
+            if mapped is not None:
+                entries.append(f"{normalize_url(mapped[0]['link'])}\t{mapped[0]['title']}")
+        return hashlib.blake2b("\n".join(sorted(entries)).encode("utf-8"), digest_size=16).hexdigest()
+
+    async def fetch(self, query: str, since: Optional[datetime] = None) -> List[dict]:
+        """Fetch results for a query (newer than `since` if supported); errors are logged and give no results"""
+        try:
+            await self.pace()
+            response = await self.http_pool.get(self.url(query, since), profile="api", headers=self.headers)
+            response.raise_for_status()
+            results = self.results(response.json())
+            logger.info(f"[{self.name}] Fetched {len(results)} articles for query: {query}")
+            return results
+        except Exception as e:
+            logger.error(f"[{self.name}] Error fetching news for query '{query}': {str(e)}")
+            return []
+
+
+class SerpApiAdapter(ProviderAdapter):
+    """Google News results through SerpAPI"""
+
+    name = "SerpAPI"
+
+    def __init__(self, http_pool, api_key: str, concurrency: int = 1, min_interval: float = 0.0):
+        super().__init__(http_pool, concurrency, min_interval)
+        self.api_key = api_key
+
+    def url(self, query: str, since: Optional[datetime] = None) -> str:
+        return f"https://serpapi.com/search?api_key={self.api_key}&engine=google_news&gl=us&q={query.replace(' ', '+')}"
+
+    def results(self, data: dict) -> List[dict]:
+        return data.get("news_results", [])
+
+    def published_at(self, result: dict) -> Optional[datetime]:
+        return parse_timestamp(result.get("iso_date"))
+
+    async def fetch(self, query: str, since: Optional[datetime] = None) -> List[dict]:
+        if not self.api_key:
+            logger.error("SERPAPI_KEY not configured")
+            return []
+        return await super().fetch(query, since)
+
+    def to_article(self, result: dict, query: str):
+        link = result.get("link", "")
+        if not link:
+            return None
+        title = result.get("title", "")
+        source = result.get("source") or {}
+        article = {
+            "position": result.get("position", 0),
+            "title": title,
+            "source": source,
+            "link": link,
+            "thumbnail": result.get("thumbnail"),
+            "thumbnail_small": result.get("thumbnail_small"),
+            "date": result.get("date"),
+            "iso_date": result.get("iso_date"),
+            "queries": [query],  # Array of queries this article belongs to
+        }
+        return article, (title, result.get("snippet", ""), source.get("name", ""))
+
+
+class GdeltAdapter(ProviderAdapter):
+    """GDELT Project DOC API"""
+
+    name = "GDELT"
+    supports_since = True
+    # startdatetime only reaches this far back
+    max_lookback = timedelta(days=90)
+
+    def __init__(self, http_pool, concurrency: int = 1, min_interval: float = GDELT_MIN_INTERVAL):
+        super().__init__(http_pool, concurrency, min_interval)
+
+    def url(self, query: str, since: Optional[datetime] = None) -> str:
+        encoded_query = query.replace(' ', '%20')
+        url = f"https://api.gdeltproject.org/api/v2/doc/doc?query={encoded_query}&mode=ArtList&format=json&maxrecords=50"
+        if since is not None and since > datetime.now(timezone.utc) - self.max_lookback:
+            url += f"&startdatetime={since.strftime('%Y%m%d%H%M%S')}"
+        return url
+
+    def results(self, data: dict) -> List[dict]:
+        # GDELT returns articles in "articles" array
+        return data.get("articles", [])
+
+    def published_at(self, result: dict) -> Optional[datetime]:
+        try:
+            return datetime.strptime(result.get("seendate", ""), "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+
+    def to_article(self, result: dict, query: str):
+        link = result.get("url", "")
+        if not link:
+            return None
+        title = result.get("title", "")
+        source_name = result.get("domain", result.get("sourcecountry", ""))
+
+        # Parse GDELT date format (YYYYMMDDTHHMMSSZ)
+        gdelt_date = result.get("seendate", "")
+        iso_date = None
+        if gdelt_date:
+            try:
+                # Convert GDELT date format to ISO
+                iso_date = f"{gdelt_date[:4]}-{gdelt_date[4:6]}-{gdelt_date[6:8]}T{gdelt_date[9:11]}:{gdelt_date[11:13]}:{gdelt_date[13:15]}Z"
+            except (IndexError, ValueError):
+                iso_date = None
+
+        article = {
+            "position": 0,
+            "title": title,
+            "source": {
+                "name": source_name or "Unknown",
+                "icon": None
+            },
+            "link": link,
+            "thumbnail": result.get("socialimage"),
+            "thumbnail_small": result.get("socialimage"),
+            "date": gdelt_date,
+            "iso_date": iso_date,
+            "queries": [query],
+        }
+        return article, (title, "", source_name)
+
+
+class MediaStackAdapter(ProviderAdapter):
+    """MediaStack news API (rate limited - weekly only)"""
+
+    name = "MediaStack"
+    headers = {"Accept": "application/json"}
+
+    def __init__(self, http_pool, access_key: str, concurrency: int = 1, min_interval: float = 0.0):
+        super().__init__(http_pool, concurrency, min_interval)
+        self.access_key = access_key
+
+    def url(self, query: str, since: Optional[datetime] = None) -> str:
+        encoded_query = query.replace(' ', '%20')
+        # Note: Removed categories filter as it was returning 0 results with country filter
+        return f"https://api.mediastack.com/v1/news?access_key={self.access_key}&keywords={encoded_query}&languages=en&countries=us,cn,tw,in,jp,kr,de&sort=published_desc&limit=25"
+
+    def results(self, data: dict) -> List[dict]:
+        # MediaStack returns articles in "data" array
+        return data.get("data", [])
+
+    def published_at(self, result: dict) -> Optional[datetime]:
+        return parse_timestamp(result.get("published_at"))
+
+    async def fetch(self, query: str, since: Optional[datetime] = None) -> List[dict]:
+        if not self.access_key:
+            logger.error("MEDIASTACK_KEY not configured")
+            return []
+        return await super().fetch(query, since)
+
+    def to_article(self, result: dict, query: str):
+        link = result.get("url", "")
+        if not link:
+            return None
+        title = result.get("title", "")
+        source_name = result.get("source", "")
+
+        # Parse MediaStack date format
+        published_at = result.get("published_at", "")
+        article = {
+            "position": 0,
+            "title": title,
+            "source": {
+                "name": source_name or "Unknown",
+                "icon": None
+            },
+            "link": link,
+            "thumbnail": result.get("image"),
+            "thumbnail_small": result.get("image"),
+            "date": published_at,
+            "iso_date": published_at if published_at else None,
+            "queries": [query],
+        }
+        return article, (title, result.get("description", ""), source_name)
+
+
+# ============== PIPELINE ==============
+
+class ProviderBatch:
+    """One provider's results for one query, as it moves through the stages"""
+
+    __slots__ = ("adapter", "query", "results", "since", "unchanged", "watermark",
+                 "candidates", "relevant", "tag_only", "filtered", "counts")
+
+    def __init__(self, adapter: ProviderAdapter, query: str, results: List[dict], since: Optional[datetime] = None):
+        self.adapter = adapter
+        self.query = query
+        self.results = results
+        self.since = since
+        # Same response as the last run: per-article stages are skipped
+        self.unchanged = False
+        # High-water mark to store once the batch is written
+        # (lastPublishedAt, fingerprint), None to keep the stored one
+        self.watermark: Optional[dict] = None
+        # (article document, relevance inputs), after normalize/dedupe
+        self.candidates: List[Tuple[dict, Tuple[str, str, str]]] = []
+        # Relevant documents to upsert, and normalized links of irrelevant
+        # results that may already be stored (only the query is added)
+        self.relevant: List[dict] = []
+        self.tag_only: List[str] = []
+        self.filtered = 0
+        # Set by the sink: new, existing, filtered
+        self.counts: Dict[str, int] = {}
+
+    @property
+    def provider(self) -> str:
+        return self.adapter.name
+
+
+class StageMetrics:
+    """Batches, items and busy time of one stage in one run"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.batches = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.max_backlog = 0
+        self.latency = LatencyHistogram()
+
+    def observe(self, seconds: float, items_in: int, items_out: int):
+        self.batches += 1
+        self.items_in += items_in
+        self.items_out += items_out
+        self.busy_seconds += seconds
+        self.latency.observe(seconds * 1000)
+
+    def to_dict(self, wall_seconds: float) -> dict:
+        latency = self.latency.to_dict()
+        return {
+            "batches": self.batches,
+            "itemsIn": self.items_in,
+            "itemsOut": self.items_out,
+            "errors": self.errors,
+            "busySeconds": round(self.busy_seconds, 3),
+            # Items per second of stage work, and over the whole run
+            "itemsPerBusySec": round(self.items_in / self.busy_seconds, 1) if self.busy_seconds > 0 else None,
+            "itemsPerSec": round(self.items_in / wall_seconds, 1) if wall_seconds > 0 else None,
+            "utilization": round(self.busy_seconds / wall_seconds, 3) if wall_seconds > 0 else None,
+            "maxBacklog": self.max_backlog,
+            "latency": {name: latency[name] for name in ("count", "meanMs", "maxMs", "p50Ms", "p99Ms")},
+        }
+
+
+STAGES = ("fetch", "normalize", "dedupe", "relevance", "sink")
+
+
+class IngestionPipeline:
+    """
+    One ingestion run over queries x adapters.
+
+    Args:
+        adapters: providers to fetch from; each runs `concurrency` fetch workers
+        relevance: (title, snippet, source name) -> relevance dict
+        might_contain: normalized link -> False if it is definitely not stored
+        sink: writes a batch (and its watermark) and sets batch.counts
+        queue_size: batches buffered between two stages
+        watermarks: stored (query, provider) -> {lastPublishedAt, fingerprint}
+    """
+
+    def __init__(self, adapters: List[ProviderAdapter], relevance: Callable[[str, str, str], dict],
+                 might_contain: Callable[[str], bool], sink: Callable[[ProviderBatch], Awaitable[None]],
+                 queue_size: int = DEFAULT_QUEUE_SIZE, watermarks: Optional[Dict[Tuple[str, str], dict]] = None):
+        self.adapters = adapters
+        self.relevance = relevance
+        self.might_contain = might_contain
+        self.sink = sink
+        self.queue_size = queue_size
+        self.watermarks = watermarks or {}
+        self.incremental = 0
+        self.unchanged = 0
+        self.metrics = {name: StageMetrics(name) for name in STAGES}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Normalized links handled per query, across its providers
+        self._query_seen: Dict[str, set] = {}
+
+    async def run(self, queries: List[str]) -> List[ProviderBatch]:
+        """Run every query through every adapter; returns the written batches"""
+        self.started_at = time.monotonic()
+        queues = [asyncio.Queue(self.queue_size) for _ in STAGES[1:]]
+        done: List[ProviderBatch] = []
+        tasks = [
+            asyncio.create_task(self._fetch_stage(queries, queues[0])),
+            asyncio.create_task(self._stage("normalize", self._normalize, queues[0], queues[1])),
+            asyncio.create_task(self._stage("dedupe", self._dedupe, queues[1], queues[2])),
+            asyncio.create_task(self._stage("relevance", self._check_relevance, queues[2], queues[3])),
+            asyncio.create_task(self._stage("sink", self._sink, queues[3], None, done)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.finished_at = time.monotonic()
+        return done
+
+    async def _fetch_stage(self, queries: List[str], outbox: asyncio.Queue):
+        """`concurrency` workers per adapter, each taking the next query in order"""
+        metrics = self.metrics["fetch"]
+
+        async def worker(adapter: ProviderAdapter, pending: List[str]):
+            while pending:
+                query = pending.pop(0)
+                mark = self.watermarks.get((query, adapter.name)) or {}
+                since = parse_timestamp(mark.get("lastPublishedAt")) if adapter.supports_since else None
+                if since is not None:
+                    since -= WATERMARK_OVERLAP
+                    self.incremental += 1
+                start = time.perf_counter()
+                results = await adapter.fetch(query, since=since)
+                batch = ProviderBatch(adapter, query, results, since)
+                try:
+                    self._advance_watermark(batch, mark)
+                except Exception as e:
+                    # A malformed response costs its own batch, not the run
+                    metrics.errors += 1
+                    logger.error(f"[Ingestion] fetch failed for {adapter.name} query '{query}': {str(e)}")
+                    continue
+                metrics.observe(time.perf_counter() - start, 1, len(results))
+                # Blocks while downstream stages are behind
+                await outbox.put(batch)
+
+        workers = []
+        for adapter in self.adapters:
+            pending = list(queries)
+            workers.extend(worker(adapter, pending) for _ in range(adapter.concurrency))
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            await outbox.put(None)
+
+    def _advance_watermark(self, batch: ProviderBatch, mark: dict):
+        """Compare the response with the stored fingerprint and set the batch's new mark"""
+        # An empty response may be an error; it never moves the mark
+        if not batch.results:
+            return
+        fingerprint = batch.adapter.fingerprint(batch.results)
+        if fingerprint == mark.get("fingerprint"):
+            batch.unchanged = True
+            self.unchanged += 1
+            return
+        published = [batch.adapter.published_at(result) for result in batch.results]
+        published = [timestamp for timestamp in published if timestamp is not None]
+        last = parse_timestamp(mark.get("lastPublishedAt"))
+        if published and (last is None or max(published) > last):
+            last = max(published)
+        batch.watermark = {
+            "lastPublishedAt": last.isoformat() if last is not None else None,
+            "fingerprint": fingerprint,
+        }
+
+    async def _stage(self, name: str, step, inbox: asyncio.Queue, outbox: Optional[asyncio.Queue],
+                     done: Optional[List[ProviderBatch]] = None):
+        """Apply `step` to each batch until the end marker; a failing batch is logged and dropped"""
+        metrics = self.metrics[name]
+        while True:
+            metrics.max_backlog = max(metrics.max_backlog, inbox.qsize())
+            batch = await inbox.get()
+            if batch is None:
+                if outbox is not None:
+                    await outbox.put(None)
+                return
+            start = time.perf_counter()
+            try:
+                items_in, items_out = await step(batch)
+            except Exception as e:
+                metrics.errors += 1
+                logger.error(f"[Ingestion] {name} failed for {batch.provider} query '{batch.query}': {str(e)}")
+                continue
+            metrics.observe(time.perf_counter() - start, items_in, items_out)
+            if outbox is not None:
+                await outbox.put(batch)
+            elif done is not None:
+                done.append(batch)
+
+    async def _normalize(self, batch: ProviderBatch) -> Tuple[int, int]:
+        if batch.unchanged:
+            return len(batch.results), 0
+        fetched_at = datetime.now(timezone.utc).isoformat()
+        for result in batch.results:
+            mapped = batch.adapter.to_article(result, batch.query)
+            if mapped is None:
+                continue
+            article, relevance_inputs = mapped
+            normalized_link = normalize_url(article["link"])
+            if not normalized_link:
+                continue
+            document = {
+                "id": str(uuid.uuid4()),
+                **article,
+                "apiSource": batch.provider,
+                "fetchedAt": fetched_at,
+                "isHidden": False,
+                "normalizedLink": normalized_link,
+            }
+            batch.candidates.append((document, relevance_inputs))
+        return len(batch.results), len(batch.candidates)
+
+    async def _dedupe(self, batch: ProviderBatch) -> Tuple[int, int]:
+        """Drop links the query already handled (from any provider)"""
+        seen = self._query_seen.setdefault(batch.query, set())
+        unique = []
+        for document, relevance_inputs in batch.candidates:
+            if document["normalizedLink"] in seen:
+                continue
+            seen.add(document["normalizedLink"])
+            unique.append((document, relevance_inputs))
+        items_in = len(batch.candidates)
+        batch.candidates = unique
+        return items_in, len(unique)
+
+    async def _check_relevance(self, batch: ProviderBatch) -> Tuple[int, int]:
+        """
+        Relevant documents get their score; irrelevant results only tag an
+        article that may already be stored, and are dropped when the link is
+        definitely new.
+        """
+        for document, (title, snippet, source_name) in batch.candidates:
+            relevance = self.relevance(title, snippet, source_name)
+            if relevance["is_relevant"]:
+                document["relevanceScore"] = relevance["relevance_score"]
+                document["matchedKeywords"] = relevance.get("matched_keywords", [])
+                batch.relevant.append(document)
+            elif self.might_contain(document["normalizedLink"]):
+                logger.debug(f"[{batch.provider}] Irrelevant unless already stored: {title[:50]}... Reason: {relevance['reason']}")
+                batch.tag_only.append(document["normalizedLink"])
+            else:
+                logger.debug(f"[{batch.provider}] Filtered irrelevant: {title[:50]}... Reason: {relevance['reason']}")
+                batch.filtered += 1
+        return len(batch.candidates), len(batch.relevant) + len(batch.tag_only)
+
+    async def _sink(self, batch: ProviderBatch) -> Tuple[int, int]:
+        await self.sink(batch)
+        return len(batch.relevant) + len(batch.tag_only), batch.counts.get("new", 0)
+
+    def report(self) -> dict:
+        """Per-stage metrics of the run"""
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        wall = end - self.started_at if self.started_at is not None else 0.0
+        return {
+            "providers": [adapter.name for adapter in self.adapters],
+            "wallSeconds": round(wall, 3),
+            "queueSize": self.queue_size,
+            # Requests limited to items newer than the high-water mark, and
+            # responses skipped as unchanged
+            "incrementalRequests": self.incremental,
+            "unchangedResponses": self.unchanged,
+            "stages": {name: metrics.to_dict(wall) for name, metrics in self.metrics.items()},
+        }
@@ -0,0 +1,211 @@
+"""
+Relevance Filter Matcher
+
+Compiled matcher for the news relevance check. The relevance keywords and the
+spam blocklist are merged into one TriggerMatcher, so an article's text is
+scanned once and the hits come back split into title hits and hits anywhere
+in title + snippet + source, with the plain `keyword in text` semantics of
+the original loops.
+
+A RelevanceFilter is immutable; the server compiles a new one when the
+admin-edited keyword sets change and swaps it in (see reload_relevance_filter
+in server.py). The version hashes both sets, so relevance memo keys change
+with them.
+"""
+
+import hashlib
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Set, Tuple
+
+from risk_engine import TriggerMatcher
+from text_normalization import NormalizedText, normalize_fields
+
+VOCAB_RELEVANCE = "relevance"
+VOCAB_SPAM = "spam"
+
+
+def normalize_keywords(keywords: Iterable[str]) -> List[str]:
+    """Sorted, lowercased, de-duplicated keywords without blanks"""
+    return sorted({(keyword or "").strip().lower() for keyword in keywords} - {""})
+
+
+def relevance_version(keywords: Iterable[str], spam_blocklist: Iterable[str]) -> str:
+    """Short hash of a keyword set and blocklist"""
+    payload = "\n".join(normalize_keywords(keywords) + ["--"] + normalize_keywords(spam_blocklist))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class RelevanceHits(NamedTuple):
+    """Sorted keyword hits of one article"""
+    keywords: List[str]        # relevance keywords in title, snippet or source
+    title_keywords: List[str]  # relevance keywords in the title
+    spam: List[str]            # blocklist phrases in title, snippet or source
+    title_spam: List[str]      # blocklist phrases in the title
+
+
+def score_relevance(hits: RelevanceHits) -> dict:
+    """
+    Relevance verdict for an article's hits.
+
+    STRATEGY:
+    - Only BLOCK articles that clearly match spam/blocklist AND have NO electronics keywords
+    - Articles without clear spam signals pass through (since they came from electronics-related queries)
+
+    Returns dict with: is_relevant (bool), relevance_score (0-100), reason (str)
+    """
+    relevance_count = len(hits.keywords)
+    matched_keywords = hits.keywords
+
+    # Calculate relevance score
+    relevance_score = min(relevance_count * 15, 100)
+    title_matches = len(hits.title_keywords)
+    relevance_score = min(relevance_score + (title_matches * 20), 100)
+
+    # Check blocklist - only block if:
+    # 1. Multiple spam keywords found in TITLE specifically
+    # 2. AND no electronics keywords found
+    spam_count_title = len(hits.title_spam)
+    matched_spam = hits.title_spam
+
+    # Block logic:
+    # - If 2+ spam keywords in TITLE and NO relevance keywords -> BLOCK
+    # - If 1 spam keyword in title and 0 relevance keywords -> BLOCK
+    # - Otherwise -> ALLOW (benefit of the doubt since it came from electronics query)
+
+    is_spam = False
+    block_reason = ""
+
+    if spam_count_title >= 2 and relevance_count == 0:
+        is_spam = True
+        block_reason = f"Spam detected in title: {', '.join(matched_spam[:3])}"
+    elif spam_count_title >= 1 and relevance_count == 0:
+        is_spam = True
+        block_reason = f"Spam keyword in title, no electronics content: {matched_spam[0]}"
+
+    if is_spam:
+        return {
+            "is_relevant": False,
+            "relevance_score": 0,
+            "reason": block_reason,
+            "matched_keywords": [],
+            "spam_keywords": matched_spam
+        }
+
+    # Article passes - calculate final score
+    if relevance_count > 0:
+        reason = f"Matched: {', '.join(matched_keywords[:5])}"
+    else:
+        reason = "Passed (no spam detected, from electronics query)"
+        relevance_score = 10  # Base score for passing articles without keywords
+
+    return {
+        "is_relevant": True,
+        "relevance_score": relevance_score,
+        "reason": reason,
+        "matched_keywords": matched_keywords[:10]
+    }
+
+
+class RelevanceFilter:
+    """
+    Relevance keywords and spam blocklist compiled into one matcher.
+
+    scan() checks one article. scan_batch() is the batch variant for feed
+    pre-screening: every distinct whitespace-separated word is scanned once
+    (and cached across batches) by a matcher for the single-word phrases and
+    the parts of multi-word phrases, and multi-word phrases are confirmed
+    with a substring test only where all their parts occur. The results are
+    identical, as in VectorizedRiskEngine.
+    """
+
+    # Distinct words whose scan results are kept between batches
+    word_cache_size = 200000
+
+    def __init__(self, keywords: Iterable[str], spam_blocklist: Iterable[str], source: str = "built-in"):
+        self.keywords = normalize_keywords(keywords)
+        self.spam_blocklist = normalize_keywords(spam_blocklist)
+        self.source = source
+        self.version = relevance_version(self.keywords, self.spam_blocklist)
+        self._keyword_set = frozenset(self.keywords)
+        self._spam_set = frozenset(self.spam_blocklist)
+        self._matcher = TriggerMatcher([
+            (VOCAB_RELEVANCE, None, self.keywords),
+            (VOCAB_SPAM, None, self.spam_blocklist),
+        ])
+
+        phrases = self._keyword_set | self._spam_set
+        self._single = frozenset(p for p in phrases if len(p.split()) == 1)
+        self._multi: Dict[str, FrozenSet[str]] = {
+            p: frozenset(p.split()) for p in sorted(phrases) if len(p.split()) > 1
+        }
+        self._parts = frozenset(part for parts in self._multi.values() for part in parts)
+        self._multi_by_part: Dict[str, List[str]] = {}
+        for phrase, parts in self._multi.items():
+            for part in parts:
+                self._multi_by_part.setdefault(part, []).append(phrase)
+        self._word_matcher = TriggerMatcher([("phrase", None, self._single), ("part", None, self._parts)])
+        self._word_cache: Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]] = {}
+
+    def scan(self, title: str, snippet: str = "", source_name: str = "") -> RelevanceHits:
+        """Scan "title snippet source" once; title hits are those within the title"""
+        return self.scan_normalized(normalize_fields(title, snippet, source_name))
+
+    def scan_normalized(self, normalized: NormalizedText) -> RelevanceHits:
+        """scan() of normalized title/snippet/source fields"""
+        text = f"{normalized.title} {normalized.body} {normalized.source}"
+        title_hits, hits = self._matcher.scan_split(text, len(normalized.title))
+        return self._hits(title_hits.phrases, hits.phrases)
+
+    def scan_batch(self, items: Iterable[Tuple[str, str, str]]) -> List[RelevanceHits]:
+        """scan() for many (title, snippet, source_name) items, in input order"""
+        if len(self._word_cache) > self.word_cache_size:
+            self._word_cache.clear()
+        results = []
+        for title, snippet, source_name in items:
+            normalized = normalize_fields(title, snippet, source_name)
+            title_phrases, title_parts = self._scan_words(normalized.title_tokens)
+            rest_phrases, rest_parts = self._scan_words(normalized.body_tokens | set(normalized.source.split()))
+            title_found = title_phrases | self._confirm_multi(title_parts, normalized.title)
+            text = f"{normalized.title} {normalized.body} {normalized.source}"
+            found = title_found | rest_phrases | self._confirm_multi(title_parts | rest_parts, text)
+            results.append(self._hits(title_found, found))
+        return results
+
+    def check_batch(self, items: Iterable[Tuple[str, str, str]]) -> List[dict]:
+        """score_relevance verdicts of many (title, snippet, source_name) items"""
+        return [score_relevance(hits) for hits in self.scan_batch(items)]
+
+    def _scan_words(self, words: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Single-word phrases and multi-word phrase parts found in the words"""
+        cache = self._word_cache
+        phrases: Set[str] = set()
+        parts: Set[str] = set()
+        for word in words:
+            entry = cache.get(word)
+            if entry is None:
+                found = self._word_matcher.scan(word).phrases
+                entry = cache[word] = (found & self._single, found & self._parts)
+            phrases |= entry[0]
+            parts |= entry[1]
+        return phrases, parts
+
+    def _confirm_multi(self, parts: Set[str], text: str) -> Set[str]:
+        """Multi-word phrases in text, tested only where all their parts occur"""
+        multi = self._multi
+        candidates = {phrase for part in parts for phrase in self._multi_by_part[part]}
+        return {phrase for phrase in candidates if multi[phrase] <= parts and phrase in text}
+
+    def _hits(self, title_found: FrozenSet[str], found: FrozenSet[str]) -> RelevanceHits:
+        return RelevanceHits(
+            keywords=sorted(found & self._keyword_set),
+            title_keywords=sorted(title_found & self._keyword_set),
+            spam=sorted(found & self._spam_set),
+            title_spam=sorted(title_found & self._spam_set),
+        )
+
+    def info(self) -> dict:
+        return {
+            "version": self.version,
+            "source": self.source,
+            "keywords": self.keywords,
+            "spamBlocklist": self.spam_blocklist,
+        }
@@ -0,0 +1,613 @@
+"""
+Risk Engine Benchmark
+
+Generates a deterministic synthetic electronics-news corpus, checks that the
+compiled trigger matcher produces the same analysis as a per-phrase substring
+scan, that vectorized re-scoring of stored features matches the scalar
+scoring path and that VectorizedRiskEngine matches RuleBasedRiskEngine, and
+reports articles/sec and latency per 1k articles for every engine.
+
+The suite mode measures best-of-repeats throughput, p50/p99 per-article
+latency (for the modes that analyze one article per call) and peak memory
+from title-only articles up to 50 KB of fullContent (with and without a text
+budget, and with stored token sets), saves the results as a JSON baseline
+and fails when a later run regresses past a threshold.
+
+Usage:
+    python risk_benchmark.py --articles 20000 --verify
+    python risk_benchmark.py --scale 10000 100000 1000000
+    python risk_benchmark.py --ml                      # train a model on synthetic labels
+    python risk_benchmark.py --ml-model models/risk_ml
+    python risk_benchmark.py --suite --save-baseline risk_baseline.json
+    python risk_benchmark.py --suite --compare risk_baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from risk_engine import (
+    CATEGORY_TRIGGERS,
+    COMPONENT_FAMILIES,
+    CREDIBLE_SOURCES,
+    ELECTRONICS_CONTEXT_WORDS,
+    OFFICIAL_INDICATORS,
+    TIME_HORIZON_TRIGGERS,
+    VAGUE_INDICATORS,
+    ParallelRiskAnalyzer,
+    RiskFeatures,
+    RuleBasedRiskEngine,
+    ScoringPolicy,
+    TriggerHits,
+    TriggerMatcher,
+    VectorizedRiskEngine,
+    analyze_articles_batch,
+    build_trigger_matcher,
+    score_feature_records,
+)
+from text_normalization import token_fields
+
+
+FILLER_WORDS = [
+    "the", "a", "of", "and", "to", "in", "for", "on", "with", "as", "by", "at",
+    "company", "market", "report", "global", "new", "year", "growth", "quarter",
+    "production", "customers", "industry", "analysts", "expects", "business",
+    "revenue", "demand", "products", "region", "suppliers", "plans", "second",
+    "largest", "maker", "share", "investors", "week", "results", "outlook",
+    "automotive", "devices", "europe", "asia", "united", "states", "china",
+    "taiwan", "japan", "korea", "india", "billion", "million", "percent",
+]
+
+COMPANY_NAMES = ["Acme Corp", "Nexgen Inc", "Silicon Ltd", "Orbit Co", "Vertex LLC"]
+
+SOURCE_NAMES = CREDIBLE_SOURCES + ["tech daily", "market wire", "local news", "gadget blog"]
+
+
+def _vocabulary_phrases() -> List[str]:
+    phrases = list(ELECTRONICS_CONTEXT_WORDS) + list(COMPONENT_FAMILIES)
+    for triggers in CATEGORY_TRIGGERS.values():
+        phrases.extend(triggers.get("strong", []))
+        phrases.extend(triggers.get("medium", []))
+    for triggers in TIME_HORIZON_TRIGGERS.values():
+        phrases.extend(triggers)
+    phrases.extend(OFFICIAL_INDICATORS)
+    phrases.extend(VAGUE_INDICATORS)
+    return phrases
+
+
+def _synthetic_words(rnd: random.Random, phrases: List[str], length: int, density: float) -> List[str]:
+    words = []
+    for _ in range(length):
+        roll = rnd.random()
+        if roll < density:
+            words.append(rnd.choice(phrases))
+        elif roll < density + 0.01:
+            words.append(rnd.choice(COMPANY_NAMES))
+        elif roll < density + 0.03:
+            words.append(rnd.choice(["2025", "15%", "$1,200", "42"]))
+        else:
+            words.append(rnd.choice(FILLER_WORDS))
+    return words
+
+
+def _synthetic_article(rnd: random.Random, phrases: List[str], index: int, content: str, now: datetime) -> dict:
+    title_words = [rnd.choice(FILLER_WORDS) for _ in range(rnd.randint(4, 10))]
+    if rnd.random() < 0.7:
+        title_words.insert(rnd.randint(0, len(title_words)), rnd.choice(phrases))
+
+    published = now - timedelta(hours=rnd.randint(0, 24 * 30))
+    article = {
+        "id": f"synthetic-{index}",
+        "title": " ".join(title_words).capitalize(),
+        "source": {"name": rnd.choice(SOURCE_NAMES).title()},
+        "iso_date": published.isoformat(),
+    }
+    if content:
+        article["fullContent"] = content
+    return article
+
+
+def generate_corpus(count: int, seed: int = 42) -> List[dict]:
+    """Generate `count` synthetic articles seeded with the real trigger vocabularies"""
+    rnd = random.Random(seed)
+    phrases = _vocabulary_phrases()
+    now = datetime.now(timezone.utc)
+    articles = []
+
+    for i in range(count):
+        length = rnd.choice([0, 40, 150, 400, 1200])
+        density = rnd.choice([0.0, 0.01, 0.03, 0.08])
+        content = " ".join(_synthetic_words(rnd, phrases, length, density))
+        articles.append(_synthetic_article(rnd, phrases, i, content, now))
+
+    return articles
+
+
+def generate_sized_corpus(count: int, content_bytes: int, seed: int = 42) -> List[dict]:
+    """Generate `count` synthetic articles with `content_bytes` of fullContent each (0 = title only)"""
+    rnd = random.Random(seed)
+    phrases = _vocabulary_phrases()
+    now = datetime.now(timezone.utc)
+    articles = []
+
+    for i in range(count):
+        density = rnd.choice([0.0, 0.01, 0.03, 0.08])
+        content = ""
+        while len(content) < content_bytes:
+            content += " " + " ".join(_synthetic_words(rnd, phrases, 200, density))
+        articles.append(_synthetic_article(rnd, phrases, i, content[1:content_bytes + 1], now))
+
+    return articles
+
+
+def iter_corpus(count: int, seed: int = 42, chunk_size: int = 10000) -> Iterator[List[dict]]:
+    """Generate a large corpus in chunks so it never has to fit in memory"""
+    for index, start in enumerate(range(0, count, chunk_size)):
+        yield generate_corpus(min(chunk_size, count - start), seed + index)
+
+
+class SubstringScanMatcher(TriggerMatcher):
+    """Reference matcher: one `phrase in text` scan per phrase, no compiled automaton"""
+
+    def scan(self, text: str) -> TriggerHits:
+        return TriggerHits(frozenset(p for p in self._tags if p in text), self._tags)
+
+
+def _reference_engine() -> RuleBasedRiskEngine:
+    reference = build_trigger_matcher(CATEGORY_TRIGGERS, matcher_class=SubstringScanMatcher)
+    return RuleBasedRiskEngine(matcher=reference)
+
+
+def verify(articles: List[dict]) -> int:
+    """Compare compiled and reference engines; returns number of mismatches"""
+    engine = RuleBasedRiskEngine()
+    reference = _reference_engine()
+    mismatches = 0
+    for article in articles:
+        expected = reference.analyze(article).to_dict()
+        actual = engine.analyze(article).to_dict()
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"MISMATCH {article['id']}: expected {expected}, got {actual}")
+    return mismatches
+
+
+# Deliberately different from the defaults to exercise every policy knob
+RETUNED_POLICY = ScoringPolicy(
+    bands={"LOW": [0, 24], "WATCH": [25, 49], "HIGH": [50, 69], "CRITICAL": [70, 100]},
+    medium_strength=50,
+    medium_min_count=1,
+    high_severity_categories=["FACTORY_FAB_OUTAGE", "SUPPLY_SHORTAGE"],
+    medium_severity=20,
+    recency_bonus=5,
+    component_weight=12,
+    procurement_cap=20,
+    credible_specificity=16,
+    context_gate_relevance=8,
+)
+
+
+def verify_vectorized(articles: List[dict]) -> int:
+    """
+    Compare VectorizedRiskEngine with RuleBasedRiskEngine, with and without
+    stored textTokens records; returns number of mismatches
+    """
+    engine = RuleBasedRiskEngine()
+    vectorized = VectorizedRiskEngine(batch_size=1000)
+    cached = [{**article, **token_fields(article)} for article in articles]
+    mismatches = 0
+    for article, actual in zip(articles + cached, vectorized.analyze_batch(articles + cached)):
+        expected = engine.analyze(article).to_dict()
+        if expected != actual.to_dict():
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"VECTORIZED MISMATCH {article['id']}: expected {expected}, got {actual.to_dict()}")
+    return mismatches
+
+
+def verify_rescoring(articles: List[dict]) -> int:
+    """
+    Re-score stored feature records with NumPy under the default and a retuned
+    policy and compare with the scalar path; returns number of mismatches
+    """
+    engine = RuleBasedRiskEngine()
+    categories = list(engine.category_triggers)
+    records = [engine.analyze(article).features for article in articles]
+    mismatches = 0
+    for policy in (engine.policy, RETUNED_POLICY):
+        scorer = RuleBasedRiskEngine(policy=policy)
+        vectorized = score_feature_records(records, policy, categories)
+        for article, record, actual in zip(articles, records, vectorized):
+            expected = scorer.score(RiskFeatures.from_record(record)).to_dict()
+            del expected["trigger_terms"], expected["features"], expected["published_at"], expected["text_truncated"]
+            if expected != actual:
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"RESCORE MISMATCH {article['id']}: expected {expected}, got {actual}")
+    return mismatches
+
+
+def measure_rescoring(articles: List[dict]) -> float:
+    """Return records/sec for vectorized re-scoring of stored features"""
+    engine = RuleBasedRiskEngine()
+    records = [engine.analyze(article).features for article in articles]
+    start = time.perf_counter()
+    score_feature_records(records, RETUNED_POLICY, engine.category_triggers)
+    elapsed = time.perf_counter() - start
+    return len(records) / elapsed if elapsed > 0 else float("inf")
+
+
+def measure(engine: RuleBasedRiskEngine, articles: List[dict]) -> float:
+    """Return articles/sec for analyzing the whole corpus"""
+    start = time.perf_counter()
+    for article in articles:
+        engine.analyze(article)
+    elapsed = time.perf_counter() - start
+    return len(articles) / elapsed if elapsed > 0 else float("inf")
+
+
+def measure_scaled(engine_type: str, count: int, seed: int) -> float:
+    """Return articles/sec for one engine over a corpus of `count` articles, generated in chunks"""
+    engine = VectorizedRiskEngine() if engine_type == "vectorized" else RuleBasedRiskEngine()
+    elapsed = 0.0
+    for chunk in iter_corpus(count, seed):
+        start = time.perf_counter()
+        if engine_type == "vectorized":
+            engine.analyze_batch(chunk)
+        else:
+            for article in chunk:
+                engine.analyze(article)
+        elapsed += time.perf_counter() - start
+    return count / elapsed if elapsed > 0 else float("inf")
+
+
+def latency_per_1k(engine, articles: List[dict]) -> float:
+    """Milliseconds per 1,000 articles, through the batch API where the engine has one"""
+    start = time.perf_counter()
+    if hasattr(engine, "analyze_batch"):
+        engine.analyze_batch(articles)
+    else:
+        for article in articles:
+            engine.analyze(article)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(articles) * 1000 * 1000 if articles else 0.0
+
+
+def ml_engine(model_path: Optional[str], articles: int, seed: int):
+    """
+    Load an ML model, or train one on a separate synthetic corpus labelled by
+    the rule engine (the same bootstrap as `ml_risk_engine.py train`).
+    """
+    from ml_risk_engine import MLRiskEngine, train_model
+    
+    if model_path is None:
+        engine = RuleBasedRiskEngine()
+        training = generate_corpus(articles, seed + 1)
+        labels = [engine.analyze(article).to_dict() for article in training]
+        model_path = tempfile.mkdtemp(prefix="risk_ml_")
+        start = time.perf_counter()
+        train_model(training, labels, model_path, label_source=engine.version)
+        print(f"Trained ML model on {len(training)} articles in {time.perf_counter() - start:.1f}s")
+    return MLRiskEngine(model_path)
+
+
+def ml_agreement(ml, articles: List[dict]) -> dict:
+    """Share of articles where the ML engine agrees with the rule engine"""
+    engine = RuleBasedRiskEngine()
+    expected = [engine.analyze(article) for article in articles]
+    actual = ml.analyze_batch(articles)
+    pairs = list(zip(expected, actual))
+    return {
+        "band": sum(e.risk_band == a.risk_band for e, a in pairs) / len(pairs),
+        "categories": sum(e.risk_categories == a.risk_categories for e, a in pairs) / len(pairs),
+        "score_error": sum(abs(e.risk_score - a.risk_score) for e, a in pairs) / len(pairs),
+    }
+
+
+def measure_parallel(articles: List[dict], workers: int) -> float:
+    """Return articles/sec for ParallelRiskAnalyzer with `workers` processes"""
+    analyzer = ParallelRiskAnalyzer(workers=workers)
+    try:
+        analyzer.analyze(articles[:workers * analyzer.chunk_size])  # warm up the pool
+        start = time.perf_counter()
+        analyzer.analyze(articles)
+        elapsed = time.perf_counter() - start
+    finally:
+        analyzer.shutdown()
+    return len(articles) / elapsed if elapsed > 0 else float("inf")
+
+
+# ============== SUITE ==============
+
+# fullContent sizes of the suite, title-only up to 50 KB
+SUITE_SIZES = {
+    "title_only": 0,
+    "1KB": 1024,
+    "5KB": 5 * 1024,
+    "20KB": 20 * 1024,
+    "50KB": 50 * 1024,
+}
+
+# Articles per analyze_articles_batch call in the suite
+SUITE_BATCH_SIZE = 50
+
+# Content budget of the "budget" suite mode, in characters
+SUITE_TEXT_BUDGET = 8000
+
+# Timed passes per suite case; the fastest pass is reported. Short cases
+# run more passes, until they have been timed for SUITE_MIN_CASE_SECONDS.
+SUITE_REPEATS = 5
+SUITE_MIN_CASE_SECONDS = 1.0
+SUITE_MAX_REPEATS = 200
+
+# Extra measurements of a case that regressed before it is reported
+SUITE_CONFIRM_RUNS = 2
+
+# Modes that analyze one article per call, so per-article latency is measured
+SUITE_SINGLE_MODES = ("analyze", "budget")
+
+# Peak memory changes smaller than this are noise (allocator, interned strings)
+SUITE_MEMORY_NOISE_KB = 64
+
+
+def _suite_modes() -> Dict[str, callable]:
+    """Each mode analyzes a list of articles in one call"""
+    engine = RuleBasedRiskEngine(text_budget=0)
+    budgeted = RuleBasedRiskEngine(text_budget=SUITE_TEXT_BUDGET)
+    return {
+        "analyze": lambda articles: [engine.analyze(article) for article in articles],
+        "budget": lambda articles: [budgeted.analyze(article) for article in articles],
+        "batch": lambda articles: analyze_articles_batch(articles, "rule_based"),
+        "vectorized": lambda articles: analyze_articles_batch(articles, "vectorized"),
+        # Vectorized re-analysis of articles carrying a stored textTokens record
+        "tokens": lambda articles: analyze_articles_batch(articles, "vectorized"),
+    }
+
+
+def measure_case(run, articles: List[dict], batch_size: int, repeats: int = SUITE_REPEATS) -> dict:
+    """
+    Throughput, per-article latency percentiles and peak traced memory.
+
+    The corpus is analyzed at least `repeats` times (more for short cases,
+    see SUITE_MIN_CASE_SECONDS), `batch_size` articles per call, and the
+    fastest pass is reported: interference from other processes only ever
+    slows a pass down, so the minimum is the stable estimate. Latency
+    percentiles are reported only when each article is its own call
+    (batch_size 1); a batch call cannot attribute time to single articles.
+    Memory is traced in a separate untimed pass, since tracemalloc slows
+    allocation down.
+    """
+    run(articles[:batch_size])  # warm up caches and compiled patterns
+    elapsed = []
+    p50s = []
+    p99s = []
+    while (len(elapsed) < max(1, repeats)
+           or (sum(elapsed) < SUITE_MIN_CASE_SECONDS and len(elapsed) < SUITE_MAX_REPEATS)):
+        latencies = []
+        start = time.perf_counter()
+        for offset in range(0, len(articles), batch_size):
+            call_start = time.perf_counter()
+            run(articles[offset:offset + batch_size])
+            latencies.append(time.perf_counter() - call_start)
+        elapsed.append(time.perf_counter() - start)
+        if batch_size == 1:
+            latencies_ms = np.array(latencies) * 1000
+            p50s.append(float(np.percentile(latencies_ms, 50)))
+            p99s.append(float(np.percentile(latencies_ms, 99)))
+
+    tracemalloc.start()
+    try:
+        for offset in range(0, len(articles), batch_size):
+            run(articles[offset:offset + batch_size])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(elapsed)
+    return {
+        "articles": len(articles),
+        "repeats": len(elapsed),
+        "articlesPerSec": round(len(articles) / best, 1) if best > 0 else None,
+        "p50Ms": round(min(p50s), 4) if p50s else None,
+        "p99Ms": round(min(p99s), 4) if p99s else None,
+        "peakMemoryKb": round(peak / 1024, 1),
+    }
+
+
+def suite_corpus(articles: int, size_name: str, seed: int) -> List[dict]:
+    """The corpus of one suite size"""
+    content_bytes = SUITE_SIZES[size_name]
+    # Fewer articles for the large sizes keeps each case to a similar runtime
+    count = max(4 * SUITE_BATCH_SIZE, articles * 1024 // max(content_bytes, 1024))
+    return generate_sized_corpus(count, content_bytes, seed)
+
+
+def measure_suite_case(mode: str, corpus: List[dict], repeats: int = SUITE_REPEATS) -> dict:
+    """measure_case() of one suite mode on one corpus"""
+    batch_size = 1 if mode in SUITE_SINGLE_MODES else SUITE_BATCH_SIZE
+    cases = [{**article, **token_fields(article)} for article in corpus] if mode == "tokens" else corpus
+    return measure_case(_suite_modes()[mode], cases, batch_size, repeats)
+
+
+def run_suite(articles: int, seed: int, modes: Optional[List[str]] = None, repeats: int = SUITE_REPEATS) -> dict:
+    """Measure every (mode, size) case; returns the JSON-serializable report"""
+    results: Dict[str, Dict[str, dict]] = {}
+    for size_name in SUITE_SIZES:
+        corpus = suite_corpus(articles, size_name, seed)
+        for mode in modes or list(_suite_modes()):
+            case = measure_suite_case(mode, corpus, repeats)
+            results.setdefault(mode, {})[size_name] = case
+            latency = (f"p50 {case['p50Ms']:>8.3f} ms  p99 {case['p99Ms']:>8.3f} ms"
+                       if case["p50Ms"] is not None else f"{'(batched)':<30}")
+            print(f"{mode:<10} {size_name:<10} {case['articles']:>6} articles  "
+                  f"{case['articlesPerSec']:>10,.1f}/sec  {latency}  peak {case['peakMemoryKb']:>9,.1f} KB")
+    return {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "articles": articles,
+            "seed": seed,
+            "repeats": repeats,
+        },
+        "results": results,
+    }
+
+
+# Metric -> True if larger is better
+SUITE_METRICS = {
+    "articlesPerSec": True,
+    "p50Ms": False,
+    "p99Ms": False,
+    "peakMemoryKb": False,
+}
+
+
+def compare_case(base: dict, case: dict, threshold: float) -> List[str]:
+    """Metrics of one case that regressed beyond `threshold`"""
+    regressions = []
+    for metric, higher_is_better in SUITE_METRICS.items():
+        old, new = base.get(metric), case.get(metric)
+        if not old or new is None:
+            continue
+        if metric == "peakMemoryKb" and abs(new - old) < SUITE_MEMORY_NOISE_KB:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append(f"{metric}: {old} -> {new} ({change:+.1%})")
+    return regressions
+
+
+def confirm_regressions(baseline: dict, report: dict, threshold: float,
+                        confirm_runs: int = SUITE_CONFIRM_RUNS) -> List[str]:
+    """
+    Regressions of `report` against `baseline` beyond `threshold` (a
+    fraction, e.g. 0.25 = 25%); cases missing from either report are
+    skipped. Each regressed case is re-measured up to `confirm_runs` more
+    times. The best value of each metric across the measurements is
+    kept, so a case fails only if it regressed every time; a real
+    regression persists, a noisy neighbour does not.
+    """
+    regressions = []
+    for mode, sizes in report["results"].items():
+        for size_name, case in sizes.items():
+            base = baseline.get("results", {}).get(mode, {}).get(size_name)
+            if not base:
+                continue
+            failed = compare_case(base, case, threshold)
+            for _ in range(confirm_runs):
+                if not failed:
+                    break
+                print(f"Re-measuring {mode}/{size_name}")
+                corpus = suite_corpus(report["meta"]["articles"], size_name, report["meta"]["seed"])
+                again = measure_suite_case(mode, corpus, report["meta"].get("repeats", SUITE_REPEATS))
+                for metric, higher_is_better in SUITE_METRICS.items():
+                    if case.get(metric) is not None and again.get(metric) is not None:
+                        case[metric] = (max if higher_is_better else min)(case[metric], again[metric])
+                failed = compare_case(base, case, threshold)
+            regressions.extend(f"{mode}/{size_name} {regression}" for regression in failed)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the rule-based risk engine")
+    parser.add_argument("--articles", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verify", action="store_true", help="Check equivalence with the reference scan")
+    parser.add_argument("--workers", type=int, nargs="*", default=[],
+                        help="Also measure ParallelRiskAnalyzer with these worker counts")
+    parser.add_argument("--scale", type=int, nargs="*", default=[],
+                        help="Only compare rule_based and vectorized engines at these corpus sizes")
+    parser.add_argument("--ml", action="store_true", help="Also benchmark the ML engine, trained on synthetic labels")
+    parser.add_argument("--ml-model", help="Benchmark the ML engine with this trained model instead")
+    parser.add_argument("--suite", action="store_true", help="Run the size/latency/memory suite instead")
+    parser.add_argument("--suite-modes", nargs="*", choices=list(_suite_modes()),
+                        help="Suite modes to run (default all)")
+    parser.add_argument("--save-baseline", help="Write suite results to this JSON file")
+    parser.add_argument("--compare", help="Fail if suite results regress against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression as a fraction (default 0.25)")
+    parser.add_argument("--repeats", type=int, default=SUITE_REPEATS,
+                        help=f"Minimum timed passes per suite case (default {SUITE_REPEATS})")
+    args = parser.parse_args()
+    
+    if args.suite:
+        report = run_suite(args.articles, args.seed, args.suite_modes, args.repeats)
+        if args.save_baseline:
+            with open(args.save_baseline, "w") as f:
+                json.dump(report, f, indent=2)
+            print(f"Baseline saved to {args.save_baseline}")
+        if args.compare:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+            if baseline.get("meta", {}).get("articles") != args.articles:
+                print(f"Warning: baseline was recorded with --articles {baseline.get('meta', {}).get('articles')}")
+            regressions = confirm_regressions(baseline, report, args.threshold)
+            for regression in regressions:
+                print(f"REGRESSION {regression}")
+            if regressions:
+                raise SystemExit(1)
+            print(f"No regressions beyond {args.threshold:.0%} against {args.compare}")
+        return
+    
+    if args.scale:
+        for count in args.scale:
+            rule_rate = measure_scaled("rule_based", count, args.seed)
+            vector_rate = measure_scaled("vectorized", count, args.seed)
+            print(f"{count:>10,} articles: rule_based {rule_rate:,.0f}/sec, "
+                  f"vectorized {vector_rate:,.0f}/sec ({vector_rate / rule_rate:.2f}x)")
+        return
+
+    articles = generate_corpus(args.articles, args.seed)
+    print(f"Generated {len(articles)} synthetic articles")
+
+    if args.verify:
+        mismatches = verify(articles)
+        print(f"Equivalence: {len(articles) - mismatches}/{len(articles)} identical")
+        if mismatches:
+            raise SystemExit(1)
+        mismatches = verify_vectorized(articles)
+        print(f"Vectorized engine: {2 * len(articles) - mismatches}/{2 * len(articles)} identical")
+        if mismatches:
+            raise SystemExit(1)
+        mismatches = verify_rescoring(articles)
+        print(f"Vectorized re-scoring: {2 * len(articles) - mismatches}/{2 * len(articles)} identical")
+        if mismatches:
+            raise SystemExit(1)
+
+    compiled_rate = measure(RuleBasedRiskEngine(), articles)
+    reference_rate = measure(_reference_engine(), articles)
+    print(f"Compiled matcher:  {compiled_rate:,.0f} articles/sec")
+    print(f"Substring scan:    {reference_rate:,.0f} articles/sec")
+    print(f"Speedup:           {compiled_rate / reference_rate:.2f}x")
+    print(f"Feature re-score:  {measure_rescoring(articles):,.0f} records/sec")
+
+    engines = [("rule_based", RuleBasedRiskEngine()), ("vectorized", VectorizedRiskEngine())]
+    if args.ml or args.ml_model:
+        ml = ml_engine(args.ml_model, args.articles, args.seed)
+        engines.append(("ml", ml))
+        agreement = ml_agreement(ml, articles)
+        print(f"ML agreement:      band {agreement['band']:.1%}, categories {agreement['categories']:.1%}, "
+              f"mean score error {agreement['score_error']:.1f}")
+    print("Latency per 1k articles:")
+    for name, engine in engines:
+        print(f"  {name:<12} {latency_per_1k(engine, articles):,.0f} ms")
+
+    for workers in args.workers:
+        rate = measure_parallel(articles, workers)
+        print(f"Parallel x{workers}:{' ' * (8 - len(str(workers)))}{rate:,.0f} articles/sec "
+              f"({rate / compiled_rate:.2f}x single process)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,30 @@
 Risk Engine Module for Article Risk Analysis
 
 This module implements a rule-based risk scoring system for electronics
-supply chain news articles. It can be swapped with an ML-based engine later.
+supply chain news articles. The "ml" engine type is served by
+ml_risk_engine.MLRiskEngine, a model trained on this engine's outputs.
 
 Interface:
     RiskEngine.analyze(article) -> RiskAnalysis
 """
 
+import asyncio
+import collections
+import hashlib
+import json
+import multiprocessing
+import os
 import re
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field, fields
+
+import numpy as np
+
+from text_normalization import DEFAULT_TEXT_BUDGET, normalize_article
 
 
 # ============== CONSTANTS ==============
@@ -48,6 +62,11 @@ RISK_CATEGORIES = [
     "DEMAND_SHOCK"
 ]
 
+# Fixed bit (risk_category_mask) and slot (category_strength_array) of each
+# category. Append only: stored masks depend on this order. Categories from
+# custom configs outside this list appear in risk_categories only.
+CATEGORY_SLOTS = {category: i for i, category in enumerate(RISK_CATEGORIES)}
+
 # Electronics context gating words
 ELECTRONICS_CONTEXT_WORDS = [
     "semiconductor", "chip", "chips", "ic", "ics", "component", "components",
@@ -268,21 +287,704 @@ VAGUE_INDICATORS = [
     "speculation", "unconfirmed", "allegedly", "sources say"
 ]
 
+# Procurement relevance term groups
+PROCUREMENT_TERMS = ["allocation", "lead time", "lead-time", "pricing", "inventory", "supply"]
+CAPACITY_TERMS = ["capacity", "fab", "factory", "manufacturing", "logistics", "shipping"]
+
+
+# ============== TRIGGER MATCHER ==============
+
+# Vocabulary names used to tag matcher hits
+VOCAB_STRONG = "strong"
+VOCAB_MEDIUM = "medium"
+VOCAB_CONTEXT = "context"
+VOCAB_COMPONENT = "component"
+VOCAB_TIME_HORIZON = "time_horizon"
+VOCAB_OFFICIAL = "official"
+VOCAB_VAGUE = "vague"
+VOCAB_PROCUREMENT = "procurement"
+VOCAB_CAPACITY = "capacity"
+VOCAB_INDEX = "index"
+
+# Vocabularies recorded per article as its trigger-term index
+TRIGGER_TERM_VOCABULARIES = (VOCAB_STRONG, VOCAB_MEDIUM, VOCAB_INDEX)
+
+Tag = Tuple[str, Optional[str]]
+
+
+def _build_phrase_trie(phrases: Iterable[str]) -> dict:
+    trie: dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = True
+    return trie
+
+
+def _trie_to_regex(node: dict) -> str:
+    """Render a phrase trie as a regex that prefers the longest phrase at a position"""
+    children = sorted((ch, child) for ch, child in node.items() if ch != "")
+    if not children:
+        return ""
+    alternatives = [re.escape(ch) + _trie_to_regex(child) for ch, child in children]
+    if len(alternatives) == 1 and "" not in node:
+        return alternatives[0]
+    body = "(?:" + "|".join(alternatives) + ")"
+    if "" in node:
+        # Greedy optional: try the longer continuation first, fall back to the prefix
+        body += "?"
+    return body
+
+
+class TriggerHits:
+    """Phrases found in one text, indexed by (vocabulary, group) tag"""
+
+    __slots__ = ("phrases", "_counts", "_tags")
+
+    def __init__(self, phrases: FrozenSet[str], tags: Dict[str, Tuple[Tag, ...]]):
+        self.phrases = phrases
+        self._tags = tags
+        counts: Dict[Tag, int] = {}
+        for phrase in phrases:
+            for tag in tags[phrase]:
+                counts[tag] = counts.get(tag, 0) + 1
+        self._counts = counts
+
+    def has(self, vocabulary: str, group: Optional[str] = None) -> bool:
+        """True if any phrase of the vocabulary (and group) was found"""
+        return (vocabulary, group) in self._counts
+
+    def count(self, vocabulary: str, group: Optional[str] = None) -> int:
+        """Number of distinct phrases of the vocabulary (and group) found"""
+        return self._counts.get((vocabulary, group), 0)
+
+    def terms(self, vocabularies: Iterable[str]) -> List[str]:
+        """Sorted phrases found that belong to any of the vocabularies"""
+        vocabularies = set(vocabularies)
+        return sorted(
+            phrase for phrase in self.phrases
+            if any(vocabulary in vocabularies for vocabulary, _ in self._tags[phrase])
+        )
+
+    def __iter__(self) -> Iterator[Tuple[str, Optional[str], str]]:
+        """Yield every hit as (vocabulary, group, phrase)"""
+        for phrase in sorted(self.phrases):
+            for vocabulary, group in self._tags[phrase]:
+                yield vocabulary, group, phrase
+
+
+class TriggerMatcher:
+    """
+    Compiled multi-vocabulary phrase matcher.
+
+    All vocabularies are merged into a single trie-shaped regex, so a text is
+    scanned once regardless of how many phrases are registered. Matching keeps
+    the plain substring semantics of `phrase in text`: the scan finds the
+    longest phrase starting at each position, and every registered phrase that
+    is a substring of it is reported as well.
+    """
+
+    def __init__(self, vocabularies: Iterable[Tuple[str, Optional[str], Iterable[str]]]):
+        """
+        Args:
+            vocabularies: (vocabulary, group, phrases) tuples. Phrases are
+                lowercased; group is e.g. a risk category or time horizon, or None.
+        """
+        tags: Dict[str, List[Tag]] = {}
+        for vocabulary, group, phrases in vocabularies:
+            for phrase in phrases:
+                phrase = (phrase or "").lower()
+                if not phrase:
+                    continue
+                phrase_tags = tags.setdefault(phrase, [])
+                if (vocabulary, group) not in phrase_tags:
+                    phrase_tags.append((vocabulary, group))
+
+        self._tags: Dict[str, Tuple[Tag, ...]] = {p: tuple(t) for p, t in tags.items()}
+        phrases = sorted(self._tags)
+        # Phrases implied by each phrase (itself plus registered substrings of it)
+        self._implied: Dict[str, FrozenSet[str]] = {
+            phrase: frozenset(other for other in phrases if other in phrase)
+            for phrase in phrases
+        }
+        self._pattern = re.compile(_trie_to_regex(_build_phrase_trie(phrases))) if phrases else None
+
+    @property
+    def phrases(self) -> List[str]:
+        return sorted(self._tags)
+
+    def phrases_for(self, vocabularies: Iterable[str]) -> FrozenSet[str]:
+        """All registered phrases that belong to any of the vocabularies"""
+        vocabularies = set(vocabularies)
+        return frozenset(
+            phrase for phrase, tags in self._tags.items()
+            if any(vocabulary in vocabularies for vocabulary, _ in tags)
+        )
+
+    def scan(self, text: str) -> TriggerHits:
+        """Scan lowercased text once and return all vocabulary hits"""
+        found: set = set()
+        if self._pattern is not None:
+            search = self._pattern.search
+            implied = self._implied
+            pos = 0
+            match = search(text, pos)
+            while match is not None:
+                longest = match.group()
+                if longest not in found:
+                    found |= implied[longest]
+                pos = match.start() + 1
+                match = search(text, pos)
+        return TriggerHits(frozenset(found), self._tags)
+
+    def scan_split(self, text: str, boundary: int) -> Tuple[TriggerHits, TriggerHits]:
+        """
+        Scan lowercased text once and return (hits in text[:boundary], hits in text).
+
+        Same result as scanning the head and the whole text separately: a
+        phrase at position i is a prefix of the longest match there, so it is
+        in the head if that match is, or if it occurs within the part of a
+        straddling match that lies before the boundary.
+        """
+        found: set = set()
+        head: set = set()
+        if self._pattern is not None:
+            search = self._pattern.search
+            implied = self._implied
+            pos = 0
+            match = search(text, pos)
+            while match is not None:
+                longest = match.group()
+                start = match.start()
+                if match.end() <= boundary:
+                    if longest not in head:
+                        head |= implied[longest]
+                elif start < boundary:
+                    head.update(p for p in implied[longest] if p in text[start:boundary])
+                if longest not in found:
+                    found |= implied[longest]
+                pos = start + 1
+                match = search(text, pos)
+        return TriggerHits(frozenset(head), self._tags), TriggerHits(frozenset(found), self._tags)
+
+
+def build_trigger_matcher(category_triggers: Dict[str, Dict[str, List[str]]],
+                          matcher_class: type = TriggerMatcher) -> TriggerMatcher:
+    """Compile category triggers together with all shared vocabularies"""
+    vocabularies = []
+    for category, triggers in category_triggers.items():
+        vocabularies.append((VOCAB_STRONG, category, triggers.get("strong", [])))
+        vocabularies.append((VOCAB_MEDIUM, category, triggers.get("medium", [])))
+    for horizon, triggers in TIME_HORIZON_TRIGGERS.items():
+        vocabularies.append((VOCAB_TIME_HORIZON, horizon, triggers))
+    vocabularies.extend([
+        (VOCAB_CONTEXT, None, ELECTRONICS_CONTEXT_WORDS),
+        (VOCAB_COMPONENT, None, COMPONENT_FAMILIES),
+        (VOCAB_OFFICIAL, None, OFFICIAL_INDICATORS),
+        (VOCAB_VAGUE, None, VAGUE_INDICATORS),
+        (VOCAB_PROCUREMENT, None, PROCUREMENT_TERMS),
+        (VOCAB_CAPACITY, None, CAPACITY_TERMS),
+    ])
+    # Built-in trigger phrases stay indexed even when the DB config drops them,
+    # so switching configs can be resolved from the per-article term index
+    if category_triggers is not CATEGORY_TRIGGERS:
+        for triggers in CATEGORY_TRIGGERS.values():
+            vocabularies.append((VOCAB_INDEX, None, triggers.get("strong", []) + triggers.get("medium", [])))
+    return matcher_class(vocabularies)
+
+
+def category_triggers_from_configs(configs: List[dict]) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Convert risk_category_configs documents into CATEGORY_TRIGGERS shape.
+
+    Categories keep the admin-defined order; phrases are lowercased and
+    de-duplicated because the engine matches against lowercased text.
+    """
+    category_triggers = {}
+    for config in sorted(configs, key=lambda c: c.get("order", 0)):
+        category = config.get("category")
+        if not category:
+            continue
+        category_triggers[category] = {
+            "strong": _normalize_phrases(config.get("strongTriggers") or []),
+            "medium": _normalize_phrases(config.get("mediumTriggers") or []),
+        }
+    return category_triggers
+
+
+def _normalize_phrases(phrases: Iterable[str]) -> List[str]:
+    normalized = []
+    for phrase in phrases:
+        phrase = (phrase or "").strip().lower()
+        if phrase and phrase not in normalized:
+            normalized.append(phrase)
+    return normalized
+
+
+def diff_category_triggers(old: Dict[str, Dict[str, List[str]]],
+                           new: Dict[str, Dict[str, List[str]]]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    Compare two trigger configurations.
+    
+    Returns:
+        Tuple of (phrases whose category/tier assignment changed,
+                  categories whose relative position changed)
+    """
+    def assignments(category_triggers):
+        tags: Dict[str, set] = {}
+        for category, triggers in category_triggers.items():
+            for tier in ("strong", "medium"):
+                for phrase in triggers.get(tier, []):
+                    tags.setdefault(phrase.lower(), set()).add((category, tier))
+        return tags
+    
+    old_tags, new_tags = assignments(old), assignments(new)
+    changed_phrases = frozenset(
+        phrase for phrase in set(old_tags) | set(new_tags)
+        if old_tags.get(phrase) != new_tags.get(phrase)
+    )
+    
+    # Categories are emitted in config order, so a reorder changes risk_categories
+    shared = [c for c in new if c in old]
+    old_order = [c for c in old if c in new]
+    moved_categories = frozenset(c for c, o in zip(shared, old_order) if c != o)
+    return changed_phrases, moved_categories
+
+
+def resolve_term_lookups(phrases: Iterable[str], indexed_terms: FrozenSet[str]) -> Tuple[List[str], List[str]]:
+    """
+    Trigger-term index (riskTerms) values covering every article that contains
+    one of the phrases.
+    
+    An indexed phrase stands for itself. Any other phrase stands for the
+    longest indexed phrase it contains: matching is substring matching, so a
+    text containing the phrase contains that one too.
+    
+    Returns:
+        Tuple of (index values to look up, phrases no indexed phrase covers)
+    """
+    lookups = set()
+    unresolved = []
+    for phrase in phrases:
+        if phrase in indexed_terms:
+            lookups.add(phrase)
+            continue
+        contained = [term for term in indexed_terms if term in phrase]
+        if contained:
+            lookups.add(max(contained, key=lambda term: (len(term), term)))
+        else:
+            unresolved.append(phrase)
+    return sorted(lookups), sorted(unresolved)
+
+
+# Bump when the meaning of a stored feature record changes
+FEATURE_SCHEMA = 2
+
+
+def trigger_config_version(category_triggers: Dict[str, Dict[str, List[str]]], text_budget: int = 0) -> str:
+    """Stable short hash of everything that affects feature extraction"""
+    payload = {
+        "categories": [
+            [category, triggers.get("strong", []), triggers.get("medium", [])]
+            for category, triggers in category_triggers.items()
+        ],
+        "context": ELECTRONICS_CONTEXT_WORDS,
+        "components": COMPONENT_FAMILIES,
+        "time_horizons": TIME_HORIZON_TRIGGERS,
+        "official": OFFICIAL_INDICATORS,
+        "credible": CREDIBLE_SOURCES,
+        "vague": VAGUE_INDICATORS,
+        "procurement": PROCUREMENT_TERMS,
+        "capacity": CAPACITY_TERMS,
+        "schema": FEATURE_SCHEMA,
+    }
+    if text_budget:
+        payload["text_budget"] = text_budget
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def engine_version(feature_version: str, policy: "ScoringPolicy") -> str:
+    """Combined version of a trigger configuration and a scoring policy"""
+    encoded = f"{feature_version}:{policy.version}".encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+_default_matcher: Optional[TriggerMatcher] = None
+
+
+def get_default_matcher() -> TriggerMatcher:
+    """Matcher for the built-in CATEGORY_TRIGGERS, compiled once per process"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = build_trigger_matcher(CATEGORY_TRIGGERS)
+    return _default_matcher
+
+
+# ============== SCORING POLICY ==============
+
+# Boolean features, stored as one bitmask per article (bit i = FEATURE_FLAGS[i])
+FEATURE_FLAGS = (
+    "context", "official", "component", "procurement", "capacity",
+    "year", "percent", "dollar", "numbers", "company", "credible",
+)
+
+# Regex features, matched against the lowercased article text
+FEATURE_PATTERNS = {
+    "year": re.compile(r'\b\d{4}\b'),
+    "percent": re.compile(r'\b\d+%'),
+    "dollar": re.compile(r'\$[\d,]+'),
+    "numbers": re.compile(r'\b\d+'),
+    "company": re.compile(r'\b[A-Z][a-z]+\s+(Inc|Corp|Ltd|Co|LLC)\b', re.IGNORECASE),
+}
+
+
+@dataclass
+class ScoringPolicy:
+    """
+    Tunable weights and thresholds that turn extracted features into a score.
+    
+    Nothing here requires re-reading article text: changing the policy can be
+    applied to stored feature records (see score_feature_records). Recency is
+    not part of a stored score; each analysis carries a score for inside and
+    outside the recency window and the effective one is picked at read time.
+    """
+    bands: Dict[str, List[int]] = field(default_factory=lambda: {band: list(edges) for band, edges in RISK_BANDS.items()})
+    strong_strength: int = 100
+    medium_strength: int = 60
+    medium_min_count: int = 2
+    high_severity_categories: List[str] = field(default_factory=lambda: ["FACTORY_FAB_OUTAGE", "EXPORT_CONTROLS_SANCTIONS", "GEOPOLITICAL_CONFLICT"])
+    medium_severity_categories: List[str] = field(default_factory=lambda: ["SUPPLY_SHORTAGE", "TARIFF_TRADE_POLICY", "EOL_LIFECYCLE"])
+    high_severity: int = 35
+    medium_severity: int = 25
+    base_severity: int = 15
+    no_category_severity: int = 5
+    horizon_scores: Dict[str, int] = field(default_factory=lambda: {
+        "IMMEDIATE_0_2W": 20,
+        "NEAR_2_8W": 12,
+        "MEDIUM_2_6M": 6,
+        "LONG_6M_PLUS": 2
+    })
+    recency_bonus: int = 3
+    recency_hours: int = 48
+    immediacy_cap: int = 20
+    component_weight: int = 10
+    procurement_weight: int = 8
+    capacity_weight: int = 7
+    procurement_cap: int = 25
+    official_specificity: int = 20
+    credible_specificity: int = 14
+    numbers_specificity: int = 8
+    generic_specificity: int = 4
+    # Articles without electronics context and with low procurement relevance are capped
+    context_gate_relevance: int = 10
+    context_gate_max_score: int = 25
+    
+    def to_dict(self) -> dict:
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> "ScoringPolicy":
+        """Build a policy from a stored document, ignoring unknown keys"""
+        known = {f for f in cls.__dataclass_fields__}
+        return cls(**{k: v for k, v in (data or {}).items() if k in known and v is not None})
+    
+    @property
+    def version(self) -> str:
+        encoded = json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:12]
+    
+    def severity(self, categories: List[str]) -> int:
+        """Severity component (0-35 with default weights)"""
+        if any(cat in self.high_severity_categories for cat in categories):
+            return self.high_severity
+        elif any(cat in self.medium_severity_categories for cat in categories):
+            return self.medium_severity
+        elif categories:
+            return self.base_severity
+        else:
+            return self.no_category_severity
+    
+    def immediacy(self, time_horizon: str, recent: bool) -> int:
+        """Immediacy component (0-20 with default weights)"""
+        score = self.horizon_scores.get(time_horizon, self.horizon_scores.get("NEAR_2_8W", 12))
+        if recent:
+            score = min(self.immediacy_cap, score + self.recency_bonus)
+        return score
+    
+    def is_recent(self, published_at: Optional[datetime], now: Optional[datetime] = None) -> bool:
+        """Whether an article published at published_at gets the recency bonus"""
+        if published_at is None:
+            return False
+        now = now or datetime.now(timezone.utc)
+        return (now - published_at) < timedelta(hours=self.recency_hours)
+    
+    def procurement_relevance(self, features: "RiskFeatures") -> int:
+        """Procurement relevance component (0-25 with default weights)"""
+        score = 0
+        if features.component:
+            score += self.component_weight
+        if features.procurement:
+            score += self.procurement_weight
+        if features.capacity:
+            score += self.capacity_weight
+        return min(self.procurement_cap, score)
+    
+    def specificity(self, features: "RiskFeatures") -> int:
+        """Specificity/quality component (0-20 with default weights)"""
+        if features.official and (features.numbers or features.company):
+            return self.official_specificity
+        if features.credible:
+            return self.credible_specificity
+        if features.numbers or features.company:
+            return self.numbers_specificity
+        return self.generic_specificity
+    
+    def band(self, score: int) -> str:
+        """Determine risk band from score"""
+        for band, (low, high) in self.bands.items():
+            if low <= score <= high:
+                return band
+        return "LOW"
+
+
+DEFAULT_SCORING_POLICY = ScoringPolicy()
+
 
 # ============== DATA CLASSES ==============
 
 @dataclass
+class RiskFeatures:
+    """
+    Everything scoring needs from an article's text, extracted in one scan.
+    
+    Stored per article in compact form (to_record) so a policy change can be
+    re-applied without re-scanning text.
+    """
+    strong: Dict[str, int]
+    medium: Dict[str, int]
+    vague_count: int
+    time_horizon: str
+    context: bool = False
+    official: bool = False
+    component: bool = False
+    procurement: bool = False
+    capacity: bool = False
+    year: bool = False
+    percent: bool = False
+    dollar: bool = False
+    numbers: bool = False
+    company: bool = False
+    credible: bool = False
+    published_at: Optional[str] = None
+    trigger_terms: List[str] = field(default_factory=list)
+    text_truncated: bool = False
+    
+    def to_record(self) -> dict:
+        """Compact form stored on the article as riskFeatures"""
+        flags = 0
+        for bit, name in enumerate(FEATURE_FLAGS):
+            if getattr(self, name):
+                flags |= 1 << bit
+        return {"s": self.strong, "m": self.medium, "f": flags, "v": self.vague_count, "h": self.time_horizon}
+    
+    @classmethod
+    def from_record(cls, record: dict) -> "RiskFeatures":
+        flags = record.get("f", 0)
+        return cls(
+            strong=dict(record.get("s", {})),
+            medium=dict(record.get("m", {})),
+            vague_count=record.get("v", 0),
+            time_horizon=record.get("h", "NEAR_2_8W"),
+            **{name: bool(flags >> bit & 1) for bit, name in enumerate(FEATURE_FLAGS)}
+        )
+
+
+@dataclass(slots=True)
 class RiskAnalysis:
-    """Result of risk analysis for an article"""
+    """
+    Result of risk analysis for an article.
+    
+    risk_score/risk_band exclude the recency bonus and never go stale;
+    recent_risk_score/recent_risk_band apply while the article is within the
+    policy's recency window (see effective_risk).
+    
+    risk_category_mask and category_strength_array are fixed-order compact
+    forms of risk_categories and category_strength (see CATEGORY_SLOTS).
+    text_truncated is set when only part of the content was analyzed (see
+    apply_text_budget).
+    Slotted, and to_dict copies shallowly, to keep batch paths cheap.
+    """
     risk_score: int
     risk_band: str
     risk_categories: List[str]
     confidence: int
     time_horizon: str
     category_strength: Dict[str, int]
+    recent_risk_score: int = 0
+    recent_risk_band: str = "LOW"
+    risk_category_mask: int = 0
+    category_strength_array: List[int] = field(default_factory=list)
+    published_at: Optional[str] = None
+    trigger_terms: List[str] = field(default_factory=list)
+    features: Optional[dict] = None
+    text_truncated: bool = False
     
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {name: getattr(self, name) for name in RISK_ANALYSIS_FIELDS}
+
+
+RISK_ANALYSIS_FIELDS = tuple(f.name for f in fields(RiskAnalysis))
+
+
+def category_mask(categories: Iterable[str]) -> int:
+    """Bitmask of the categories, one bit per CATEGORY_SLOTS entry"""
+    mask = 0
+    for category in categories:
+        if category in CATEGORY_SLOTS:
+            mask |= 1 << CATEGORY_SLOTS[category]
+    return mask
+
+
+def category_strength_array(category_strength: Dict[str, int]) -> List[int]:
+    """Strength per CATEGORY_SLOTS entry, 0 where the category was not detected"""
+    strengths = [0] * len(CATEGORY_SLOTS)
+    for category, strength in category_strength.items():
+        if category in CATEGORY_SLOTS:
+            strengths[CATEGORY_SLOTS[category]] = strength
+    return strengths
+
+
+def categories_from_mask(mask: int) -> List[str]:
+    """Categories whose bits are set, in CATEGORY_SLOTS order"""
+    return [category for category, slot in CATEGORY_SLOTS.items() if mask >> slot & 1]
+
+
+def parse_published_at(value) -> Optional[datetime]:
+    """Parse an article date (ISO string or datetime) as an aware UTC datetime"""
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            # Try to parse ISO format
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if not isinstance(value, datetime):
+            return None
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+    except (ValueError, TypeError):
+        return None
+
+
+def article_published_at(article: dict) -> Optional[str]:
+    """Normalized publication timestamp of an article, as an ISO string"""
+    published_at = parse_published_at(article.get("iso_date") or article.get("date"))
+    return published_at.isoformat() if published_at else None
+
+
+def effective_risk(risk_data: dict, policy: ScoringPolicy, now: Optional[datetime] = None) -> Tuple[int, str]:
+    """Score and band of an analysis result as of `now`"""
+    if "recent_risk_score" in risk_data and policy.is_recent(parse_published_at(risk_data.get("published_at")), now):
+        return risk_data["recent_risk_score"], risk_data["recent_risk_band"]
+    return risk_data["risk_score"], risk_data["risk_band"]
+
+
+def score_features(features: RiskFeatures, policy: ScoringPolicy, categories: Iterable[str]) -> RiskAnalysis:
+    """
+    Apply a scoring policy to extracted features.
+    
+    Args:
+        features: Output of RuleBasedRiskEngine.extract_features
+        policy: Weights, thresholds and band edges
+        categories: Category names in config order
+    """
+    detected = []
+    category_strength = {}
+    has_strong = False
+    
+    # Apply category if context gating passes and either a strong trigger or
+    # enough medium triggers matched
+    if features.context:
+        for category in categories:
+            if features.strong.get(category, 0) > 0:
+                detected.append(category)
+                category_strength[category] = policy.strong_strength
+                has_strong = True
+            elif features.medium.get(category, 0) >= policy.medium_min_count:
+                detected.append(category)
+                category_strength[category] = policy.medium_strength
+    
+    confidence = _confidence(features, has_strong)
+    
+    severity = policy.severity(detected)
+    procurement_relevance = policy.procurement_relevance(features)
+    specificity = policy.specificity(features)
+    static_score = severity + procurement_relevance + specificity
+    
+    # If no electronics context and low relevance, reduce score
+    gated = not features.context and procurement_relevance < policy.context_gate_relevance
+    if gated:
+        detected = []
+        category_strength = {}
+    
+    # Total risk score (clamped 0-100), without and with the recency bonus
+    scores = []
+    for recent in (False, True):
+        risk_score = min(100, max(0, static_score + policy.immediacy(features.time_horizon, recent)))
+        risk_band = policy.band(risk_score)
+        if gated:
+            risk_score = min(risk_score, policy.context_gate_max_score)
+            risk_band = "LOW"
+        scores.append((risk_score, risk_band))
+    
+    return RiskAnalysis(
+        risk_score=scores[0][0],
+        risk_band=scores[0][1],
+        risk_categories=detected,
+        confidence=confidence,
+        time_horizon=features.time_horizon,
+        category_strength=category_strength,
+        recent_risk_score=scores[1][0],
+        recent_risk_band=scores[1][1],
+        risk_category_mask=category_mask(detected),
+        category_strength_array=category_strength_array(category_strength),
+        published_at=features.published_at,
+        trigger_terms=features.trigger_terms,
+        features=features.to_record(),
+        text_truncated=features.text_truncated
+    )
+
+
+def _confidence(features: RiskFeatures, has_strong: bool) -> int:
+    """Calculate confidence score (0-100)"""
+    confidence = 50  # Base confidence
+    
+    # Strong triggers present (+15)
+    if has_strong:
+        confidence += 15
+    
+    # Named entities/dates/numbers (+10)
+    if features.year:
+        confidence += 5
+    if features.percent:
+        confidence += 5
+    if features.dollar:
+        confidence += 5
+    
+    # Official language (+10)
+    if features.official:
+        confidence += 10
+    
+    # Credible source (+10)
+    if features.credible:
+        confidence += 10
+    
+    # Vague language (-15)
+    confidence -= min(15, features.vague_count * 5)
+    
+    return min(100, max(0, confidence))
 
 
 # ============== RISK ENGINE ==============
@@ -291,13 +993,28 @@ class RuleBasedRiskEngine:
     """
     Rule-based risk engine for electronics supply chain articles.
     
-    Can be swapped with MLRiskEngine later via configuration.
+    Analysis is split into feature extraction (text scanning, depends on the
+    trigger configuration) and scoring (pure arithmetic, depends on the
+    ScoringPolicy). Can be swapped with MLRiskEngine later via configuration.
     """
     
-    def __init__(self):
-        self.category_triggers = CATEGORY_TRIGGERS
-        self.context_words = ELECTRONICS_CONTEXT_WORDS
-        self.component_families = COMPONENT_FAMILIES
+    def __init__(self, category_triggers: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 matcher: Optional[TriggerMatcher] = None,
+                 policy: Optional[ScoringPolicy] = None,
+                 text_budget: Optional[int] = None):
+        if category_triggers is None:
+            self.category_triggers = CATEGORY_TRIGGERS
+            self.matcher = matcher or get_default_matcher()
+        else:
+            self.category_triggers = category_triggers
+            self.matcher = matcher or build_trigger_matcher(category_triggers)
+        self.policy = policy or DEFAULT_SCORING_POLICY
+        self.text_budget = DEFAULT_TEXT_BUDGET if text_budget is None else text_budget
+        # Feature records stay valid as long as this version does not change
+        self.feature_version = trigger_config_version(self.category_triggers, self.text_budget)
+        self.version = engine_version(self.feature_version, self.policy)
+        # Phrases this engine records in each article's trigger-term index
+        self.indexed_terms = self.matcher.phrases_for(TRIGGER_TERM_VOCABULARIES)
     
     def analyze(self, article: dict) -> RiskAnalysis:
         """
@@ -309,228 +1026,584 @@ class RuleBasedRiskEngine:
         Returns:
             RiskAnalysis object with all risk fields
         """
-        # Build text from available fields
-        title = article.get("title", "") or ""
-        content = article.get("fullContent") or article.get("summary") or ""
-        text = f"{title} {content}".lower()
-        
-        # Get source name
-        source = article.get("source", {})
-        if isinstance(source, dict):
-            source_name = source.get("name", "").lower()
-        else:
-            source_name = str(source).lower() if source else ""
-        
-        # Get published date
-        published_at = article.get("iso_date") or article.get("date")
-        
-        # Check electronics context gating
-        has_electronics_context = self._check_electronics_context(text)
+        return score_features(self.extract_features(article), self.policy, self.category_triggers)
+    
+    def extract_features(self, article: dict) -> RiskFeatures:
+        """Scan an article once and extract everything the scoring policy needs"""
+        normalized = normalize_article(article, self.text_budget)
+        text = normalized.text
+        source_name = normalized.source
         
-        # Detect categories
-        categories, category_strength = self._detect_categories(text, has_electronics_context)
+        # Single pass over the text for every trigger vocabulary
+        hits = self.matcher.scan(text)
         
-        # Determine time horizon
-        time_horizon = self._extract_time_horizon(text)
+        strong = {}
+        medium = {}
+        for category in self.category_triggers:
+            strong_count = hits.count(VOCAB_STRONG, category)
+            medium_count = hits.count(VOCAB_MEDIUM, category)
+            if strong_count:
+                strong[category] = strong_count
+            if medium_count:
+                medium[category] = medium_count
         
-        # Calculate confidence
-        confidence = self._calculate_confidence(text, categories, source_name)
+        return RiskFeatures(
+            strong=strong,
+            medium=medium,
+            vague_count=hits.count(VOCAB_VAGUE),
+            time_horizon=self._extract_time_horizon(hits),
+            context=hits.has(VOCAB_CONTEXT),
+            official=hits.has(VOCAB_OFFICIAL),
+            component=hits.has(VOCAB_COMPONENT),
+            procurement=hits.has(VOCAB_PROCUREMENT),
+            capacity=hits.has(VOCAB_CAPACITY),
+            year=bool(FEATURE_PATTERNS["year"].search(text)),
+            percent=bool(FEATURE_PATTERNS["percent"].search(text)),
+            dollar=bool(FEATURE_PATTERNS["dollar"].search(text)),
+            numbers=bool(FEATURE_PATTERNS["numbers"].search(text)),
+            company=bool(FEATURE_PATTERNS["company"].search(text)),
+            credible=any(src in source_name for src in CREDIBLE_SOURCES),
+            published_at=article_published_at(article),
+            trigger_terms=hits.terms(TRIGGER_TERM_VOCABULARIES),
+            text_truncated=normalized.truncated
+        )
+    
+    def score(self, features: RiskFeatures) -> RiskAnalysis:
+        """Score previously extracted features with this engine's policy"""
+        return score_features(features, self.policy, self.category_triggers)
+    
+    def _extract_time_horizon(self, hits: TriggerHits) -> str:
+        """Extract time horizon from text"""
+        for horizon in TIME_HORIZON_TRIGGERS:
+            if hits.has(VOCAB_TIME_HORIZON, horizon):
+                return horizon
+        return "NEAR_2_8W"  # Default
+
+
+# ============== VECTORIZED RE-SCORING ==============
+
+def score_feature_records(records: List[dict], policy: ScoringPolicy, categories: Iterable[str]) -> List[dict]:
+    """
+    Apply a scoring policy to stored feature records in one NumPy pass.
+    
+    Produces exactly what score_features would for each record, without the
+    text. Records must come from an engine with the same feature_version.
+    
+    Returns:
+        List of risk field dicts (no trigger_terms; the index is unchanged)
+    """
+    categories = list(categories)
+    n, c = len(records), len(categories)
+    if n == 0:
+        return []
+    column = {category: i for i, category in enumerate(categories)}
+    
+    strong = np.zeros((n, c), dtype=np.int32)
+    medium = np.zeros((n, c), dtype=np.int32)
+    flags = np.zeros(n, dtype=np.int64)
+    vague = np.zeros(n, dtype=np.int32)
+    horizons = []
+    for row, record in enumerate(records):
+        for category, count in record.get("s", {}).items():
+            if category in column:
+                strong[row, column[category]] = count
+        for category, count in record.get("m", {}).items():
+            if category in column:
+                medium[row, column[category]] = count
+        flags[row] = record.get("f", 0)
+        vague[row] = record.get("v", 0)
+        horizons.append(record.get("h", "NEAR_2_8W"))
+    
+    return _score_feature_arrays(strong, medium, flags, vague, horizons, policy, categories)
+
+
+def _score_feature_arrays(strong: np.ndarray, medium: np.ndarray, flags: np.ndarray, vague: np.ndarray,
+                          horizons: List[str], policy: ScoringPolicy, categories: List[str]) -> List[dict]:
+    """
+    Vectorized score_features over a batch.
+    
+    Args:
+        strong, medium: (articles x categories) distinct trigger counts
+        flags: FEATURE_FLAGS bitmask per article
+        vague: distinct vague phrase count per article
+        horizons: time horizon per article
+    """
+    n = len(horizons)
+    flag = {name: (flags >> bit & 1).astype(bool) for bit, name in enumerate(FEATURE_FLAGS)}
+    context = flag["context"]
+    
+    # Category detection and strength
+    strong_hit = (strong > 0) & context[:, None]
+    medium_hit = ~strong_hit & (medium >= policy.medium_min_count) & context[:, None]
+    detected = strong_hit | medium_hit
+    strength = np.where(strong_hit, policy.strong_strength, np.where(medium_hit, policy.medium_strength, 0))
+    
+    # Severity
+    high = np.array([cat in policy.high_severity_categories for cat in categories], dtype=bool)
+    med = np.array([cat in policy.medium_severity_categories for cat in categories], dtype=bool)
+    severity = np.select(
+        [(detected & high).any(axis=1), (detected & med).any(axis=1), detected.any(axis=1)],
+        [policy.high_severity, policy.medium_severity, policy.base_severity],
+        default=policy.no_category_severity
+    )
+    
+    # Immediacy, without and with the recency bonus
+    default_horizon = policy.horizon_scores.get("NEAR_2_8W", 12)
+    immediacy = np.array([policy.horizon_scores.get(h, default_horizon) for h in horizons], dtype=np.int64)
+    recent_immediacy = np.minimum(policy.immediacy_cap, immediacy + policy.recency_bonus)
+    
+    # Procurement relevance
+    procurement = np.minimum(
+        policy.procurement_cap,
+        flag["component"] * policy.component_weight
+        + flag["procurement"] * policy.procurement_weight
+        + flag["capacity"] * policy.capacity_weight
+    )
+    
+    # Specificity
+    numbers_or_company = flag["numbers"] | flag["company"]
+    specificity = np.select(
+        [flag["official"] & numbers_or_company, flag["credible"], numbers_or_company],
+        [policy.official_specificity, policy.credible_specificity, policy.numbers_specificity],
+        default=policy.generic_specificity
+    )
+    
+    # Confidence
+    confidence = (
+        50
+        + 15 * strong_hit.any(axis=1)
+        + 5 * (flag["year"].astype(np.int64) + flag["percent"] + flag["dollar"])
+        + 10 * (flag["official"].astype(np.int64) + flag["credible"])
+        - np.minimum(15, vague * 5)
+    )
+    confidence = np.clip(confidence, 0, 100)
+    
+    # Context gating
+    gated = ~context & (procurement < policy.context_gate_relevance)
+    static_score = severity + procurement + specificity
+    scores, bands = _score_bands(static_score + immediacy, gated, policy)
+    recent_scores, recent_bands = _score_bands(static_score + recent_immediacy, gated, policy)
+    
+    # Compact category fields: one matrix product for the masks
+    detected &= ~gated[:, None]
+    slots = np.array([CATEGORY_SLOTS.get(cat, -1) for cat in categories], dtype=np.int64)
+    fixed = slots >= 0
+    masks = detected[:, fixed].astype(np.int64) @ (np.int64(1) << slots[fixed])
+    strength_arrays = np.zeros((n, len(CATEGORY_SLOTS)), dtype=np.int64)
+    strength_arrays[:, slots[fixed]] = np.where(detected, strength, 0)[:, fixed]
+    strength_arrays = strength_arrays.tolist()
+    
+    results = []
+    for row in range(n):
+        if gated[row]:
+            row_categories = []
+            row_strength = {}
+        else:
+            hit_columns = np.flatnonzero(detected[row])
+            row_categories = [categories[i] for i in hit_columns]
+            row_strength = {categories[i]: int(strength[row, i]) for i in hit_columns}
+        results.append({
+            "risk_score": int(scores[row]),
+            "risk_band": bands[row],
+            "risk_categories": row_categories,
+            "confidence": int(confidence[row]),
+            "time_horizon": horizons[row],
+            "category_strength": row_strength,
+            "recent_risk_score": int(recent_scores[row]),
+            "recent_risk_band": recent_bands[row],
+            "risk_category_mask": int(masks[row]),
+            "category_strength_array": strength_arrays[row],
+        })
+    return results
+
+
+def _score_bands(totals: np.ndarray, gated: np.ndarray, policy: ScoringPolicy) -> Tuple[np.ndarray, List[str]]:
+    """Clamp totals, assign bands (first matching band wins) and apply context gating"""
+    scores = np.clip(totals, 0, 100)
+    band_names = list(policy.bands) + ["LOW"]
+    band_index = np.full(len(scores), len(band_names) - 1, dtype=np.int64)
+    for i, (low, high) in reversed(list(enumerate(policy.bands.values()))):
+        band_index = np.where((scores >= low) & (scores <= high), i, band_index)
+    band_index = np.where(gated, len(band_names) - 1, band_index)
+    scores = np.where(gated, np.minimum(scores, policy.context_gate_max_score), scores)
+    return scores, [band_names[i] for i in band_index]
+
+
+# ============== VECTORIZED ENGINE ==============
+
+# Feature patterns that never span whitespace, so they can be evaluated per word
+WORD_FEATURE_PATTERNS = ("year", "percent", "dollar", "numbers")
+# A company match needs a word starting with one of these suffixes
+COMPANY_SUFFIX_PATTERN = re.compile(r'(inc|corp|ltd|co|llc)\b')
+
+
+class VectorizedRiskEngine(RuleBasedRiskEngine):
+    """
+    Batch variant of the rule-based engine for whole-corpus scoring.
+    
+    A batch is tokenized once into whitespace-separated words. Every distinct
+    word is scanned once by a matcher for the single-word phrases and the parts
+    of multi-word phrases; an article-by-word sparse matrix (CSR) then gives
+    the article-by-phrase matrix. Multi-word phrases are confirmed with a
+    substring test only in articles that contain all their parts. One
+    sparse-dense product with the phrase-by-tag incidence matrix yields every
+    vocabulary count, and the score components come from the same array code
+    as score_feature_records.
+    
+    Results are identical to RuleBasedRiskEngine.analyze: a phrase without
+    whitespace can only occur inside a single word, and a phrase with
+    whitespace only where each of its parts occurs inside some word.
+    """
+    
+    # Distinct words whose scan results are kept between batches
+    word_cache_size = 200000
+    
+    def __init__(self, category_triggers: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 matcher: Optional[TriggerMatcher] = None,
+                 policy: Optional[ScoringPolicy] = None,
+                 text_budget: Optional[int] = None,
+                 batch_size: int = 5000):
+        super().__init__(category_triggers, matcher, policy, text_budget)
+        self.batch_size = batch_size
+        self.categories = list(self.category_triggers)
         
-        # Calculate risk score components
-        severity = self._calculate_severity(categories)
-        immediacy = self._calculate_immediacy(time_horizon, published_at)
-        procurement_relevance = self._calculate_procurement_relevance(text)
-        specificity = self._calculate_specificity(text, source_name)
+        # Matrix columns in alphabetical order, so a row lists its terms sorted
+        tags = self.matcher._tags
+        self.phrases = sorted(tags)
+        column = {phrase: i for i, phrase in enumerate(self.phrases)}
+        single = [p for p in self.phrases if len(p.split()) == 1]
+        multi = [p for p in self.phrases if len(p.split()) > 1]
+        self._parts = sorted({part for phrase in multi for part in phrase.split()})
+        part_column = {part: i for i, part in enumerate(self._parts)}
         
-        # Total risk score (clamped 0-100)
-        risk_score = min(100, max(0, severity + immediacy + procurement_relevance + specificity))
+        self._word_matcher = TriggerMatcher([("phrase", None, single), ("part", None, self._parts)])
+        self._phrase_column = column
+        self._part_column = part_column
+        self._word_cache: Dict[str, Tuple[np.ndarray, np.ndarray, int]] = {}
         
-        # Determine risk band
-        risk_band = self._get_risk_band(risk_score)
+        # Multi-word phrases: columns and required parts (parts x phrases)
+        self._multi = multi
+        self._multi_columns = np.array([column[p] for p in multi], dtype=np.int64)
+        self._multi_parts = np.zeros((len(self._parts), len(multi)), dtype=np.int32)
+        for j, phrase in enumerate(multi):
+            for part in set(phrase.split()):
+                self._multi_parts[part_column[part], j] = 1
+        self._multi_part_counts = self._multi_parts.sum(axis=0)
         
-        # If no electronics context and low relevance, reduce score
-        if not has_electronics_context and procurement_relevance < 10:
-            risk_score = min(risk_score, 25)
-            risk_band = "LOW"
-            categories = []
-            category_strength = {}
-        
-        return RiskAnalysis(
-            risk_score=risk_score,
-            risk_band=risk_band,
-            risk_categories=categories,
-            confidence=confidence,
-            time_horizon=time_horizon,
-            category_strength=category_strength
+        # Phrase-by-tag incidence matrix
+        tag_columns = (
+            [(VOCAB_STRONG, c) for c in self.categories]
+            + [(VOCAB_MEDIUM, c) for c in self.categories]
+            + [(VOCAB_TIME_HORIZON, h) for h in TIME_HORIZON_TRIGGERS]
+            + [(vocabulary, None) for vocabulary in
+               (VOCAB_CONTEXT, VOCAB_OFFICIAL, VOCAB_VAGUE, VOCAB_COMPONENT, VOCAB_PROCUREMENT, VOCAB_CAPACITY)]
         )
+        self._tag_index = {tag: i for i, tag in enumerate(tag_columns)}
+        self._incidence = np.zeros((len(self.phrases), len(tag_columns)), dtype=np.int32)
+        for row, phrase in enumerate(self.phrases):
+            for tag in tags[phrase]:
+                if tag in self._tag_index:
+                    self._incidence[row, self._tag_index[tag]] = 1
+        self._is_term = np.array([phrase in self.indexed_terms for phrase in self.phrases], dtype=bool)
     
-    def _check_electronics_context(self, text: str) -> bool:
-        """Check if text contains electronics/procurement context words"""
-        for word in self.context_words:
-            if word in text:
-                return True
-        return False
+    def analyze(self, article: dict) -> RiskAnalysis:
+        return self.analyze_batch([article])[0]
     
-    def _detect_categories(self, text: str, has_context: bool) -> Tuple[List[str], Dict[str, int]]:
-        """
-        Detect risk categories based on trigger words.
+    def analyze_batch(self, articles: List[dict]) -> List[RiskAnalysis]:
+        """Analyze articles in input order, batch_size at a time"""
+        results = []
+        for start in range(0, len(articles), self.batch_size):
+            results.extend(self._analyze_batch(articles[start:start + self.batch_size]))
+        return results
+    
+    def _analyze_batch(self, articles: List[dict]) -> List[RiskAnalysis]:
+        n = len(articles)
+        if n == 0:
+            return []
+        texts, sources, published, truncated, article_words = [], [], [], [], []
+        for article in articles:
+            normalized = normalize_article(article, self.text_budget)
+            truncated.append(normalized.truncated)
+            texts.append(normalized.text)
+            sources.append(normalized.source)
+            # Stored on the article after its first analysis (textTokens)
+            article_words.append(normalized.tokens)
+            published.append(article_published_at(article))
         
-        Returns:
-            Tuple of (list of category names, dict of category -> strength 0-100)
-        """
-        categories = []
-        category_strength = {}
+        # Article-by-word matrix (CSR) over the distinct words of the batch
+        vocabulary: Dict[str, int] = {}
+        word_ids = []
+        row_lengths = np.zeros(n, dtype=np.int64)
+        for row, words in enumerate(article_words):
+            row_lengths[row] = len(words)
+            for word in words:
+                word_id = vocabulary.get(word)
+                if word_id is None:
+                    word_id = vocabulary[word] = len(vocabulary)
+                word_ids.append(word_id)
+        rows = np.repeat(np.arange(n, dtype=np.int64), row_lengths)
+        word_ids = np.array(word_ids, dtype=np.int64)
+        word_indptr = np.concatenate(([0], np.cumsum(row_lengths)))
         
-        for category, triggers in self.category_triggers.items():
-            strong_triggers = triggers.get("strong", [])
-            medium_triggers = triggers.get("medium", [])
-            
-            strong_match = any(trigger in text for trigger in strong_triggers)
-            medium_count = sum(1 for trigger in medium_triggers if trigger in text)
-            
-            # Apply category if:
-            # - Strong trigger AND context gating passes, OR
-            # - 2+ medium triggers AND context gating passes
-            if has_context:
-                if strong_match:
-                    categories.append(category)
-                    category_strength[category] = 100
-                elif medium_count >= 2:
-                    categories.append(category)
-                    category_strength[category] = 60
-        
-        return categories, category_strength
-    
-    def _extract_time_horizon(self, text: str) -> str:
-        """Extract time horizon from text"""
-        for horizon, triggers in TIME_HORIZON_TRIGGERS.items():
-            for trigger in triggers:
-                if trigger in text:
-                    return horizon
-        return "NEAR_2_8W"  # Default
-    
-    def _calculate_confidence(self, text: str, categories: List[str], source_name: str) -> int:
-        """Calculate confidence score (0-100)"""
-        confidence = 50  # Base confidence
-        
-        # Strong triggers present (+15)
-        if categories:
-            for cat in categories:
-                if any(t in text for t in self.category_triggers.get(cat, {}).get("strong", [])):
-                    confidence += 15
-                    break
-        
-        # Named entities/dates/numbers (+10)
-        if re.search(r'\b\d{4}\b', text):  # Year
-            confidence += 5
-        if re.search(r'\b\d+%', text):  # Percentage
-            confidence += 5
-        if re.search(r'\$[\d,]+', text):  # Dollar amount
-            confidence += 5
-        
-        # Official language (+10)
-        if any(ind in text for ind in OFFICIAL_INDICATORS):
-            confidence += 10
-        
-        # Credible source (+10)
-        if any(src in source_name for src in CREDIBLE_SOURCES):
-            confidence += 10
-        
-        # Vague language (-15)
-        vague_count = sum(1 for ind in VAGUE_INDICATORS if ind in text)
-        confidence -= min(15, vague_count * 5)
-        
-        return min(100, max(0, confidence))
-    
-    def _calculate_severity(self, categories: List[str]) -> int:
-        """Calculate severity component (0-35)"""
-        high_severity_cats = ["FACTORY_FAB_OUTAGE", "EXPORT_CONTROLS_SANCTIONS", "GEOPOLITICAL_CONFLICT"]
-        medium_severity_cats = ["SUPPLY_SHORTAGE", "TARIFF_TRADE_POLICY", "EOL_LIFECYCLE"]
-        
-        if any(cat in high_severity_cats for cat in categories):
-            return 35
-        elif any(cat in medium_severity_cats for cat in categories):
-            return 25
-        elif categories:
-            return 15
-        else:
-            return 5
-    
-    def _calculate_immediacy(self, time_horizon: str, published_at: Optional[str]) -> int:
-        """Calculate immediacy component (0-20)"""
-        horizon_scores = {
-            "IMMEDIATE_0_2W": 20,
-            "NEAR_2_8W": 12,
-            "MEDIUM_2_6M": 6,
-            "LONG_6M_PLUS": 2
-        }
+        phrase_lists, part_lists, word_bits = self._scan_words(list(vocabulary))
         
-        score = horizon_scores.get(time_horizon, 12)
-        
-        # Recency bonus (within 48 hours)
-        if published_at:
-            try:
-                if isinstance(published_at, str):
-                    # Try to parse ISO format
-                    pub_date = datetime.fromisoformat(published_at.replace('Z', '+00:00'))
-                else:
-                    pub_date = published_at
-                
-                now = datetime.now(timezone.utc)
-                if (now - pub_date) < timedelta(hours=48):
-                    score = min(20, score + 3)
-            except (ValueError, TypeError):
-                pass
+        # Single-word phrases, and which multi-word phrase parts each article has
+        phrase_rows, phrase_columns = _expand_rows(rows, word_ids, phrase_lists)
+        part_rows, part_columns = _expand_rows(rows, word_ids, part_lists)
+        has_part = np.zeros((n, len(self._parts)), dtype=np.int32)
+        has_part[part_rows, part_columns] = 1
         
-        return score
-    
-    def _calculate_procurement_relevance(self, text: str) -> int:
-        """Calculate procurement relevance component (0-25)"""
-        score = 0
+        # Multi-word phrases: substring test where all parts are present
+        candidates = np.nonzero(has_part @ self._multi_parts == self._multi_part_counts)
+        confirmed = [
+            (row, j) for row, j in zip(candidates[0].tolist(), candidates[1].tolist())
+            if self._multi[j] in texts[row]
+        ]
+        if confirmed:
+            confirmed_rows, confirmed_multi = np.array(confirmed, dtype=np.int64).T
+            phrase_rows = np.concatenate((phrase_rows, confirmed_rows))
+            phrase_columns = np.concatenate((phrase_columns, self._multi_columns[confirmed_multi]))
+        
+        p = len(self.phrases)
+        cells = np.unique(phrase_rows * p + phrase_columns)
+        indptr = np.searchsorted(cells // p, np.arange(n + 1))
+        indices = cells % p
+        counts = self._tag_counts(indptr, indices, n)
+        column = self._tag_index
+        
+        def tag_count(vocabulary: str, group: Optional[str] = None) -> np.ndarray:
+            return counts[:, column[(vocabulary, group)]]
+        
+        c = len(self.categories)
+        strong = counts[:, :c]
+        medium = counts[:, c:2 * c]
+        vague = tag_count(VOCAB_VAGUE)
+        
+        horizon_names = list(TIME_HORIZON_TRIGGERS)
+        horizon_hits = counts[:, 2 * c:2 * c + len(horizon_names)] > 0
+        first_horizon = np.argmax(horizon_hits, axis=1)
+        horizons = [
+            horizon_names[first_horizon[row]] if horizon_hits[row].any() else "NEAR_2_8W"
+            for row in range(n)
+        ]
+        
+        credible_by_source: Dict[str, bool] = {}
+        for source_name in sources:
+            if source_name not in credible_by_source:
+                credible_by_source[source_name] = any(src in source_name for src in CREDIBLE_SOURCES)
+        
+        # Per-word pattern bits, OR-ed per article
+        row_bits = np.zeros(n, dtype=np.int64)
+        nonempty = row_lengths > 0
+        if len(word_ids):
+            row_bits[nonempty] = np.bitwise_or.reduceat(word_bits[word_ids], word_indptr[:-1][nonempty])
+        flag_values = {
+            "context": tag_count(VOCAB_CONTEXT) > 0,
+            "official": tag_count(VOCAB_OFFICIAL) > 0,
+            "component": tag_count(VOCAB_COMPONENT) > 0,
+            "procurement": tag_count(VOCAB_PROCUREMENT) > 0,
+            "capacity": tag_count(VOCAB_CAPACITY) > 0,
+            "credible": np.array([credible_by_source[s] for s in sources], dtype=bool),
+        }
+        for bit, name in enumerate(WORD_FEATURE_PATTERNS):
+            flag_values[name] = (row_bits >> bit & 1).astype(bool)
+        company_bit = len(WORD_FEATURE_PATTERNS)
+        company = np.zeros(n, dtype=bool)
+        for row in np.flatnonzero(row_bits >> company_bit & 1).tolist():
+            company[row] = FEATURE_PATTERNS["company"].search(texts[row]) is not None
+        flag_values["company"] = company
         
-        # Component families (+10)
-        if any(comp in text for comp in self.component_families):
-            score += 10
+        flags = np.zeros(n, dtype=np.int64)
+        for bit, name in enumerate(FEATURE_FLAGS):
+            flags |= flag_values[name].astype(np.int64) << bit
         
-        # Allocation/lead time/pricing language (+8)
-        procurement_terms = ["allocation", "lead time", "lead-time", "pricing", "inventory", "supply"]
-        if any(term in text for term in procurement_terms):
-            score += 8
+        scored = _score_feature_arrays(strong, medium, flags, vague, horizons, self.policy, self.categories)
         
-        # Manufacturing capacity/logistics (+7)
-        capacity_terms = ["capacity", "fab", "factory", "manufacturing", "logistics", "shipping"]
-        if any(term in text for term in capacity_terms):
-            score += 7
+        results = []
+        for row, risk_fields in enumerate(scored):
+            row_columns = indices[indptr[row]:indptr[row + 1]]
+            features = {
+                "s": {self.categories[i]: int(strong[row, i]) for i in np.flatnonzero(strong[row])},
+                "m": {self.categories[i]: int(medium[row, i]) for i in np.flatnonzero(medium[row])},
+                "f": int(flags[row]),
+                "v": int(vague[row]),
+                "h": horizons[row],
+            }
+            results.append(RiskAnalysis(
+                **risk_fields,
+                published_at=published[row],
+                trigger_terms=[self.phrases[i] for i in row_columns[self._is_term[row_columns]]],
+                features=features,
+                text_truncated=truncated[row]
+            ))
+        return results
+    
+    def _scan_words(self, words: List[str]) -> Tuple[List[np.ndarray], List[np.ndarray], np.ndarray]:
+        """
+        Phrase columns, part columns and pattern bits of each distinct word.
+        
+        Bits follow WORD_FEATURE_PATTERNS, then one bit for a company suffix.
+        """
+        cache = self._word_cache
+        if len(cache) > self.word_cache_size:
+            cache.clear()
+        phrase_lists, part_lists = [], []
+        word_bits = np.zeros(len(words), dtype=np.int64)
+        for i, word in enumerate(words):
+            entry = cache.get(word)
+            if entry is None:
+                hits = self._word_matcher.scan(word)
+                bits = 0
+                for bit, name in enumerate(WORD_FEATURE_PATTERNS):
+                    if FEATURE_PATTERNS[name].search(word):
+                        bits |= 1 << bit
+                if COMPANY_SUFFIX_PATTERN.match(word):
+                    bits |= 1 << len(WORD_FEATURE_PATTERNS)
+                entry = cache[word] = (
+                    np.array([self._phrase_column[p] for p in hits.terms(["phrase"])], dtype=np.int64),
+                    np.array([self._part_column[p] for p in hits.terms(["part"])], dtype=np.int64),
+                    bits,
+                )
+            phrase_lists.append(entry[0])
+            part_lists.append(entry[1])
+            word_bits[i] = entry[2]
+        return phrase_lists, part_lists, word_bits
+    
+    def _tag_counts(self, indptr: np.ndarray, indices: np.ndarray, n: int) -> np.ndarray:
+        """Sparse-dense product: distinct phrases found per (article, tag)"""
+        counts = np.zeros((n, self._incidence.shape[1]), dtype=np.int64)
+        if len(indices):
+            nonempty = indptr[:-1] < indptr[1:]
+            counts[nonempty] = np.add.reduceat(self._incidence[indices], indptr[:-1][nonempty], axis=0)
+        return counts
+
+
+def _expand_rows(rows: np.ndarray, items: np.ndarray, item_columns: List[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sparse product of (rows, items) pairs with a per-item column list:
+    returns (row, column) pairs, possibly with duplicates.
+    """
+    lengths = np.array([len(cols) for cols in item_columns], dtype=np.int64)
+    if not len(items) or not lengths.any():
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    flat = np.concatenate(item_columns).astype(np.int64)
+    pair_lengths = lengths[items]
+    offsets = np.repeat(indptr[items] - np.cumsum(pair_lengths) + pair_lengths, pair_lengths)
+    return np.repeat(rows, pair_lengths), flat[offsets + np.arange(pair_lengths.sum())]
+
+
+# ============== REGISTRY ==============
+
+class RiskEngineRegistry:
+    """
+    Process-wide holder of the compiled rule-based engine.
+
+    The engine is compiled once from the trigger configuration and replaced
+    as a whole when the configuration changes. Callers that analyze a batch
+    should fetch the engine once and use it for the entire batch, so a reload
+    never mixes old and new triggers within one batch.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._engine: Optional[RuleBasedRiskEngine] = None
+        self._vectorized: Optional[VectorizedRiskEngine] = None
+        self._ml = None
+        self.loaded_at: Optional[str] = None
+        self.source = "builtin"
+    
+    def get(self) -> RuleBasedRiskEngine:
+        """Return the current engine, compiling the built-in triggers on first use"""
+        engine = self._engine
+        if engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._swap(RuleBasedRiskEngine(), "builtin")
+                engine = self._engine
+        return engine
+    
+    def get_vectorized(self) -> "VectorizedRiskEngine":
+        """Batch engine equivalent to get(), rebuilt (reusing its matcher) after a reload"""
+        engine = self.get()
+        vectorized = self._vectorized
+        if vectorized is None or vectorized.version != engine.version:
+            vectorized = VectorizedRiskEngine(
+                engine.category_triggers, matcher=engine.matcher, policy=engine.policy, text_budget=engine.text_budget
+            )
+            self._vectorized = vectorized
+        return vectorized
+    
+    def get_ml(self):
+        """
+        ML engine from the model at ML_RISK_MODEL_PATH, using the current
+        scoring policy for bands. Weights are memory-mapped, so loading is cheap.
+        """
+        from ml_risk_engine import DEFAULT_MODEL_PATH, MLRiskEngine
         
-        return min(25, score)
+        policy = self.get().policy
+        path = os.environ.get("ML_RISK_MODEL_PATH") or DEFAULT_MODEL_PATH
+        ml = self._ml
+        if ml is None or ml.policy is not policy or str(ml.path) != str(path):
+            ml = MLRiskEngine(path, policy=policy)
+            self._ml = ml
+        return ml
+    
+    @property
+    def version(self) -> str:
+        return self.get().version
     
-    def _calculate_specificity(self, text: str, source_name: str) -> int:
-        """Calculate specificity/quality component (0-20)"""
-        # Official statement/numbers/dates
-        has_official = any(ind in text for ind in OFFICIAL_INDICATORS)
-        has_numbers = bool(re.search(r'\b\d+', text))
-        has_company = bool(re.search(r'\b[A-Z][a-z]+\s+(Inc|Corp|Ltd|Co|LLC)\b', text, re.IGNORECASE))
+    def load(self, configs: List[dict], policy: Optional[dict] = None) -> str:
+        """
+        Compile an engine from risk_category_configs documents and swap it in.
         
-        if has_official and (has_numbers or has_company):
-            return 20
+        Falls back to the built-in CATEGORY_TRIGGERS when no configs exist and
+        to DEFAULT_SCORING_POLICY when no policy document exists. Recompiles
+        the matcher only if the trigger configuration actually changed; a
+        policy-only change reuses it.
         
-        # Credible trade press
-        if any(src in source_name for src in CREDIBLE_SOURCES):
-            return 14
+        Returns:
+            Version hash of the active engine
+        """
+        category_triggers = category_triggers_from_configs(configs) if configs else None
+        source = "database" if category_triggers else "builtin"
+        scoring_policy = ScoringPolicy.from_dict(policy) if policy else DEFAULT_SCORING_POLICY
+        feature_version = trigger_config_version(category_triggers or CATEGORY_TRIGGERS, DEFAULT_TEXT_BUDGET)
+        version = engine_version(feature_version, scoring_policy)
         
-        # Has some specificity
-        if has_numbers or has_company:
-            return 8
+        with self._lock:
+            current = self._engine
+            if current is not None and current.version == version:
+                self.source = source
+                return version
         
-        # Generic/opinion
-        return 4
+        # Compile outside the lock; analysis keeps using the old engine meanwhile
+        matcher = current.matcher if current is not None and current.feature_version == feature_version else None
+        engine = RuleBasedRiskEngine(category_triggers, matcher=matcher, policy=scoring_policy)
+        with self._lock:
+            self._swap(engine, source)
+        return engine.version
     
-    def _get_risk_band(self, score: int) -> str:
-        """Determine risk band from score"""
-        for band, (low, high) in RISK_BANDS.items():
-            if low <= score <= high:
-                return band
-        return "LOW"
+    def _swap(self, engine: RuleBasedRiskEngine, source: str):
+        self._engine = engine
+        self.source = source
+        self.loaded_at = datetime.now(timezone.utc).isoformat()
+    
+    def info(self) -> dict:
+        engine = self.get()
+        return {
+            "version": engine.version,
+            "featureVersion": engine.feature_version,
+            "policyVersion": engine.policy.version,
+            "source": self.source,
+            "loadedAt": self.loaded_at,
+            "categories": list(engine.category_triggers.keys()),
+            "phraseCount": len(engine.matcher.phrases),
+            "textBudget": engine.text_budget,
+        }
+
+
+engine_registry = RiskEngineRegistry()
 
 
 # ============== FACTORY ==============
@@ -544,16 +1617,19 @@ class RiskEngineFactory:
         Get risk engine instance.
         
         Args:
-            engine_type: "rule_based" or "ml" (ml not implemented yet)
+            engine_type: "rule_based", "vectorized" (batch scoring, same
+                results as rule_based) or "ml" (trained model, see
+                ml_risk_engine.py)
             
         Returns:
-            RiskEngine instance
+            RiskEngine instance (rule_based is the shared, pre-compiled engine)
         """
         if engine_type == "rule_based":
-            return RuleBasedRiskEngine()
+            return engine_registry.get()
+        elif engine_type == "vectorized":
+            return engine_registry.get_vectorized()
         elif engine_type == "ml":
-            # TODO: Implement MLRiskEngine later
-            raise NotImplementedError("ML Risk Engine not implemented yet")
+            return engine_registry.get_ml()
         else:
             raise ValueError(f"Unknown engine type: {engine_type}")
 
@@ -588,8 +1664,256 @@ def analyze_articles_batch(articles: List[dict], engine_type: str = "rule_based"
         List of risk analysis dicts
     """
     engine = RiskEngineFactory.get_engine(engine_type)
+    return _analyze_list(engine, articles)
+
+
+def iter_analyze_articles(articles: Iterable[dict], engine_type: str = "rule_based",
+                          batch_size: int = 500) -> Iterator[dict]:
+    """
+    Streaming analyze_articles_batch: reads `articles` batch_size at a time
+    and yields result dicts in input order, for inputs that do not fit in
+    memory.
+    """
+    engine = RiskEngineFactory.get_engine(engine_type)
+    batch = []
+    for article in articles:
+        batch.append(article)
+        if len(batch) >= batch_size:
+            yield from _analyze_list(engine, batch)
+            batch = []
+    if batch:
+        yield from _analyze_list(engine, batch)
+
+
+def _analyze_list(engine, articles: List[dict]) -> List[dict]:
+    if hasattr(engine, "analyze_batch"):
+        return [result.to_dict() for result in engine.analyze_batch(articles)]
+    return [engine.analyze(article).to_dict() for article in articles]
+
+
+def _analyze_list_timed(engine, articles: List[dict]) -> Tuple[List[dict], List[float]]:
+    """
+    Like _analyze_list, with latency samples in milliseconds: one per article,
+    or one per call (its per-article mean) for engines that score whole
+    batches, since those cannot attribute time to single articles.
+    """
+    if not articles:
+        return [], []
+    if hasattr(engine, "analyze_batch"):
+        start = time.perf_counter()
+        results = [result.to_dict() for result in engine.analyze_batch(articles)]
+        return results, [(time.perf_counter() - start) * 1000 / len(articles)]
     results = []
+    samples = []
     for article in articles:
-        result = engine.analyze(article)
-        results.append(result.to_dict())
-    return results
+        start = time.perf_counter()
+        results.append(engine.analyze(article).to_dict())
+        samples.append((time.perf_counter() - start) * 1000)
+    return results, samples
+
+
+# ============== PARALLEL BATCH ANALYSIS ==============
+
+# Only these fields are shipped to worker processes
+ANALYSIS_FIELDS = ("title", "fullContent", "summary", "source", "iso_date", "date")
+# Candidate engines also get the stored token record (see text_normalization)
+CANDIDATE_FIELDS = ANALYSIS_FIELDS + ("textTokens",)
+
+_worker_engine: Optional[RuleBasedRiskEngine] = None
+# (spec key, engine) of the last candidate built in this worker
+_worker_candidate: Optional[tuple] = None
+
+
+def _init_worker(category_triggers: Optional[Dict[str, Dict[str, List[str]]]], policy: dict, text_budget: int):
+    """Compile the engine once per worker process"""
+    global _worker_engine
+    _worker_engine = RuleBasedRiskEngine(category_triggers, policy=ScoringPolicy.from_dict(policy), text_budget=text_budget)
+
+
+def _analyze_chunk(chunk: List[dict]) -> List[dict]:
+    return [_worker_engine.analyze(article).to_dict() for article in chunk]
+
+
+def _analyze_chunk_timed(chunk: List[dict]) -> Tuple[List[dict], List[float]]:
+    return _analyze_list_timed(_worker_engine, chunk)
+
+
+def build_candidate_engine(spec: dict, primary: RuleBasedRiskEngine):
+    """
+    Engine described by a candidate spec, derived from the primary engine.
+
+    spec["engine"] is "vectorized" or "ml" (the primary's triggers and
+    policy), or "rule_based" with optional "categoryTriggers" and "policy"
+    overrides, so a trigger configuration can be tried without saving it.
+    """
+    engine_type = spec.get("engine", "vectorized")
+    if engine_type == "vectorized":
+        return VectorizedRiskEngine(
+            primary.category_triggers, matcher=primary.matcher, policy=primary.policy, text_budget=primary.text_budget
+        )
+    if engine_type == "ml":
+        from ml_risk_engine import DEFAULT_MODEL_PATH, MLRiskEngine
+        return MLRiskEngine(os.environ.get("ML_RISK_MODEL_PATH") or DEFAULT_MODEL_PATH, policy=primary.policy)
+    if engine_type == "rule_based":
+        return RuleBasedRiskEngine(
+            spec.get("categoryTriggers") or primary.category_triggers,
+            policy=ScoringPolicy.from_dict({**primary.policy.to_dict(), **(spec.get("policy") or {})}),
+            text_budget=primary.text_budget
+        )
+    raise ValueError(f"Unknown candidate engine type: {engine_type}")
+
+
+def _analyze_candidate_chunk(spec: dict, chunk: List[dict]) -> Tuple[List[dict], List[float], Optional[str]]:
+    """Score a chunk with the spec's candidate engine: (results, latency samples in ms, engine version)"""
+    global _worker_candidate
+    if _worker_candidate is None or _worker_candidate[0] != spec.get("key"):
+        _worker_candidate = (spec.get("key"), build_candidate_engine(spec, _worker_engine))
+    engine = _worker_candidate[1]
+    results, samples = _analyze_list_timed(engine, chunk)
+    return results, samples, getattr(engine, "version", None)
+
+
+def _iter_chunks(articles: Iterable[dict], chunk_size: int, fields: Tuple[str, ...] = ANALYSIS_FIELDS) -> Iterator[List[dict]]:
+    chunk = []
+    for article in articles:
+        chunk.append({field: article.get(field) for field in fields})
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ParallelRiskAnalyzer:
+    """
+    Scores article batches in a pool of worker processes.
+    
+    Each worker compiles the engine once for the trigger version it was
+    started with; the pool is replaced when the registry version changes.
+    A replaced pool keeps serving the calls that already hold it and is shut
+    down when the last of them finishes. Results are returned in input order.
+    """
+    
+    def __init__(self, workers: Optional[int] = None, chunk_size: int = 100):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._version: Optional[str] = None
+        # Calls in progress per pool
+        self._users: Dict[ProcessPoolExecutor, int] = {}
+    
+    def _acquire(self, engine: RuleBasedRiskEngine) -> ProcessPoolExecutor:
+        """The pool for the engine's version, held until _release()"""
+        with self._lock:
+            if self._executor is None or self._version != engine.version:
+                if self._executor is not None and not self._users.get(self._executor):
+                    self._executor.shutdown(wait=False)
+                builtin = engine.category_triggers is CATEGORY_TRIGGERS
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(None if builtin else engine.category_triggers, engine.policy.to_dict(), engine.text_budget),
+                )
+                self._version = engine.version
+            executor = self._executor
+            self._users[executor] = self._users.get(executor, 0) + 1
+            return executor
+    
+    def _release(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            self._users[executor] -= 1
+            if not self._users[executor]:
+                del self._users[executor]
+                if executor is not self._executor:
+                    # Replaced while this call was using it
+                    executor.shutdown(wait=False)
+    
+    def analyze(self, articles: Iterable[dict], engine: Optional[RuleBasedRiskEngine] = None) -> List[dict]:
+        """Score articles in parallel (blocking)"""
+        return list(self.iter_analyze(articles, engine))
+    
+    def iter_analyze(self, articles: Iterable[dict], engine: Optional[RuleBasedRiskEngine] = None) -> Iterator[dict]:
+        """
+        Score articles in parallel, yielding results in input order (blocking).
+        
+        At most two chunks per worker are in flight and `articles` is read
+        only as fast as results are consumed, so memory stays bounded for
+        inputs of any size.
+        """
+        executor = self._acquire(engine or engine_registry.get())
+        try:
+            pending = collections.deque()
+            for chunk in _iter_chunks(articles, self.chunk_size):
+                pending.append(executor.submit(_analyze_chunk, chunk))
+                if len(pending) >= self.workers * 2:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        finally:
+            self._release(executor)
+    
+    async def analyze_async(self, articles: Iterable[dict], engine: Optional[RuleBasedRiskEngine] = None,
+                            latencies: Optional[List[float]] = None) -> List[dict]:
+        """
+        Score articles in parallel without blocking the event loop.
+        
+        When `latencies` is given, workers time each article and the samples
+        (milliseconds) are appended to it.
+        """
+        executor = self._acquire(engine or engine_registry.get())
+        try:
+            loop = asyncio.get_running_loop()
+            worker = _analyze_chunk if latencies is None else _analyze_chunk_timed
+            futures = [
+                loop.run_in_executor(executor, worker, chunk)
+                for chunk in _iter_chunks(articles, self.chunk_size)
+            ]
+            results = []
+            for chunk_results in await asyncio.gather(*futures):
+                if latencies is not None:
+                    chunk_results, samples = chunk_results
+                    latencies.extend(samples)
+                results.extend(chunk_results)
+            return results
+        finally:
+            self._release(executor)
+    
+    async def analyze_candidate_async(
+        self, articles: List[dict], spec: dict, engine: Optional[RuleBasedRiskEngine] = None
+    ) -> Tuple[List[dict], List[float], Optional[str]]:
+        """
+        Score articles with a candidate engine (see build_candidate_engine)
+        in the worker processes, without blocking the event loop.
+        
+        Workers build the candidate once per spec["key"], from the engine
+        they were started with.
+        
+        Returns:
+            (results in input order, latency samples in ms (see
+            _analyze_list_timed), candidate version)
+        """
+        executor = self._acquire(engine or engine_registry.get())
+        try:
+            loop = asyncio.get_running_loop()
+            futures = [
+                loop.run_in_executor(executor, _analyze_candidate_chunk, spec, chunk)
+                for chunk in _iter_chunks(articles, self.chunk_size, CANDIDATE_FIELDS)
+            ]
+            results = []
+            latencies = []
+            version = None
+            for chunk_results, samples, version in await asyncio.gather(*futures):
+                results.extend(chunk_results)
+                latencies.extend(samples)
+            return results, latencies, version
+        finally:
+            self._release(executor)
+    
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+                self._version = None
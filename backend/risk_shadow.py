@@ -0,0 +1,173 @@
+"""
+Shadow Evaluation
+
+Telemetry for running a candidate risk engine next to the primary one on a
+sample of live analyses, before switching engines in production:
+
+    - per-engine latency histograms
+    - band agreement (and a primary x candidate band confusion table)
+    - per-category precision/recall of the candidate, taking the primary's
+      categories as the reference
+
+The primary engine is the reference, so its own precision/recall are 1.0
+and the candidate's values are the deltas to expect from a switch.
+"""
+
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Upper bucket edges in milliseconds; one extra bucket catches the rest
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are bucket upper edges"""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float, count: int = 1):
+        bucket = next((i for i, edge in enumerate(LATENCY_BUCKETS_MS) if ms <= edge), len(LATENCY_BUCKETS_MS))
+        self.counts[bucket] += count
+        self.count += count
+        self.total_ms += ms * count
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper edge of the bucket holding the q-th percentile (None past the last edge)"""
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else None
+        return None
+
+    def to_dict(self) -> dict:
+        edges = [str(edge) for edge in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "meanMs": round(self.total_ms / self.count, 4) if self.count else None,
+            "maxMs": round(self.max_ms, 4),
+            "p50Ms": self.percentile(50),
+            "p99Ms": self.percentile(99),
+            "buckets": [{"le": edge, "count": count} for edge, count in zip(edges, self.counts)],
+        }
+
+
+def compare_results(primary: dict, shadow: dict) -> dict:
+    """Per-article differences between the primary and candidate results"""
+    primary_categories = set(primary.get("risk_categories") or [])
+    shadow_categories = set(shadow.get("risk_categories") or [])
+    return {
+        "bandAgree": primary.get("risk_band") == shadow.get("risk_band"),
+        "scoreDelta": (shadow.get("risk_score") or 0) - (primary.get("risk_score") or 0),
+        "missingCategories": sorted(primary_categories - shadow_categories),
+        "extraCategories": sorted(shadow_categories - primary_categories),
+    }
+
+
+class ShadowStats:
+    """Cumulative shadow telemetry since the last reset (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now(timezone.utc).isoformat()
+            self.latency: Dict[str, LatencyHistogram] = {"primary": LatencyHistogram(), "shadow": LatencyHistogram()}
+            self.compared = 0
+            self.band_agree = 0
+            self.score_delta_sum = 0
+            self.abs_score_delta_sum = 0
+            self.band_confusion: Dict[str, Dict[str, int]] = {}
+            self.categories: Dict[str, Dict[str, int]] = {}
+            self.errors = 0
+            self.skipped_batches = 0
+
+    def observe_latency(self, engine: str, ms: float, count: int = 1):
+        with self._lock:
+            self.latency[engine].observe(ms, count)
+
+    def record(self, primary: dict, shadow: dict) -> dict:
+        """Add one compared article; returns its compare_results diff"""
+        diff = compare_results(primary, shadow)
+        primary_categories = set(primary.get("risk_categories") or [])
+        shadow_categories = set(shadow.get("risk_categories") or [])
+        with self._lock:
+            self.compared += 1
+            self.band_agree += diff["bandAgree"]
+            self.score_delta_sum += diff["scoreDelta"]
+            self.abs_score_delta_sum += abs(diff["scoreDelta"])
+            row = self.band_confusion.setdefault(primary.get("risk_band"), {})
+            row[shadow.get("risk_band")] = row.get(shadow.get("risk_band"), 0) + 1
+            for category in primary_categories | shadow_categories:
+                counts = self.categories.setdefault(category, {"tp": 0, "fp": 0, "fn": 0})
+                if category in primary_categories and category in shadow_categories:
+                    counts["tp"] += 1
+                elif category in shadow_categories:
+                    counts["fp"] += 1
+                else:
+                    counts["fn"] += 1
+        return diff
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_skip(self):
+        """A sampled batch was dropped because the previous one was still running"""
+        with self._lock:
+            self.skipped_batches += 1
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            categories = {}
+            for category, counts in sorted(self.categories.items()):
+                tp, fp, fn = counts["tp"], counts["fp"], counts["fn"]
+                precision = tp / (tp + fp) if tp + fp else None
+                recall = tp / (tp + fn) if tp + fn else None
+                categories[category] = {
+                    **counts,
+                    "precision": round(precision, 4) if precision is not None else None,
+                    "recall": round(recall, 4) if recall is not None else None,
+                    "precisionDelta": round(precision - 1, 4) if precision is not None else None,
+                    "recallDelta": round(recall - 1, 4) if recall is not None else None,
+                }
+            compared = self.compared
+            return {
+                "since": self.started_at,
+                "compared": compared,
+                "bandAgreement": round(self.band_agree / compared, 4) if compared else None,
+                "meanScoreDelta": round(self.score_delta_sum / compared, 2) if compared else None,
+                "meanAbsScoreDelta": round(self.abs_score_delta_sum / compared, 2) if compared else None,
+                "bandConfusion": self.band_confusion,
+                "categories": categories,
+                "latency": {engine: histogram.to_dict() for engine, histogram in self.latency.items()},
+                "errors": self.errors,
+                "skippedBatches": self.skipped_batches,
+            }
+
+
+def shadow_result_fields(result: dict) -> dict:
+    """The result fields kept in shadow documents"""
+    return {
+        name: result.get(name)
+        for name in ("risk_score", "risk_band", "risk_categories", "confidence", "time_horizon", "category_strength")
+    }
+
+
+def sample_articles(articles: List[dict], rate: float, limit: int, rnd) -> List[dict]:
+    """Bernoulli sample at `rate`, capped at `limit` articles"""
+    if rate <= 0:
+        return []
+    sample = [article for article in articles if rnd.random() < rate]
+    return sample[:limit]
@@ -0,0 +1,154 @@
+"""
+Offline Bulk Risk Scoring
+
+Streams a JSONL (or gzip JSONL) file of articles through the risk engine and
+writes one JSON result per line, in input order, in bounded memory. Use it
+for historical archives and customer-supplied dumps outside the web server.
+
+Each output line holds the input line number, the article id (if any) and
+the risk analysis fields. Lines that are not JSON objects are reported on
+stderr and skipped; the line numbers keep the output aligned with the input.
+
+The engine uses the built-in triggers unless --triggers/--policy point to
+JSON exports of risk_category_configs / the scoring policy; RISK_TEXT_BUDGET
+applies as in the server.
+
+Usage:
+    python score_articles.py archive.jsonl.gz -o scores.jsonl.gz --workers 8
+    python score_articles.py dump.jsonl --engine vectorized > scores.jsonl
+    cat dump.jsonl | python score_articles.py - -o scores.jsonl
+"""
+
+import argparse
+import collections
+import gzip
+import io
+import json
+import sys
+import time
+from typing import IO, Deque, Iterator, Optional, Tuple
+
+from risk_engine import ParallelRiskAnalyzer, engine_registry, iter_analyze_articles
+
+# Seconds between progress lines on stderr
+PROGRESS_INTERVAL = 10
+
+
+def open_text(path: str, mode: str) -> IO[str]:
+    """Open a path ("-" for stdin/stdout) as text, gzip-compressed if it ends in .gz"""
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, mode.replace("t", "") + "b"), encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read_articles(lines: IO[str], positions: Deque[Tuple[int, Optional[str]]]) -> Iterator[dict]:
+    """
+    Yield article objects from JSONL lines, appending (line number, id) of
+    each to `positions` so results can be labelled in the same order.
+    """
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            article = json.loads(line)
+        except json.JSONDecodeError as e:
+            print(f"line {number}: invalid JSON ({e.msg}), skipped", file=sys.stderr)
+            continue
+        if not isinstance(article, dict):
+            print(f"line {number}: not a JSON object, skipped", file=sys.stderr)
+            continue
+        positions.append((number, article.get("id")))
+        yield article
+
+
+def score_file(source: IO[str], target: IO[str], engine_type: str = "rule_based",
+               workers: int = 1, chunk_size: int = 200, include_features: bool = False) -> dict:
+    """
+    Score every article of `source` into `target`.
+
+    rule_based with more than one worker runs on a process pool; otherwise
+    articles are scored in this process, chunk_size at a time.
+
+    Returns:
+        Summary with article count and throughput
+    """
+    positions: Deque[Tuple[int, Optional[str]]] = collections.deque()
+    articles = read_articles(source, positions)
+    analyzer = None
+    if engine_type == "rule_based" and workers > 1:
+        analyzer = ParallelRiskAnalyzer(workers=workers, chunk_size=chunk_size)
+        results = analyzer.iter_analyze(articles)
+    else:
+        results = iter_analyze_articles(articles, engine_type, batch_size=chunk_size)
+
+    count = 0
+    start = last_report = time.perf_counter()
+    try:
+        for result in results:
+            line, article_id = positions.popleft()
+            if not include_features:
+                result.pop("features", None)
+            target.write(json.dumps({"line": line, "id": article_id, **result}) + "\n")
+            count += 1
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL:
+                print(f"{count:,} articles, {count / (now - start):,.0f}/sec", file=sys.stderr)
+                last_report = now
+    finally:
+        if analyzer is not None:
+            analyzer.shutdown()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "articles": count,
+        "seconds": round(elapsed, 2),
+        "articlesPerSec": round(count / elapsed, 1) if elapsed > 0 else None,
+        "engine": engine_type,
+        "workers": workers if analyzer is not None else 1,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a JSONL article dump with the risk engine")
+    parser.add_argument("input", help="JSONL or .jsonl.gz file of articles, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Output JSONL (.gz to compress), default stdout")
+    parser.add_argument("--engine", choices=["rule_based", "vectorized", "ml"], default="rule_based")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (rule_based only)")
+    parser.add_argument("--chunk-size", type=int, default=200, help="Articles per worker task / batch")
+    parser.add_argument("--triggers", help="JSON list of risk_category_configs documents")
+    parser.add_argument("--policy", help="JSON scoring policy document")
+    parser.add_argument("--features", action="store_true", help="Include the compact feature record in the output")
+    args = parser.parse_args()
+
+    if args.triggers or args.policy:
+        configs = []
+        policy = None
+        if args.triggers:
+            with open(args.triggers) as f:
+                configs = json.load(f)
+        if args.policy:
+            with open(args.policy) as f:
+                policy = json.load(f)
+        engine_registry.load(configs, policy)
+    print(f"Engine {args.engine}, version {engine_registry.version}", file=sys.stderr)
+
+    source = open_text(args.input, "rt")
+    target = open_text(args.output, "wt")
+    try:
+        summary = score_file(source, target, args.engine, args.workers, args.chunk_size, args.features)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(
+        f"Scored {summary['articles']:,} articles in {summary['seconds']}s "
+        f"({summary['articlesPerSec'] or 0:,.0f}/sec, {summary['workers']} worker(s))",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Seen-Link Filter
+
+Bloom filter over the normalizedLink of every stored article, so ingestion
+can tell that a provider result is definitely new without a database
+lookup. A possible match (stored, or a false positive at about the
+configured error rate) falls back to the unique normalizedLink index.
+
+The filter only ever gains members: articles deleted later stay "possibly
+seen", which costs an indexed lookup, never a missed duplicate.
+
+Persistence: the bit array is snapshotted to MongoDB (one document) with
+the _id of the last article it covers. At startup the snapshot is loaded
+and caught up with newer articles; catch_up() is also called at the start
+of every ingestion run, which picks up inserts made by other processes.
+When the member count passes the capacity the filter is rebuilt from the
+collection at twice the capacity.
+"""
+
+import hashlib
+import logging
+import math
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from bson import Binary, ObjectId
+
+logger = logging.getLogger(__name__)
+
+# ObjectIds from other processes can trail ours by clock skew; catch-up
+# re-reads this far back (re-adding a member is harmless)
+CATCH_UP_MARGIN = timedelta(minutes=5)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing of one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01, bits: Optional[bytes] = None, count: int = 0):
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.num_bits + 7) // 8)
+        self.count = count
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> bool:
+        """Add an item; returns True if it was not (possibly) present before"""
+        added = False
+        bits = self.bits
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def fill_ratio(self) -> float:
+        return bin(int.from_bytes(self.bits, "little")).count("1") / self.num_bits
+
+
+class SeenLinkIndex:
+    """
+    Bloom filter of stored normalizedLinks, persisted in `snapshots`.
+
+    might_contain() is the ingestion check; add_many() records links just
+    written; save() snapshots the filter if it changed.
+    """
+
+    def __init__(self, articles, snapshots, capacity: int = 1000000, error_rate: float = 0.01,
+                 snapshot_id: str = "news_links"):
+        self.articles = articles
+        self.snapshots = snapshots
+        self.snapshot_id = snapshot_id
+        self.error_rate = error_rate
+        self.filter = BloomFilter(capacity, error_rate)
+        self.last_id: Optional[ObjectId] = None
+        self.loaded = False
+        self.dirty = False
+        self.checks = 0
+        self.definitely_new = 0
+
+    async def load(self):
+        """Warm start from the snapshot (or a full build), then catch up"""
+        snapshot = await self.snapshots.find_one({"id": self.snapshot_id})
+        if snapshot and snapshot.get("errorRate") == self.error_rate and snapshot.get("capacity", 0) >= self.filter.capacity:
+            self.filter = BloomFilter(snapshot["capacity"], self.error_rate, bytes(snapshot["bits"]), snapshot.get("count", 0))
+            self.last_id = snapshot.get("lastId")
+            self.loaded = True
+            added = await self.catch_up()
+            logger.info(f"[SeenLinks] Loaded snapshot of {self.filter.count} links, {added} added since")
+        else:
+            await self.rebuild(self.filter.capacity)
+        await self.save()
+
+    async def rebuild(self, capacity: int):
+        """Build a new filter from every stored normalizedLink"""
+        self.filter = BloomFilter(capacity, self.error_rate)
+        self.last_id = None
+        self.loaded = True
+        added = await self.catch_up()
+        self.dirty = True
+        logger.info(f"[SeenLinks] Built filter of {added} links (capacity {capacity})")
+
+    async def catch_up(self) -> int:
+        """Add articles stored since the last one covered; returns links read"""
+        if not self.loaded:
+            return 0
+        query = {"normalizedLink": {"$type": "string"}}
+        if self.last_id is not None:
+            since = self.last_id.generation_time - CATCH_UP_MARGIN
+            query["_id"] = {"$gt": ObjectId.from_datetime(since)}
+        count = 0
+        async for article in self.articles.find(query, {"_id": 1, "normalizedLink": 1}).sort("_id", 1):
+            self.filter.add(article["normalizedLink"])
+            self.last_id = article["_id"] if self.last_id is None else max(self.last_id, article["_id"])
+            count += 1
+        if count:
+            self.dirty = True
+        if self.filter.count > self.filter.capacity:
+            await self.rebuild(self.filter.capacity * 2)
+        return count
+
+    def might_contain(self, normalized_link: str) -> bool:
+        """False means the link is definitely not stored; before load() everything might be"""
+        if not self.loaded:
+            return True
+        self.checks += 1
+        if normalized_link in self.filter:
+            return True
+        self.definitely_new += 1
+        return False
+
+    def add_many(self, normalized_links: Iterable[str]):
+        for normalized_link in normalized_links:
+            if self.filter.add(normalized_link):
+                self.dirty = True
+
+    async def save(self):
+        """Snapshot the filter if it changed since the last save"""
+        if not self.loaded or not self.dirty:
+            return
+        await self.snapshots.replace_one({"id": self.snapshot_id}, {
+            "id": self.snapshot_id,
+            "capacity": self.filter.capacity,
+            "errorRate": self.error_rate,
+            "count": self.filter.count,
+            "bits": Binary(bytes(self.filter.bits)),
+            "lastId": self.last_id,
+            "savedAt": datetime.now(timezone.utc).isoformat()
+        }, upsert=True)
+        self.dirty = False
+
+    def stats(self) -> dict:
+        fill = self.filter.fill_ratio()
+        return {
+            "loaded": self.loaded,
+            "links": self.filter.count,
+            "capacity": self.filter.capacity,
+            "sizeKb": round(len(self.filter.bits) / 1024, 1),
+            "hashes": self.filter.num_hashes,
+            "fillRatio": round(fill, 4),
+            # Current false-positive rate implied by the fill ratio
+            "falsePositiveRate": round(fill ** self.filter.num_hashes, 6),
+            "checks": self.checks,
+            "definitelyNew": self.definitely_new,
+            "lastId": str(self.last_id) if self.last_id is not None else None,
+        }
@@ -1,9 +1,11 @@
 from fastapi import FastAPI, APIRouter, HTTPException, BackgroundTasks, Request
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 import os
 import logging
 import asyncio
@@ -11,15 +13,36 @@ from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, EmailStr, field_validator
 from typing import List, Optional, Union, Dict
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
 import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from contextlib import asynccontextmanager
 from bs4 import BeautifulSoup
 import re
 import time
+import random
+import json
+import codecs
+import tempfile
+from urllib.parse import urlsplit
 from collections import defaultdict
-from risk_engine import analyze_article, analyze_articles_batch, RISK_CATEGORIES
+from risk_engine import analyze_article, analyze_articles_batch, build_candidate_engine, CATEGORY_SLOTS, category_mask, category_strength_array, engine_registry, ParallelRiskAnalyzer, RuleBasedRiskEngine, category_triggers_from_configs, diff_category_triggers, resolve_term_lookups, ScoringPolicy, score_feature_records, effective_risk, parse_published_at, article_published_at
+from text_normalization import article_inputs, token_fields
+from http_clients import HttpClientPool
+from seen_links import SeenLinkIndex
+from news_ingestion import (
+    GDELT_MIN_INTERVAL,
+    GdeltAdapter,
+    IngestionPipeline,
+    MediaStackAdapter,
+    ProviderAdapter,
+    ProviderBatch,
+    SerpApiAdapter,
+    normalize_url,
+)
+from analysis_cache import AnalysisCache, content_key
+from risk_shadow import ShadowStats, sample_articles, shadow_result_fields
+from relevance_filter import RelevanceFilter, normalize_keywords, relevance_version, score_relevance
 
 # Rate limiting storage (in production, use Redis)
 rate_limit_store: Dict[str, list] = defaultdict(list)
@@ -83,6 +106,47 @@ SERPAPI_KEY = os.environ.get("SERPAPI_KEY", "")
 # MediaStack API Key
 MEDIASTACK_KEY = os.environ.get("MEDIASTACK_KEY", "")
 
+# Shared pooled HTTP client for provider APIs, scraping and archive fallbacks
+http_pool = HttpClientPool(
+    max_connections=int(os.environ.get("HTTP_MAX_CONNECTIONS", "100")),
+    max_keepalive=int(os.environ.get("HTTP_MAX_KEEPALIVE", "50")),
+    keepalive_expiry=float(os.environ.get("HTTP_KEEPALIVE_EXPIRY", "60")),
+    max_per_host=int(os.environ.get("HTTP_MAX_PER_HOST", "6")),
+    http2=os.environ.get("HTTP_CLIENT_HTTP2", "").lower() in ("1", "true", "yes"),
+    dns_ttl=float(os.environ.get("HTTP_DNS_TTL", "300")),
+)
+
+# Bloom filter of stored article links; lets ingestion skip writes for
+# results that are definitely new and irrelevant (see IngestionPipeline)
+seen_links = SeenLinkIndex(
+    db.news_articles, db.seen_link_filter,
+    capacity=int(os.environ.get("SEEN_LINKS_CAPACITY", "1000000"))
+)
+
+# Risk analysis worker processes (defaults to CPU count)
+RISK_ENGINE_WORKERS = int(os.environ.get("RISK_ENGINE_WORKERS", "0")) or None
+risk_analyzer = ParallelRiskAnalyzer(workers=RISK_ENGINE_WORKERS)
+
+# Memoized analysis results keyed by content hash + analyzer version.
+# Risk results are also persisted (analysis_cache collection); relevance checks
+# are cheaper than a database round-trip, so they stay in-process only.
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", "10000"))
+ANALYSIS_CACHE_TTL_DAYS = 30
+risk_cache = AnalysisCache("risk", maxsize=ANALYSIS_CACHE_SIZE, collection=db.analysis_cache)
+relevance_cache = AnalysisCache("relevance", maxsize=ANALYSIS_CACHE_SIZE)
+# Hit/miss counters of the most recent run of each kind
+analysis_cache_runs: Dict[str, dict] = {}
+
+# Shadow evaluation of a candidate risk engine (see run_shadow_evaluation)
+SHADOW_CONFIG_ID = "risk_shadow"
+SHADOW_MAX_SAMPLE = 200
+SHADOW_RESULTS_TTL_DAYS = 14
+shadow_stats = ShadowStats()
+# Candidates score in their own small pool so shadow load never queues
+# behind (or ahead of) primary scoring
+SHADOW_ENGINE_WORKERS = int(os.environ.get("SHADOW_ENGINE_WORKERS", "1"))
+shadow_analyzer = ParallelRiskAnalyzer(workers=SHADOW_ENGINE_WORKERS)
+
 # ==================== RELEVANCE FILTER ====================
 # Keywords that indicate relevance to electronics/semiconductor industry (for scoring)
 RELEVANCE_KEYWORDS = {
@@ -147,6 +211,11 @@ SPAM_BLOCKLIST = {
     'wedding planning', 'bridal', 'engagement ring',
 }
 
+# Compiled from the built-in sets, or from relevance_filter_config once loaded
+# (see reload_relevance_filter); swapped as a whole, never mutated
+RELEVANCE_CONFIG_ID = "relevance_filter"
+relevance_filter = RelevanceFilter(RELEVANCE_KEYWORDS, SPAM_BLOCKLIST)
+
 def check_article_relevance(title: str, snippet: str = "", source_name: str = "") -> dict:
     """
     Check if an article is relevant to electronics/semiconductor industry.
@@ -157,139 +226,51 @@ def check_article_relevance(title: str, snippet: str = "", source_name: str = ""
     
     Returns dict with: is_relevant (bool), relevance_score (0-100), reason (str)
     """
-    # Combine all text for analysis
-    text = f"{title} {snippet} {source_name}".lower()
-    title_lower = title.lower()
-    
-    # Count relevance keywords first
-    relevance_count = 0
-    matched_keywords = []
-    for keyword in RELEVANCE_KEYWORDS:
-        if keyword in text:
-            relevance_count += 1
-            matched_keywords.append(keyword)
-    
-    # Calculate relevance score
-    relevance_score = min(relevance_count * 15, 100)
-    title_matches = sum(1 for kw in RELEVANCE_KEYWORDS if kw in title_lower)
-    relevance_score = min(relevance_score + (title_matches * 20), 100)
-    
-    # Check blocklist - only block if:
-    # 1. Multiple spam keywords found in TITLE specifically
-    # 2. AND no electronics keywords found
-    spam_count_title = 0
-    spam_count_total = 0
-    matched_spam = []
-    
-    for keyword in SPAM_BLOCKLIST:
-        if keyword in title_lower:
-            spam_count_title += 1
-            matched_spam.append(keyword)
-        elif keyword in text:
-            spam_count_total += 1
-    
-    # Block logic:
-    # - If 2+ spam keywords in TITLE and NO relevance keywords -> BLOCK
-    # - If 1 spam keyword in title and 0 relevance keywords -> BLOCK
-    # - Otherwise -> ALLOW (benefit of the doubt since it came from electronics query)
-    
-    is_spam = False
-    block_reason = ""
-    
-    if spam_count_title >= 2 and relevance_count == 0:
-        is_spam = True
-        block_reason = f"Spam detected in title: {', '.join(matched_spam[:3])}"
-    elif spam_count_title >= 1 and relevance_count == 0:
-        is_spam = True
-        block_reason = f"Spam keyword in title, no electronics content: {matched_spam[0]}"
-    
-    if is_spam:
-        return {
-            "is_relevant": False,
-            "relevance_score": 0,
-            "reason": block_reason,
-            "matched_keywords": [],
-            "spam_keywords": matched_spam
-        }
-    
-    # Article passes - calculate final score
-    if relevance_count > 0:
-        reason = f"Matched: {', '.join(matched_keywords[:5])}"
-    else:
-        reason = "Passed (no spam detected, from electronics query)"
-        relevance_score = 10  # Base score for passing articles without keywords
-    
-    return {
-        "is_relevant": True,
-        "relevance_score": relevance_score,
-        "reason": reason,
-        "matched_keywords": matched_keywords[:10]
-    }
-
-# News fetching function
-async def fetch_news_from_serpapi(query: str) -> List[dict]:
-    """Fetch news from SerpAPI for a given query"""
-    if not SERPAPI_KEY:
-        logger.error("SERPAPI_KEY not configured")
-        return []
-    
-    url = f"https://serpapi.com/search?api_key={SERPAPI_KEY}&engine=google_news&gl=us&q={query.replace(' ', '+')}"
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            response = await http_client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            news_results = data.get("news_results", [])
-            logger.info(f"[SerpAPI] Fetched {len(news_results)} articles for query: {query}")
-            return news_results
-    except Exception as e:
-        logger.error(f"[SerpAPI] Error fetching news for query '{query}': {str(e)}")
-        return []
-
-async def fetch_news_from_gdelt(query: str) -> List[dict]:
-    """Fetch news from GDELT Project API for a given query"""
-    encoded_query = query.replace(' ', '%20')
-    url = f"https://api.gdeltproject.org/api/v2/doc/doc?query={encoded_query}&mode=ArtList&format=json&maxrecords=50"
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            response = await http_client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            
-            # GDELT returns articles in "articles" array
-            articles = data.get("articles", [])
-            logger.info(f"[GDELT] Fetched {len(articles)} articles for query: {query}")
-            return articles
-    except Exception as e:
-        logger.error(f"[GDELT] Error fetching news for query '{query}': {str(e)}")
-        return []
+    # One scan of title + snippet + source finds keyword and spam hits, split by title
+    return score_relevance(relevance_filter.scan(title, snippet, source_name))
+
+def check_article_relevance_cached(title: str, snippet: str = "", source_name: str = "") -> dict:
+    """check_article_relevance, memoized on the exact inputs (up to case)"""
+    key = content_key("relevance", relevance_filter.version, title, snippet, source_name)
+    result = relevance_cache.get(key)
+    if result is None:
+        relevance_cache.record_miss()
+        result = check_article_relevance(title, snippet, source_name)
+        relevance_cache.put(key, result)
+    return result
 
-async def fetch_news_from_mediastack(query: str) -> List[dict]:
-    """Fetch news from MediaStack API for a given query (rate limited - weekly only)"""
-    if not MEDIASTACK_KEY:
-        logger.error("MEDIASTACK_KEY not configured")
-        return []
-    
-    encoded_query = query.replace(' ', '%20')
-    # Note: Removed categories filter as it was returning 0 results with country filter
-    url = f"https://api.mediastack.com/v1/news?access_key={MEDIASTACK_KEY}&keywords={encoded_query}&languages=en&countries=us,cn,tw,in,jp,kr,de&sort=published_desc&limit=25"
-    
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            response = await http_client.get(url, headers={"Accept": "application/json"})
-            response.raise_for_status()
-            data = response.json()
-            
-            # MediaStack returns articles in "data" array
-            articles = data.get("data", [])
-            logger.info(f"[MediaStack] Fetched {len(articles)} articles for query: {query}")
-            return articles
-    except Exception as e:
-        logger.error(f"[MediaStack] Error fetching news for query '{query}': {str(e)}")
-        return []
+async def reload_relevance_filter() -> str:
+    """
+    Swap in a relevance filter compiled from relevance_filter_config (built-in
+    sets for whatever the document omits). Recompiles only on a change.
+    """
+    global relevance_filter
+    config = await db.relevance_filter_config.find_one({"id": RELEVANCE_CONFIG_ID}, {"_id": 0}) or {}
+    keywords = config.get("keywords") or RELEVANCE_KEYWORDS
+    spam_blocklist = config.get("spamBlocklist") or SPAM_BLOCKLIST
+    if relevance_version(keywords, spam_blocklist) != relevance_filter.version:
+        relevance_filter = RelevanceFilter(keywords, spam_blocklist, source="database" if config else "built-in")
+        logger.info(f"[Relevance] Loaded filter version {relevance_filter.version} ({len(relevance_filter.keywords)} keywords, {len(relevance_filter.spam_blocklist)} blocklist phrases)")
+    return relevance_filter.version
+
+# News provider adapters (see news_ingestion). Concurrency is the number of
+# requests a provider has in flight during one run, the interval the minimum
+# time in seconds between two of its requests. GDELT is serialized and paced
+# to its published rate limit.
+serpapi_adapter = SerpApiAdapter(
+    http_pool, SERPAPI_KEY,
+    concurrency=int(os.environ.get("SERPAPI_CONCURRENCY", "8")),
+    min_interval=float(os.environ.get("SERPAPI_MIN_INTERVAL", "0"))
+)
+gdelt_adapter = GdeltAdapter(
+    http_pool,
+    concurrency=int(os.environ.get("GDELT_CONCURRENCY", "1")),
+    min_interval=float(os.environ.get("GDELT_MIN_INTERVAL", str(GDELT_MIN_INTERVAL)))
+)
+# Fetched 3x daily, and for each new query
+NEWS_ADAPTERS = [serpapi_adapter, gdelt_adapter]
+# Fetched weekly, one query at a time, due to rate limits
+mediastack_adapter = MediaStackAdapter(http_pool, MEDIASTACK_KEY)
 
 
 # ============== WEB SCRAPER ==============
@@ -300,10 +281,9 @@ async def try_google_cache(url: str, headers: dict) -> str:
     cache_url = f"https://webcache.googleusercontent.com/search?q=cache:{url}"
     
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            response = await client.get(cache_url, headers=headers)
-            if response.status_code == 200:
-                return response.text
+        response = await http_pool.get(cache_url, profile="archive", headers=headers)
+        if response.status_code == 200:
+            return response.text
     except Exception as e:
         logger.debug(f"[Scraper] Google cache failed for {url[:50]}: {str(e)}")
     return None
@@ -314,21 +294,20 @@ async def try_wayback_machine(url: str, headers: dict) -> str:
     availability_url = f"https://archive.org/wayback/available?url={url}"
     
     try:
-        async with httpx.AsyncClient(timeout=10.0, follow_redirects=True) as client:
-            # Check availability
-            avail_response = await client.get(availability_url)
-            if avail_response.status_code == 200:
-                data = avail_response.json()
-                snapshots = data.get("archived_snapshots", {})
-                closest = snapshots.get("closest", {})
-                
-                if closest.get("available") and closest.get("url"):
-                    # Fetch from archive
-                    archive_url = closest["url"]
-                    response = await client.get(archive_url, headers=headers)
-                    if response.status_code == 200:
-                        logger.info(f"[Scraper] Found Wayback snapshot for {url[:50]}")
-                        return response.text
+        # Check availability
+        avail_response = await http_pool.get(availability_url, profile="archive")
+        if avail_response.status_code == 200:
+            data = avail_response.json()
+            snapshots = data.get("archived_snapshots", {})
+            closest = snapshots.get("closest", {})
+            
+            if closest.get("available") and closest.get("url"):
+                # Fetch from archive
+                archive_url = closest["url"]
+                response = await http_pool.get(archive_url, profile="archive", headers=headers)
+                if response.status_code == 200:
+                    logger.info(f"[Scraper] Found Wayback snapshot for {url[:50]}")
+                    return response.text
     except Exception as e:
         logger.debug(f"[Scraper] Wayback Machine failed for {url[:50]}: {str(e)}")
     return None
@@ -371,170 +350,169 @@ async def scrape_article_content(url: str, use_alternatives: bool = False) -> di
     is_paywall_site = any(domain in url.lower() for domain in PAYWALL_DOMAINS)
     
     try:
-        async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-            response = await client.get(url, headers=headers)
-            
-            # Even if we get a 403, try to parse the response for metadata
-            html = response.text
-            soup = BeautifulSoup(html, 'lxml')
-            
-            # Always try to extract metadata first
-            metadata = extract_metadata(soup, url)
-            result["metaDescription"] = metadata.get("description")
-            result["ogDescription"] = metadata.get("og_description")
-            
-            # If paywall or 403, try alternatives first if enabled
-            if response.status_code == 403 or is_paywall_site:
-                # Try alternative sources if enabled
-                if use_alternatives:
-                    # Try Google Cache
-                    logger.info(f"[Scraper] Trying Google Cache for {url[:50]}...")
-                    cache_html = await try_google_cache(url, headers)
-                    if cache_html:
-                        soup = BeautifulSoup(cache_html, 'lxml')
-                        # Continue processing with cached content
-                        logger.info(f"[Scraper] Got content from Google Cache for {url[:50]}")
+        response = await http_pool.get(url, profile="scrape", headers=headers)
+        
+        # Even if we get a 403, try to parse the response for metadata
+        html = response.text
+        soup = BeautifulSoup(html, 'lxml')
+        
+        # Always try to extract metadata first
+        metadata = extract_metadata(soup, url)
+        result["metaDescription"] = metadata.get("description")
+        result["ogDescription"] = metadata.get("og_description")
+        
+        # If paywall or 403, try alternatives first if enabled
+        if response.status_code == 403 or is_paywall_site:
+            # Try alternative sources if enabled
+            if use_alternatives:
+                # Try Google Cache
+                logger.info(f"[Scraper] Trying Google Cache for {url[:50]}...")
+                cache_html = await try_google_cache(url, headers)
+                if cache_html:
+                    soup = BeautifulSoup(cache_html, 'lxml')
+                    # Continue processing with cached content
+                    logger.info(f"[Scraper] Got content from Google Cache for {url[:50]}")
+                else:
+                    # Try Wayback Machine
+                    logger.info(f"[Scraper] Trying Wayback Machine for {url[:50]}...")
+                    wayback_html = await try_wayback_machine(url, headers)
+                    if wayback_html:
+                        soup = BeautifulSoup(wayback_html, 'lxml')
+                        logger.info(f"[Scraper] Got content from Wayback Machine for {url[:50]}")
                     else:
-                        # Try Wayback Machine
-                        logger.info(f"[Scraper] Trying Wayback Machine for {url[:50]}...")
-                        wayback_html = await try_wayback_machine(url, headers)
-                        if wayback_html:
-                            soup = BeautifulSoup(wayback_html, 'lxml')
-                            logger.info(f"[Scraper] Got content from Wayback Machine for {url[:50]}")
+                        # Fall back to metadata
+                        meta_content = metadata.get("og_description") or metadata.get("description") or metadata.get("twitter_description")
+                        if meta_content and len(meta_content) > 50:
+                            result["scraped"] = True
+                            result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
+                            result["fullContent"] = meta_content
+                            result["summary"] = meta_content[:500] if len(meta_content) > 500 else meta_content
+                            result["wordCount"] = len(meta_content.split())
+                            result["scrapeError"] = "Paywall - metadata only (alternatives failed)"
+                            logger.info(f"[Scraper] Using metadata ({result['wordCount']} words) from paywall: {url[:50]}...")
+                            return result
                         else:
-                            # Fall back to metadata
-                            meta_content = metadata.get("og_description") or metadata.get("description") or metadata.get("twitter_description")
-                            if meta_content and len(meta_content) > 50:
-                                result["scraped"] = True
-                                result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
-                                result["fullContent"] = meta_content
-                                result["summary"] = meta_content[:500] if len(meta_content) > 500 else meta_content
-                                result["wordCount"] = len(meta_content.split())
-                                result["scrapeError"] = "Paywall - metadata only (alternatives failed)"
-                                logger.info(f"[Scraper] Using metadata ({result['wordCount']} words) from paywall: {url[:50]}...")
-                                return result
-                            else:
-                                result["scrapeError"] = f"Paywall site - all alternatives failed"
-                                result["permanentFailure"] = True
-                                return result
+                            result["scrapeError"] = f"Paywall site - all alternatives failed"
+                            result["permanentFailure"] = True
+                            return result
+            else:
+                meta_content = metadata.get("og_description") or metadata.get("description") or metadata.get("twitter_description")
+                if meta_content and len(meta_content) > 50:
+                    result["scraped"] = True
+                    result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
+                    result["fullContent"] = meta_content
+                    result["summary"] = meta_content[:500] if len(meta_content) > 500 else meta_content
+                    result["wordCount"] = len(meta_content.split())
+                    result["scrapeError"] = "Paywall - metadata only"
+                    logger.info(f"[Scraper] Extracted metadata ({result['wordCount']} words) from paywall: {url[:50]}...")
+                    return result
                 else:
-                    meta_content = metadata.get("og_description") or metadata.get("description") or metadata.get("twitter_description")
-                    if meta_content and len(meta_content) > 50:
-                        result["scraped"] = True
-                        result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
-                        result["fullContent"] = meta_content
-                        result["summary"] = meta_content[:500] if len(meta_content) > 500 else meta_content
-                        result["wordCount"] = len(meta_content.split())
-                        result["scrapeError"] = "Paywall - metadata only"
-                        logger.info(f"[Scraper] Extracted metadata ({result['wordCount']} words) from paywall: {url[:50]}...")
-                        return result
-                    else:
-                        result["scrapeError"] = f"Paywall site - no metadata available"
-                        result["permanentFailure"] = True
-                        return result
-            
-            response.raise_for_status()
-            
-            # Remove unwanted elements
-            for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement', 'iframe', 'noscript', 'form', 'button']):
-                element.decompose()
-            
-            # Try to find article content using common selectors
-            article_content = None
+                    result["scrapeError"] = f"Paywall site - no metadata available"
+                    result["permanentFailure"] = True
+                    return result
+        
+        response.raise_for_status()
+        
+        # Remove unwanted elements
+        for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement', 'iframe', 'noscript', 'form', 'button']):
+            element.decompose()
+        
+        # Try to find article content using common selectors
+        article_content = None
+        
+        # Priority selectors for article content (expanded list)
+        selectors = [
+            'article',
+            '[role="article"]',
+            '.article-content',
+            '.article-body',
+            '.post-content',
+            '.entry-content',
+            '.story-body',
+            '.content-body',
+            '#article-body',
+            '.article__body',
+            'main article',
+            '.news-article',
+            '.story-content',
+            '.blog-post-content',
+            '.rich-text',
+            '.post-body',
+            '[itemprop="articleBody"]',
+            '.wysiwyg-content',
+            '.text-content',
+            '.page-content',
+            '#content',
+            '.content'
+        ]
+        
+        for selector in selectors:
+            content = soup.select_one(selector)
+            if content:
+                article_content = content
+                break
+        
+        # Fallback to main or body
+        if not article_content:
+            article_content = soup.find('main') or soup.find('body')
+        
+        if article_content:
+            # Extract paragraphs
+            paragraphs = article_content.find_all('p')
+            text_parts = []
             
-            # Priority selectors for article content (expanded list)
-            selectors = [
-                'article',
-                '[role="article"]',
-                '.article-content',
-                '.article-body',
-                '.post-content',
-                '.entry-content',
-                '.story-body',
-                '.content-body',
-                '#article-body',
-                '.article__body',
-                'main article',
-                '.news-article',
-                '.story-content',
-                '.blog-post-content',
-                '.rich-text',
-                '.post-body',
-                '[itemprop="articleBody"]',
-                '.wysiwyg-content',
-                '.text-content',
-                '.page-content',
-                '#content',
-                '.content'
-            ]
+            for p in paragraphs:
+                text = p.get_text(strip=True)
+                # Filter out very short paragraphs (likely navigation/ads)
+                if len(text) > 50:
+                    text_parts.append(text)
             
-            for selector in selectors:
-                content = soup.select_one(selector)
-                if content:
-                    article_content = content
-                    break
+            full_content = '\n\n'.join(text_parts)
             
-            # Fallback to main or body
-            if not article_content:
-                article_content = soup.find('main') or soup.find('body')
+            # Clean up the text
+            full_content = re.sub(r'\s+', ' ', full_content)  # Normalize whitespace
+            full_content = full_content.strip()
             
-            if article_content:
-                # Extract paragraphs
-                paragraphs = article_content.find_all('p')
-                text_parts = []
+            if full_content:
+                word_count = len(full_content.split())
                 
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    # Filter out very short paragraphs (likely navigation/ads)
-                    if len(text) > 50:
-                        text_parts.append(text)
+                # If content too short, try to use metadata
+                if word_count < 30:
+                    meta_content = metadata.get("og_description") or metadata.get("description")
+                    if meta_content and len(meta_content.split()) >= 10:
+                        full_content = meta_content
+                        word_count = len(meta_content.split())
+                        result["scrapeError"] = "Short content - using metadata"
+                    else:
+                        result["scrapeError"] = f"Content too short ({word_count} words)"
+                        return result
                 
-                full_content = '\n\n'.join(text_parts)
+                # Create a summary (first 500 chars)
+                summary = full_content[:500] + '...' if len(full_content) > 500 else full_content
                 
-                # Clean up the text
-                full_content = re.sub(r'\s+', ' ', full_content)  # Normalize whitespace
-                full_content = full_content.strip()
+                result["scraped"] = True
+                result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
+                result["fullContent"] = full_content
+                result["summary"] = summary
+                result["wordCount"] = word_count
                 
-                if full_content:
-                    word_count = len(full_content.split())
-                    
-                    # If content too short, try to use metadata
-                    if word_count < 30:
-                        meta_content = metadata.get("og_description") or metadata.get("description")
-                        if meta_content and len(meta_content.split()) >= 10:
-                            full_content = meta_content
-                            word_count = len(meta_content.split())
-                            result["scrapeError"] = "Short content - using metadata"
-                        else:
-                            result["scrapeError"] = f"Content too short ({word_count} words)"
-                            return result
-                    
-                    # Create a summary (first 500 chars)
-                    summary = full_content[:500] + '...' if len(full_content) > 500 else full_content
-                    
+                logger.info(f"[Scraper] Successfully scraped {word_count} words from {url[:50]}...")
+            else:
+                # Try metadata as fallback
+                meta_content = metadata.get("og_description") or metadata.get("description")
+                if meta_content and len(meta_content.split()) >= 10:
                     result["scraped"] = True
                     result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
-                    result["fullContent"] = full_content
-                    result["summary"] = summary
-                    result["wordCount"] = word_count
-                    
-                    logger.info(f"[Scraper] Successfully scraped {word_count} words from {url[:50]}...")
+                    result["fullContent"] = meta_content
+                    result["summary"] = meta_content
+                    result["wordCount"] = len(meta_content.split())
+                    result["scrapeError"] = "No article content - using metadata"
+                    logger.info(f"[Scraper] Using metadata ({result['wordCount']} words) from {url[:50]}...")
                 else:
-                    # Try metadata as fallback
-                    meta_content = metadata.get("og_description") or metadata.get("description")
-                    if meta_content and len(meta_content.split()) >= 10:
-                        result["scraped"] = True
-                        result["scrapedAt"] = datetime.now(timezone.utc).isoformat()
-                        result["fullContent"] = meta_content
-                        result["summary"] = meta_content
-                        result["wordCount"] = len(meta_content.split())
-                        result["scrapeError"] = "No article content - using metadata"
-                        logger.info(f"[Scraper] Using metadata ({result['wordCount']} words) from {url[:50]}...")
-                    else:
-                        result["scrapeError"] = "No meaningful content found (empty)"
-            else:
-                result["scrapeError"] = "Could not locate article content"
-                
+                    result["scrapeError"] = "No meaningful content found (empty)"
+        else:
+            result["scrapeError"] = "Could not locate article content"
+            
     except httpx.TimeoutException:
         result["scrapeError"] = "Timeout - can retry later"
         result["retryable"] = True
@@ -689,10 +667,17 @@ async def scrape_unscraped_articles(limit: int = 50, retry_failed: bool = False,
         
         logger.info(f"[Scraper] Found {len(unscraped)} articles to scrape")
         
+        # Consecutive requests to one host reuse its kept-alive connection
+        unscraped.sort(key=lambda article: urlsplit(article.get("link") or "").hostname or "")
+        
         scraped_count = 0
         failed_count = 0
         skipped_paywall = 0
         
+        # Pin one engine for the whole run so a config reload can't mix versions
+        engine = engine_registry.get()
+        cache_before = risk_cache.snapshot()
+        
         for article in unscraped:
             url = article.get("link")
             article_id = article.get("id")
@@ -714,18 +699,11 @@ async def scrape_unscraped_articles(limit: int = 50, retry_failed: bool = False,
                 # Compute risk for the scraped article
                 full_article = await db.news_articles.find_one({"id": article_id}, {"_id": 0})
                 if full_article:
-                    risk_data = analyze_article(full_article)
+                    risk_data = (await analyze_risk_cached([full_article], engine))[0]
+                    tokens = (await cache_article_tokens([full_article], engine))[0]
                     await db.news_articles.update_one(
                         {"id": article_id},
-                        {"$set": {
-                            "risk_score": risk_data["risk_score"],
-                            "risk_band": risk_data["risk_band"],
-                            "risk_categories": risk_data["risk_categories"],
-                            "confidence": risk_data["confidence"],
-                            "time_horizon": risk_data["time_horizon"],
-                            "category_strength": risk_data["category_strength"],
-                            "riskAnalyzedAt": datetime.now(timezone.utc).isoformat()
-                        }}
+                        {"$set": {**risk_update_fields(risk_data, engine), **tokens}}
                     )
             elif scrape_result.get("permanentFailure"):
                 skipped_paywall += 1
@@ -737,12 +715,285 @@ async def scrape_unscraped_articles(limit: int = 50, retry_failed: bool = False,
         
         logger.info(f"[Scraper] Completed: {scraped_count} scraped, {failed_count} failed, {skipped_paywall} paywall/blocked")
         logger.info(f"[Scraper] Risk analysis computed for {scraped_count} articles")
+        analysis_cache_runs["scrape"] = {**risk_cache.delta(cache_before), "completedAt": datetime.now(timezone.utc).isoformat()}
+        logger.info(f"[Scraper] Risk memo: {analysis_cache_runs['scrape']}")
         logger.info("=" * 60)
         
     except Exception as e:
         logger.error(f"[Scraper] Error in background scraping: {str(e)}")
 
 
+async def analyze_risk_cached(articles: List[dict], engine, latencies: Optional[List[float]] = None) -> List[dict]:
+    """
+    Risk-analyze articles, reusing results for identical title/content/source.
+    
+    Lookups go to the in-process LRU, then the analysis_cache collection;
+    only the remaining unique articles are sent to the worker pool. When
+    `latencies` is given, the per-article scoring times (ms) of those are
+    appended to it.
+    """
+    keys = [content_key("risk", engine.version, *article_inputs(article)) for article in articles]
+    results = await risk_cache.get_many(keys)
+    
+    pending = {}
+    for key, article in zip(keys, articles):
+        if key not in results and key not in pending:
+            pending[key] = article
+    risk_cache.record_hit(len(keys) - len(set(keys)))
+    
+    if pending:
+        fresh = {}
+        scored = await risk_analyzer.analyze_async(list(pending.values()), engine=engine, latencies=latencies)
+        for key, risk_data in zip(pending, scored):
+            # Publication time is per copy, not part of the shared result
+            risk_data.pop("published_at", None)
+            fresh[key] = risk_data
+        await risk_cache.put_many(fresh)
+        results.update(fresh)
+    
+    return [
+        {**results[key], "published_at": article_published_at(article)}
+        for key, article in zip(keys, articles)
+    ]
+
+
+async def cache_article_tokens(articles: List[dict], engine) -> List[dict]:
+    """
+    textTokens $set payloads for articles (see text_normalization.token_fields).
+    
+    Tokenizes off the event loop, and attaches each new record to its article
+    dict so later in-process analyses of the batch (the shadow candidate) reuse it.
+    """
+    updates = await asyncio.to_thread(
+        lambda: [token_fields(article, engine.text_budget) for article in articles]
+    )
+    for article, fields in zip(articles, updates):
+        article.update(fields)
+    return updates
+
+
+def risk_update_fields(risk_data: dict, engine) -> dict:
+    """
+    Build the $set payload for a risk analysis result, stamped with the engine version.
+    
+    risk_score/risk_band are time-independent; effective_score/effective_band
+    materialize the score as of now and are kept current by refresh_effective_risk.
+    """
+    published_at = parse_published_at(risk_data.get("published_at"))
+    effective_score, effective_band = effective_risk(risk_data, engine.policy)
+    fields = {
+        "risk_score": risk_data["risk_score"],
+        "risk_band": risk_data["risk_band"],
+        "recent_risk_score": risk_data["recent_risk_score"],
+        "recent_risk_band": risk_data["recent_risk_band"],
+        "effective_score": effective_score,
+        "effective_band": effective_band,
+        "riskRecent": engine.policy.is_recent(published_at),
+        "risk_categories": risk_data["risk_categories"],
+        "confidence": risk_data["confidence"],
+        "time_horizon": risk_data["time_horizon"],
+        "category_strength": risk_data["category_strength"],
+        # Memo entries from before the compact fields existed lack them
+        "risk_category_mask": risk_data.get("risk_category_mask", category_mask(risk_data["risk_categories"])),
+        "category_strength_array": risk_data.get("category_strength_array") or category_strength_array(risk_data["category_strength"]),
+        "riskEngineVersion": engine.version,
+        "riskFeaturesVersion": engine.feature_version,
+        "riskAnalyzedAt": datetime.now(timezone.utc).isoformat()
+    }
+    # Text scans also refresh the term index and the stored feature record;
+    # feature re-scoring results carry neither and leave them untouched
+    if "features" in risk_data:
+        fields["riskTerms"] = risk_data.get("trigger_terms", [])
+        fields["riskFeatures"] = risk_data["features"]
+        fields["riskPublishedAt"] = published_at
+        # Only part of a long page was analyzed (RISK_TEXT_BUDGET)
+        fields["riskTextTruncated"] = risk_data.get("text_truncated", False)
+    return fields
+
+
+async def rescore_from_features(articles: List[dict], engine) -> List[UpdateOne]:
+    """
+    Re-apply the engine's scoring policy to stored riskFeatures records.
+    
+    Runs the NumPy pass off the event loop; no article text is read.
+    Articles must include riskFeatures and riskPublishedAt.
+    """
+    records = [article["riskFeatures"] for article in articles]
+    risk_results = await asyncio.to_thread(
+        score_feature_records, records, engine.policy, list(engine.category_triggers)
+    )
+    for article, risk_data in zip(articles, risk_results):
+        risk_data["published_at"] = article.get("riskPublishedAt")
+    return [
+        UpdateOne({"_id": article["_id"]}, {"$set": risk_update_fields(risk_data, engine)})
+        for article, risk_data in zip(articles, risk_results)
+    ]
+
+
+SCORING_POLICY_ID = "scoring_policy"
+
+
+async def reload_risk_engine(rescore_affected: bool = False) -> str:
+    """
+    Recompile the risk engine from the risk_category_configs and
+    risk_scoring_policy collections.
+    
+    With rescore_affected, an actual config change re-scores only the articles
+    the change can affect (see rescore_affected_articles).
+    """
+    configs = await db.risk_category_configs.find({}, {"_id": 0}).to_list(100)
+    policy = await db.risk_scoring_policy.find_one({"id": SCORING_POLICY_ID}, {"_id": 0, "id": 0, "updatedAt": 0})
+    previous_engine = engine_registry.get()
+    version = engine_registry.load(configs, policy)
+    if version != previous_engine.version:
+        logger.info(f"[RiskEngine] Loaded engine version {version} (triggers {engine_registry.get().feature_version}, {engine_registry.source}, {len(configs)} categories)")
+        if rescore_affected and not start_targeted_rescore(previous_engine, engine_registry.get()):
+            # The running one hands the rest to the stale-version job when it ends
+            logger.info(f"[Rescore] Targeted re-score already running; version {version} follows through the stale-version job")
+    return version
+
+
+_targeted_rescore_task: Optional[asyncio.Task] = None
+
+
+def start_targeted_rescore(old_engine, new_engine) -> bool:
+    """Start the targeted re-score of a config change unless one is already running"""
+    global _targeted_rescore_task
+    if _targeted_rescore_task is not None and not _targeted_rescore_task.done():
+        return False
+    _targeted_rescore_task = asyncio.create_task(rescore_affected_articles(old_engine, new_engine))
+    return True
+
+
+async def rescore_affected_articles(old_engine, new_engine, batch_size: int = 500):
+    """
+    Re-score only the articles a trigger config or scoring policy change can affect.
+    
+    Candidates for a text re-scan are found through indexes only: the
+    per-article trigger-term index (riskTerms) for phrases whose category/tier
+    changed (see resolve_term_lookups for phrases the old engine did not
+    index), and risk_category_mask for categories whose order changed. All
+    other articles with a term index provably keep their features: if the
+    scoring policy is unchanged they are re-stamped with the new version in
+    one update, otherwise their stored riskFeatures are re-scored in a
+    vectorized pass.
+    
+    Articles without a term index or feature record are left on the old
+    version for the stale-version job, which is started at the end. So is the
+    whole change when no index can resolve it (a new phrase containing no
+    indexed one, a reordered category outside CATEGORY_SLOTS), and any engine
+    loaded while this ran.
+    
+    Progress and the outcome are recorded in risk_rescore_jobs
+    (TARGETED_RESCORE_JOB_ID).
+    """
+    started = time.monotonic()
+    job_filter = {"id": TARGETED_RESCORE_JOB_ID}
+    changed_phrases, moved_categories = diff_category_triggers(
+        old_engine.category_triggers, new_engine.category_triggers
+    )
+    lookups, unresolved = resolve_term_lookups(changed_phrases, old_engine.indexed_terms)
+    unslotted = sorted(category for category in moved_categories if category not in CATEGORY_SLOTS)
+    job = {
+        "id": TARGETED_RESCORE_JOB_ID,
+        "fromVersion": old_engine.version,
+        "toVersion": new_engine.version,
+        "status": "running",
+        "changedTerms": len(changed_phrases),
+        "termLookups": len(lookups),
+        "unresolvedTerms": unresolved,
+        "movedCategories": sorted(moved_categories),
+        "rescored": 0,
+        "restamped": 0,
+        "rescoredFromFeatures": 0,
+        "startedAt": datetime.now(timezone.utc).isoformat()
+    }
+    await db.risk_rescore_jobs.replace_one(job_filter, job, upsert=True)
+    
+    if unresolved or unslotted:
+        await db.risk_rescore_jobs.update_one(job_filter, {"$set": {
+            "status": "delegated",
+            "completedAt": datetime.now(timezone.utc).isoformat()
+        }})
+        logger.info(f"[Rescore] {old_engine.version} -> {new_engine.version} needs a full pass ({len(unresolved)} unindexed terms, {len(unslotted)} unslotted categories); starting the stale-version job")
+        start_rescore_job()
+        return
+    
+    affected = restamped = repolicied = 0
+    try:
+        clauses = []
+        if lookups:
+            clauses.append({"riskTerms": {"$in": lookups}})
+        if moved_categories:
+            # distinct() on the indexed mask reads the index, not the articles
+            bits = category_mask(moved_categories)
+            masks = [mask for mask in await db.news_articles.distinct("risk_category_mask") if isinstance(mask, int) and mask & bits]
+            if masks:
+                clauses.append({"risk_category_mask": {"$in": masks}})
+        projection = {"_id": 1, "title": 1, "fullContent": 1, "summary": 1, "source": 1, "iso_date": 1, "date": 1}
+        while clauses:
+            # Re-scored articles leave the filter, so always take the next first batch
+            affected_filter = {"riskEngineVersion": old_engine.version, "$or": clauses}
+            batch = await db.news_articles.find(affected_filter, projection).limit(batch_size).to_list(batch_size)
+            if not batch:
+                break
+            risk_results = await analyze_risk_cached(batch, new_engine)
+            await db.news_articles.bulk_write([
+                UpdateOne({"_id": article["_id"]}, {"$set": risk_update_fields(risk_data, new_engine)})
+                for article, risk_data in zip(batch, risk_results)
+            ], ordered=False)
+            affected += len(batch)
+            await db.risk_rescore_jobs.update_one(job_filter, {"$set": {"rescored": affected}})
+        
+        unchanged_filter = {
+            "riskEngineVersion": old_engine.version,
+            "riskTerms": {"$exists": True},
+            "riskFeatures": {"$exists": True}
+        }
+        if old_engine.policy.version == new_engine.policy.version:
+            result = await db.news_articles.update_many(unchanged_filter, {"$set": {
+                "riskEngineVersion": new_engine.version,
+                "riskFeaturesVersion": new_engine.feature_version
+            }})
+            restamped = result.modified_count
+        else:
+            while True:
+                batch = await db.news_articles.find(unchanged_filter, {"_id": 1, "riskFeatures": 1, "riskPublishedAt": 1}).limit(batch_size).to_list(batch_size)
+                if not batch:
+                    break
+                operations = await rescore_from_features(batch, new_engine)
+                await db.news_articles.bulk_write(operations, ordered=False)
+                repolicied += len(batch)
+                await db.risk_rescore_jobs.update_one(job_filter, {"$set": {"rescoredFromFeatures": repolicied}})
+    except Exception as e:
+        await db.risk_rescore_jobs.update_one(job_filter, {"$set": {
+            "status": "failed",
+            "error": str(e)[:200],
+            "rescored": affected,
+            "rescoredFromFeatures": repolicied,
+            "completedAt": datetime.now(timezone.utc).isoformat()
+        }})
+        logger.error(f"[Rescore] Targeted re-score {old_engine.version} -> {new_engine.version} failed: {str(e)}")
+        # The stale-version job covers whatever is left on the old version
+        start_rescore_job()
+        return
+    
+    duration = round(time.monotonic() - started, 2)
+    await db.risk_rescore_jobs.update_one(job_filter, {"$set": {
+        "status": "completed",
+        "rescored": affected,
+        "restamped": restamped,
+        "rescoredFromFeatures": repolicied,
+        "durationSeconds": duration,
+        "completedAt": datetime.now(timezone.utc).isoformat()
+    }})
+    logger.info(f"[Rescore] Targeted {old_engine.version} -> {new_engine.version}: {len(changed_phrases)} changed terms, {affected} re-scored, {restamped} re-stamped, {repolicied} re-scored from features in {duration}s")
+    
+    # Legacy articles, and a newer engine loaded meanwhile
+    if engine_registry.version != new_engine.version or await db.news_articles.find_one({"riskEngineVersion": old_engine.version}, {"_id": 1}):
+        start_rescore_job()
+
+
 async def compute_risk_for_unanalyzed_articles(limit: int = 100):
     """Compute risk scores for articles that haven't been analyzed yet"""
     logger.info("=" * 60)
@@ -762,29 +1013,33 @@ async def compute_risk_for_unanalyzed_articles(limit: int = 100):
         
         logger.info(f"[RiskEngine] Found {len(unanalyzed)} articles to analyze")
         
-        analyzed_count = 0
-        for article in unanalyzed:
-            article_id = article.get("id")
-            if not article_id:
-                continue
-            
-            risk_data = analyze_article(article)
-            
-            await db.news_articles.update_one(
-                {"id": article_id},
-                {"$set": {
-                    "risk_score": risk_data["risk_score"],
-                    "risk_band": risk_data["risk_band"],
-                    "risk_categories": risk_data["risk_categories"],
-                    "confidence": risk_data["confidence"],
-                    "time_horizon": risk_data["time_horizon"],
-                    "category_strength": risk_data["category_strength"],
-                    "riskAnalyzedAt": datetime.now(timezone.utc).isoformat()
-                }}
-            )
-            analyzed_count += 1
+        # Pin one engine for the whole batch so a config reload can't mix versions
+        engine = engine_registry.get()
+        
+        # Score off the event loop in worker processes
+        cache_before = risk_cache.snapshot()
+        unanalyzed = [article for article in unanalyzed if article.get("id")]
+        latencies = []
+        risk_results = await analyze_risk_cached(unanalyzed, engine, latencies)
+        # Per-article scoring times; memo hits are not scored (see analysis cache stats)
+        for ms in latencies:
+            shadow_stats.observe_latency("primary", ms)
+        token_updates = await cache_article_tokens(unanalyzed, engine)
+        
+        operations = [
+            UpdateOne({"id": article["id"]}, {"$set": {**risk_update_fields(risk_data, engine), **tokens}})
+            for article, risk_data, tokens in zip(unanalyzed, risk_results, token_updates)
+        ]
+        if operations:
+            await db.news_articles.bulk_write(operations, ordered=False)
+        analyzed_count = len(operations)
+        analysis_cache_runs["riskBatch"] = {**risk_cache.delta(cache_before), "completedAt": datetime.now(timezone.utc).isoformat()}
         
         logger.info(f"[RiskEngine] Completed: {analyzed_count} articles analyzed")
+        logger.info(f"[RiskEngine] Risk memo: {analysis_cache_runs['riskBatch']}")
+        
+        # After the primary write, so the candidate never delays it
+        schedule_shadow_evaluation(unanalyzed, risk_results, engine)
         logger.info("=" * 60)
         return analyzed_count
         
@@ -793,26 +1048,711 @@ async def compute_risk_for_unanalyzed_articles(limit: int = 100):
         return 0
 
 
-def normalize_url(url: str) -> str:
-    """Normalize URL for duplicate detection - remove trailing slashes, www, etc."""
-    if not url:
-        return ""
-    url = url.lower().strip()
-    # Remove trailing slash
-    url = url.rstrip('/')
-    # Remove www. prefix
-    if '://www.' in url:
-        url = url.replace('://www.', '://')
-    # Remove query parameters for comparison (optional - be careful with this)
-    return url
+# ============== SHADOW EVALUATION ==============
+
+_shadow_config: Optional[dict] = None
+_shadow_task: Optional[asyncio.Task] = None
+
+
+async def load_shadow_config() -> Optional[dict]:
+    """Refresh the cached shadow configuration from risk_shadow_config"""
+    global _shadow_config
+    _shadow_config = await db.risk_shadow_config.find_one({"id": SHADOW_CONFIG_ID}, {"_id": 0})
+    return _shadow_config
+
+
+def shadow_engine_spec(config: dict) -> dict:
+    """
+    Candidate spec of a shadow configuration (see build_candidate_engine).
+    
+    "vectorized" and "ml" score with the primary's triggers and policy;
+    "rule_based" applies the config's triggerConfigs and/or policy overrides,
+    so a new trigger configuration can be tried without saving it. Workers
+    rebuild the candidate when the config's updatedAt changes.
+    """
+    spec = {"key": config.get("updatedAt"), "engine": config.get("engine", "vectorized")}
+    if spec["engine"] == "rule_based":
+        trigger_configs = config.get("triggerConfigs")
+        if trigger_configs:
+            spec["categoryTriggers"] = category_triggers_from_configs(trigger_configs)
+        spec["policy"] = config.get("policy") or {}
+    return spec
+
+
+def schedule_shadow_evaluation(articles: List[dict], primary_results: List[dict], primary: RuleBasedRiskEngine):
+    """
+    Start a shadow run on a sample of a just-scored batch, if enabled.
+    
+    The sample keeps the primary results already computed for the batch.
+    At most one run is in flight; a batch sampled while one is running is
+    dropped (and counted) rather than queued, so shadow load stays bounded.
+    """
+    global _shadow_task
+    config = _shadow_config
+    if not config or not config.get("enabled"):
+        return
+    sample = sample_articles(list(zip(articles, primary_results)), config.get("sampleRate", 0), SHADOW_MAX_SAMPLE, random)
+    if not sample:
+        return
+    if _shadow_task is not None and not _shadow_task.done():
+        shadow_stats.record_skip()
+        return
+    _shadow_task = asyncio.create_task(run_shadow_evaluation(sample, primary, config))
+
+
+async def run_shadow_evaluation(sample: List[tuple], primary: RuleBasedRiskEngine, config: dict) -> int:
+    """
+    Compare a candidate engine with the stored primary results of sampled
+    (article, primary result) pairs.
+    
+    Runs after the primary results are stored; the candidate scores in the
+    shadow worker pool, so the API process only compares. Per-article
+    comparisons go to risk_shadow_results; aggregates to shadow_stats.
+    
+    Returns:
+        Number of articles compared
+    """
+    try:
+        articles = [article for article, _ in sample]
+        shadow_results, latencies, shadow_version = await shadow_analyzer.analyze_candidate_async(
+            articles, shadow_engine_spec(config), primary
+        )
+        # One sample per article, or per chunk for engines that score whole batches
+        for ms in latencies:
+            shadow_stats.observe_latency("shadow", ms)
+        now = datetime.now(timezone.utc)
+        documents = []
+        for (article, primary_data), shadow_data in zip(sample, shadow_results):
+            diff = shadow_stats.record(primary_data, shadow_data)
+            documents.append({
+                "articleId": article.get("id"),
+                "title": article.get("title"),
+                "primaryVersion": primary.version,
+                "shadowEngine": config.get("engine"),
+                "shadowVersion": shadow_version,
+                "primary": shadow_result_fields(primary_data),
+                "shadow": shadow_result_fields(shadow_data),
+                **diff,
+                "createdAt": now
+            })
+        if documents:
+            await db.risk_shadow_results.insert_many(documents)
+        return len(documents)
+    except Exception as e:
+        shadow_stats.record_error()
+        logger.error(f"[Shadow] Error evaluating {config.get('engine')}: {str(e)}")
+        return 0
+
+
+# ============== INCREMENTAL RE-SCORING ==============
+
+RESCORE_JOB_ID = "risk_rescore"
+TARGETED_RESCORE_JOB_ID = "risk_rescore_targeted"
+_rescore_task: Optional[asyncio.Task] = None
+
+
+async def rescore_stale_articles(batch_size: int = 500):
+    """
+    Re-score articles whose riskEngineVersion differs from the active engine.
+    
+    Walks the collection in _id order and checkpoints the last processed _id
+    in risk_rescore_jobs, so an interrupted run resumes where it stopped.
+    Existing scores stay in place until the new result overwrites them.
+    Articles whose stored riskFeatures match the active trigger version are
+    re-scored from those features without re-reading their text.
+    """
+    engine = engine_registry.get()
+    version = engine.version
+    
+    job = await db.risk_rescore_jobs.find_one({"id": RESCORE_JOB_ID}, {"_id": 0})
+    stale_filter = {"riskEngineVersion": {"$ne": version}}
+    
+    if job and job.get("version") == version and job.get("status") == "running":
+        last_id = job.get("lastId")
+        done = job.get("done", 0)
+        total = job.get("total", 0)
+        logger.info(f"[Rescore] Resuming version {version} at {done}/{total}")
+    else:
+        last_id = None
+        done = 0
+        total = await db.news_articles.count_documents(stale_filter)
+        job = {
+            "id": RESCORE_JOB_ID,
+            "version": version,
+            "status": "running",
+            "lastId": None,
+            "done": 0,
+            "total": total,
+            "startedAt": datetime.now(timezone.utc).isoformat()
+        }
+        await db.risk_rescore_jobs.replace_one({"id": RESCORE_JOB_ID}, job, upsert=True)
+        logger.info(f"[Rescore] Starting version {version}: {total} stale articles")
+    
+    run_started = time.monotonic()
+    run_done = 0
+    projection = {
+        "_id": 1, "id": 1, "title": 1, "fullContent": 1, "summary": 1, "source": 1, "iso_date": 1, "date": 1,
+        "riskFeatures": 1, "riskFeaturesVersion": 1, "riskPublishedAt": 1
+    }
+    
+    try:
+        while True:
+            batch_filter = dict(stale_filter)
+            if last_id is not None:
+                batch_filter["_id"] = {"$gt": last_id}
+            
+            batch = await db.news_articles.find(batch_filter, projection).sort("_id", 1).limit(batch_size).to_list(batch_size)
+            if not batch:
+                break
+            
+            # The engine pinned at job start keeps the whole run on one version
+            from_features, to_scan = [], []
+            for article in batch:
+                if article.get("riskFeatures") is not None and article.get("riskFeaturesVersion") == engine.feature_version:
+                    from_features.append(article)
+                else:
+                    to_scan.append(article)
+            operations = await rescore_from_features(from_features, engine) if from_features else []
+            if to_scan:
+                risk_results = await analyze_risk_cached(to_scan, engine)
+                operations.extend(
+                    UpdateOne({"_id": article["_id"]}, {"$set": risk_update_fields(risk_data, engine)})
+                    for article, risk_data in zip(to_scan, risk_results)
+                )
+            await db.news_articles.bulk_write(operations, ordered=False)
+            
+            last_id = batch[-1]["_id"]
+            done += len(batch)
+            run_done += len(batch)
+            elapsed = time.monotonic() - run_started
+            rate = run_done / elapsed if elapsed > 0 else 0
+            await db.risk_rescore_jobs.update_one(
+                {"id": RESCORE_JOB_ID},
+                {"$set": {
+                    "lastId": last_id,
+                    "done": done,
+                    "total": max(total, done),
+                    "rate": round(rate, 1),
+                    "updatedAt": datetime.now(timezone.utc).isoformat()
+                }}
+            )
+        
+        await db.risk_rescore_jobs.update_one(
+            {"id": RESCORE_JOB_ID},
+            {"$set": {"status": "completed", "completedAt": datetime.now(timezone.utc).isoformat()}}
+        )
+        logger.info(f"[Rescore] Completed version {version}: {done} articles re-scored")
+    except Exception as e:
+        await db.risk_rescore_jobs.update_one(
+            {"id": RESCORE_JOB_ID},
+            {"$set": {"error": str(e)[:200], "updatedAt": datetime.now(timezone.utc).isoformat()}}
+        )
+        logger.error(f"[Rescore] Error at {done}/{total}: {str(e)}")
+
+
+def effective_risk_expressions(now: Optional[datetime] = None) -> dict:
+    """
+    Aggregation expressions for the score and band as of `now`.
+    
+    Articles scored before the static/recent split have no riskPublishedAt
+    and fall back to their stored risk_score/risk_band.
+    """
+    policy = engine_registry.get().policy
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(hours=policy.recency_hours)
+    recent = {"$gt": ["$riskPublishedAt", cutoff]}
+    return {
+        "risk_score": {"$cond": [recent, "$recent_risk_score", "$risk_score"]},
+        "risk_band": {"$cond": [recent, "$recent_risk_band", "$risk_band"]}
+    }
+
+
+async def refresh_effective_risk() -> int:
+    """
+    Update the materialized effective_score/effective_band of articles that
+    left the recency window since the last run. Only those articles change.
+    
+    Returns:
+        Number of articles updated
+    """
+    policy = engine_registry.get().policy
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=policy.recency_hours)
+    try:
+        crossed = await db.news_articles.update_many(
+            {"riskRecent": True, "riskPublishedAt": {"$lte": cutoff}},
+            [{"$set": {"effective_score": "$risk_score", "effective_band": "$risk_band", "riskRecent": False}}]
+        )
+        # Articles scored before effective_band existed
+        legacy = await db.news_articles.update_many(
+            {"risk_band": {"$exists": True}, "effective_band": {"$exists": False}},
+            [{"$set": {"effective_score": "$risk_score", "effective_band": "$risk_band", "riskRecent": False}}]
+        )
+    except Exception as e:
+        logger.error(f"[RiskEngine] Error refreshing effective risk: {str(e)}")
+        return 0
+    updated = crossed.modified_count + legacy.modified_count
+    if updated:
+        logger.info(f"[RiskEngine] Effective risk refreshed: {crossed.modified_count} left the recency window, {legacy.modified_count} legacy")
+    return updated
+
+
+def category_mask_filter(category: str) -> dict:
+    """Query for articles in a risk category: a bit test where the category has a fixed slot"""
+    if category in CATEGORY_SLOTS:
+        return {"risk_category_mask": {"$bitsAllSet": 1 << CATEGORY_SLOTS[category]}}
+    return {"risk_categories": category}
+
+
+async def backfill_category_fields() -> int:
+    """
+    Derive risk_category_mask/category_strength_array for articles scored
+    before the compact fields existed, in one server-side update.
+    
+    Returns:
+        Number of articles updated
+    """
+    try:
+        result = await db.news_articles.update_many(
+            {"risk_categories": {"$exists": True}, "risk_category_mask": {"$exists": False}},
+            [{"$set": {
+                "risk_category_mask": {"$add": [
+                    {"$cond": [{"$in": [category, {"$ifNull": ["$risk_categories", []]}]}, 1 << slot, 0]}
+                    for category, slot in CATEGORY_SLOTS.items()
+                ]},
+                "category_strength_array": [
+                    {"$ifNull": [f"$category_strength.{category}", 0]}
+                    for category in CATEGORY_SLOTS
+                ]
+            }}]
+        )
+    except Exception as e:
+        logger.error(f"[RiskEngine] Error backfilling category fields: {str(e)}")
+        return 0
+    if result.modified_count:
+        logger.info(f"[RiskEngine] Category mask backfilled for {result.modified_count} articles")
+    return result.modified_count
+
+
+def start_rescore_job() -> bool:
+    """Start the re-score job in the background unless one is already running"""
+    global _rescore_task
+    if _rescore_task is not None and not _rescore_task.done():
+        return False
+    _rescore_task = asyncio.create_task(rescore_stale_articles())
+    return True
+
+
+# ============== RELEVANCE MAINTENANCE JOBS ==============
+
+# "cleanup" removes articles that fail the relevance check; "apply" stores
+# relevanceScore/matchedKeywords on articles that have none; "rescore"
+# recomputes them on every article not scored by the job's filter version
+RELEVANCE_JOB_BATCH_SIZE = 1000
+RELEVANCE_JOB_RESULTS_TTL_DAYS = 7
+_relevance_tasks: Dict[str, asyncio.Task] = {}
+
+
+def relevance_job_query(kind: str, version: str) -> dict:
+    if kind == "cleanup":
+        return {}
+    if kind == "rescore":
+        return {"relevanceVersion": {"$ne": version}}
+    return {"relevanceScore": {"$exists": False}}
+
+
+def article_source_name(article: dict) -> str:
+    source = article.get("source")
+    return source.get("name", "") if isinstance(source, dict) else ""
+
+
+def relevance_job_lists_articles(kind: str, dry_run: bool) -> bool:
+    """
+    Whether a job writes its articles to relevance_job_results: dry runs (what
+    would change) and cleanup deletions. Live apply/rescore jobs keep only
+    their counters; the scores are on the articles.
+    """
+    return dry_run or kind == "cleanup"
+
+
+def relevance_job_result(job_id: str, seq: int, article: dict, relevance: dict) -> dict:
+    """One listed article of a job (an irrelevant article, or a computed score)"""
+    title = article.get("title") or ""
+    link = article.get("link") or ""
+    return {
+        "jobId": job_id,
+        "seq": seq,
+        "id": article.get("id"),
+        "title": title[:80] + "..." if len(title) > 80 else title,
+        "link": link[:60] + "..." if len(link) > 60 else link,
+        "reason": relevance["reason"],
+        "relevanceScore": relevance["relevance_score"],
+        "createdAt": datetime.now(timezone.utc)
+    }
+
+
+async def run_relevance_job(job_id: str, batch_size: int = RELEVANCE_JOB_BATCH_SIZE):
+    """
+    Run a cleanup/apply job over news_articles in constant memory.
+    
+    One cursor streams the matching articles in _id order; each batch is
+    checked with the batched relevance scorer in a worker thread and written
+    with one delete_many or bulk_write. Listed articles of dry runs and
+    cleanups go to relevance_job_results (paginated by seq, see
+    relevance_job_lists_articles), and the last processed _id is
+    checkpointed in relevance_jobs after every batch, so an interrupted job
+    resumes where it stopped.
+    """
+    job = await db.relevance_jobs.find_one({"id": job_id}, {"_id": 0})
+    kind, dry_run = job["kind"], job["dryRun"]
+    keep_listing = relevance_job_lists_articles(kind, dry_run)
+    query = relevance_job_query(kind, job["version"])
+    if job.get("lastId") is not None:
+        query["_id"] = {"$gt": job["lastId"]}
+        logger.info(f"[Relevance] Resuming {kind} job {job_id} at {job['scanned']}/{job['total']}")
+    # Listings written after the last checkpoint are written again
+    await db.relevance_job_results.delete_many({"jobId": job_id, "seq": {"$gte": job["matched"]}})
+    
+    matcher = relevance_filter  # one keyword set per run
+    scanned, matched, changed = job["scanned"], job["matched"], job["changed"]
+    run_started = time.monotonic()
+    run_scanned = 0
+    
+    async def process(batch: List[dict]):
+        nonlocal scanned, matched, changed, run_scanned
+        inputs = [(article.get("title") or "", "", article_source_name(article)) for article in batch]
+        results = await asyncio.to_thread(matcher.check_batch, inputs)
+        if kind == "cleanup":
+            listed = [(article, relevance) for article, relevance in zip(batch, results) if not relevance["is_relevant"]]
+        else:
+            listed = list(zip(batch, results))
+        
+        if listed:
+            if keep_listing:
+                await db.relevance_job_results.insert_many([
+                    relevance_job_result(job_id, matched + i, article, relevance)
+                    for i, (article, relevance) in enumerate(listed)
+                ])
+            if not dry_run and kind == "cleanup":
+                result = await db.news_articles.delete_many({"_id": {"$in": [article["_id"] for article, _ in listed]}})
+                changed += result.deleted_count
+            elif not dry_run:
+                result = await db.news_articles.bulk_write([
+                    UpdateOne({"_id": article["_id"]}, {"$set": {
+                        "relevanceScore": relevance["relevance_score"],
+                        "matchedKeywords": relevance.get("matched_keywords", []),
+                        "relevanceVersion": matcher.version
+                    }})
+                    for article, relevance in listed
+                ], ordered=False)
+                changed += result.modified_count
+        
+        scanned += len(batch)
+        matched += len(listed)
+        run_scanned += len(batch)
+        elapsed = time.monotonic() - run_started
+        await db.relevance_jobs.update_one({"id": job_id}, {"$set": {
+            "lastId": batch[-1]["_id"],
+            "scanned": scanned,
+            "matched": matched,
+            "changed": changed,
+            "total": max(job["total"], scanned),
+            "rate": round(run_scanned / elapsed, 1) if elapsed > 0 else 0,
+            "updatedAt": datetime.now(timezone.utc).isoformat()
+        }})
+    
+    try:
+        cursor = db.news_articles.find(
+            query, {"_id": 1, "id": 1, "title": 1, "link": 1, "source": 1}
+        ).sort("_id", 1).batch_size(batch_size)
+        batch = []
+        async for article in cursor:
+            batch.append(article)
+            if len(batch) >= batch_size:
+                await process(batch)
+                batch = []
+        if batch:
+            await process(batch)
+        
+        await db.relevance_jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "completed", "completedAt": datetime.now(timezone.utc).isoformat()}}
+        )
+        if kind == "cleanup" and not dry_run:
+            await db.news_fetch_logs.insert_one({
+                "id": str(uuid.uuid4()),
+                "action": "cleanup_irrelevant",
+                "jobId": job_id,
+                "deletedCount": changed,
+                "articles": await db.relevance_job_results.find(
+                    {"jobId": job_id}, {"_id": 0, "id": 1, "title": 1, "link": 1, "reason": 1}
+                ).sort("seq", 1).limit(20).to_list(20),  # First 20 for reference
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            })
+        logger.info(f"[Relevance] Completed {kind} job {job_id}{' (dry run)' if dry_run else ''}: {scanned} scanned, {matched} listed, {changed} changed")
+    except asyncio.CancelledError:
+        await db.relevance_jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "cancelled", "updatedAt": datetime.now(timezone.utc).isoformat()}}
+        )
+        raise
+    except Exception as e:
+        await db.relevance_jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "failed", "error": str(e)[:200], "updatedAt": datetime.now(timezone.utc).isoformat()}}
+        )
+        logger.error(f"[Relevance] Error in {kind} job {job_id} at {scanned}: {str(e)}")
+
+
+async def start_relevance_job(kind: str, dry_run: bool) -> tuple:
+    """
+    Start a relevance job unless one of the same kind is running.
+    
+    Returns:
+        (job id, whether a new job was started)
+    """
+    task = _relevance_tasks.get(kind)
+    if task is not None and not task.done():
+        running = await db.relevance_jobs.find_one({"kind": kind, "status": "running"}, {"_id": 0, "id": 1})
+        return (running or {}).get("id"), False
+    job_id = str(uuid.uuid4())
+    await db.relevance_jobs.insert_one({
+        "id": job_id,
+        "kind": kind,
+        "dryRun": dry_run,
+        "status": "running",
+        "version": relevance_filter.version,
+        "lastId": None,
+        "scanned": 0,
+        "matched": 0,
+        "changed": 0,
+        "total": await db.news_articles.count_documents(relevance_job_query(kind, relevance_filter.version)),
+        "startedAt": datetime.now(timezone.utc).isoformat()
+    })
+    _relevance_tasks[kind] = asyncio.create_task(run_relevance_job(job_id))
+    return job_id, True
+
+
+async def resume_relevance_jobs():
+    """Resume relevance jobs interrupted by the last shutdown"""
+    async for job in db.relevance_jobs.find({"status": "running"}, {"_id": 0, "id": 1, "kind": 1}):
+        task = _relevance_tasks.get(job["kind"])
+        if task is None or task.done():
+            _relevance_tasks[job["kind"]] = asyncio.create_task(run_relevance_job(job["id"]))
+
+
+# Unique index that ingestion upserts rely on (see migrate_normalized_links)
+NORMALIZED_LINK_INDEX = "normalizedLink_1"
+
+
+async def migrate_normalized_links(batch_size: int = 1000) -> dict:
+    """
+    Key articles on normalizedLink: backfill it, merge articles that share
+    one, then create the unique index. Runs at startup; once the unique
+    index exists every article write sets normalizedLink, so the scans are
+    skipped.
+    
+    Of each set of copies the visible, scraped, risk-analyzed, earliest
+    fetched one is kept, with the queries of all copies.
+    
+    Returns:
+        Counts of backfilled articles and removed duplicates
+    """
+    backfilled = 0
+    removed = 0
+    try:
+        indexes = await db.news_articles.index_information()
+        if indexes.get(NORMALIZED_LINK_INDEX, {}).get("unique"):
+            return {"backfilled": 0, "removed": 0}
+        
+        operations = []
+        async for article in db.news_articles.find({"normalizedLink": {"$exists": False}}, {"_id": 1, "link": 1}):
+            # Articles without a link stay out of the (partial) unique index
+            normalized_link = normalize_url(article.get("link") or "") or None
+            operations.append(UpdateOne({"_id": article["_id"]}, {"$set": {"normalizedLink": normalized_link}}))
+            if len(operations) >= batch_size:
+                await db.news_articles.bulk_write(operations, ordered=False)
+                backfilled += len(operations)
+                operations = []
+        if operations:
+            await db.news_articles.bulk_write(operations, ordered=False)
+            backfilled += len(operations)
+        
+        duplicates = db.news_articles.aggregate([
+            {"$match": {"normalizedLink": {"$type": "string"}}},
+            {"$group": {"_id": "$normalizedLink", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+            {"$match": {"count": {"$gt": 1}}}
+        ], allowDiskUse=True)
+        async for group in duplicates:
+            copies = await db.news_articles.find(
+                {"_id": {"$in": group["ids"]}},
+                {"_id": 1, "queries": 1, "isHidden": 1, "scraped": 1, "risk_score": 1, "fetchedAt": 1}
+            ).to_list(None)
+            keeper = min(copies, key=lambda copy: (
+                bool(copy.get("isHidden")), not copy.get("scraped"), "risk_score" not in copy, copy.get("fetchedAt") or ""
+            ))
+            queries = sorted({query for copy in copies for query in copy.get("queries") or []})
+            await db.news_articles.update_one({"_id": keeper["_id"]}, {"$addToSet": {"queries": {"$each": queries}}})
+            others = [copy["_id"] for copy in copies if copy["_id"] != keeper["_id"]]
+            removed += (await db.news_articles.delete_many({"_id": {"$in": others}})).deleted_count
+        
+        await db.news_articles.create_index(
+            "normalizedLink", name=NORMALIZED_LINK_INDEX, unique=True,
+            partialFilterExpression={"normalizedLink": {"$type": "string"}}
+        )
+    except Exception as e:
+        logger.error(f"[Ingestion] Error migrating to normalized links: {str(e)}")
+    if backfilled or removed:
+        logger.info(f"[Ingestion] normalizedLink backfilled for {backfilled} articles, {removed} duplicates merged")
+    return {"backfilled": backfilled, "removed": removed}
+
+
+# ============== INGESTION ==============
+
+# Batches buffered between two pipeline stages
+INGESTION_QUEUE_SIZE = int(os.environ.get("INGESTION_QUEUE_SIZE", "8"))
+# Per-stage metrics of the last run of each kind
+ingestion_runs: Dict[str, dict] = {}
+# Request only items newer than each (query, provider) high-water mark and
+# skip unchanged responses (see news_ingestion)
+INCREMENTAL_FETCH = os.environ.get("INCREMENTAL_FETCH", "true").lower() == "true"
+
+
+async def write_news_batch(batch: ProviderBatch):
+    """
+    Pipeline sink: write a batch with one unordered bulk_write keyed on normalizedLink.
+    
+    Relevant articles are upserted: $setOnInsert creates the document (stamped
+    with the relevance filter version) if the link is new, and $addToSet adds
+    the query either way. Irrelevant results
+    that may already be stored only add the query to the existing article.
+    Sets batch.counts (new, existing, filtered).
+    """
+    add_query = {"$addToSet": {"queries": batch.query}}
+    operations = [
+        UpdateOne(
+            {"normalizedLink": document["normalizedLink"]},
+            {"$setOnInsert": {
+                **{name: value for name, value in document.items() if name not in ("normalizedLink", "queries")},
+                "relevanceVersion": relevance_filter.version
+            }, **add_query},
+            upsert=True
+        )
+        for document in batch.relevant
+    ]
+    operations.extend(UpdateOne({"normalizedLink": link}, add_query) for link in batch.tag_only)
+    
+    counts = {"new": 0, "existing": 0, "filtered": batch.filtered}
+    failed = 0
+    if operations:
+        try:
+            result = (await db.news_articles.bulk_write(operations, ordered=False)).bulk_api_result
+        except BulkWriteError as e:
+            result = e.details
+            logger.error(f"[{batch.provider}] {len(result['writeErrors'])} article writes failed for query '{batch.query}': {result['writeErrors'][0].get('errmsg')}")
+        seen_links.add_many(document["normalizedLink"] for document in batch.relevant)
+        failed = len(result.get("writeErrors", []))
+        counts["new"] = result["nUpserted"]
+        counts["existing"] = result["nMatched"]
+        # Irrelevant results that matched no stored article
+        counts["filtered"] += len(operations) - result["nUpserted"] - result["nMatched"] - failed
+    batch.counts = counts
+    # Advance the high-water mark only once every article is written, so a
+    # failed batch is fetched in full again
+    if batch.watermark is not None and not failed:
+        await db.news_fetch_watermarks.update_one(
+            {"query": batch.query, "provider": batch.provider},
+            {"$set": {
+                **batch.watermark,
+                "relevanceVersion": relevance_filter.version,
+                "updatedAt": datetime.now(timezone.utc).isoformat()
+            }},
+            upsert=True
+        )
+    logger.info(f"[{batch.provider}] Query '{batch.query}': {len(batch.results)} found, {counts['new']} new, {counts['existing']} existing, {counts['filtered']} filtered")
+
+
+def provider_fetch_log(batch: ProviderBatch) -> dict:
+    """news_fetch_logs entry of one provider request"""
+    return {
+        "id": str(uuid.uuid4()),
+        "api": batch.provider,
+        "query": batch.query,
+        "articlesFound": len(batch.results),
+        "newArticles": batch.counts["new"],
+        "existingUpdated": batch.counts["existing"],
+        "filtered": batch.counts["filtered"],
+        "status": "success" if batch.results else "no_results",
+        "incremental": batch.since is not None,
+        "unchanged": batch.unchanged,
+        "fetchedAt": datetime.now(timezone.utc).isoformat()
+    }
+
+
+async def load_fetch_watermarks(adapters: List[ProviderAdapter], queries: List[str]) -> Dict[tuple, dict]:
+    """
+    Stored high-water marks of the (query, provider) pairs of a run.
+    
+    A fingerprint recorded under another relevance keyword set is dropped, so
+    results filtered by the old set are checked again.
+    """
+    watermarks = {}
+    cursor = db.news_fetch_watermarks.find(
+        {"query": {"$in": queries}, "provider": {"$in": [adapter.name for adapter in adapters]}}, {"_id": 0}
+    )
+    async for mark in cursor:
+        if mark.get("relevanceVersion") != relevance_filter.version:
+            mark.pop("fingerprint", None)
+        watermarks[(mark["query"], mark["provider"])] = mark
+    return watermarks
+
+
+async def forget_fetch_watermarks(query: str) -> int:
+    """Drop a query's high-water marks, so its next fetch is a full one"""
+    return (await db.news_fetch_watermarks.delete_many({"query": query})).deleted_count
+
+
+async def run_ingestion(kind: str, adapters: List[ProviderAdapter], queries: List[str],
+                        incremental: bool = True) -> List[ProviderBatch]:
+    """
+    Run queries x adapters through the ingestion pipeline.
+    
+    Without incremental, stored high-water marks are ignored (and replaced
+    once the batches are written). Returns the written batches; the run's
+    stage metrics are kept in ingestion_runs[kind].
+    """
+    # Links stored by other processes since the last run
+    await seen_links.catch_up()
+    watermarks = await load_fetch_watermarks(adapters, queries) if INCREMENTAL_FETCH and incremental else {}
+    pipeline = IngestionPipeline(
+        adapters, check_article_relevance_cached, seen_links.might_contain, write_news_batch,
+        queue_size=INGESTION_QUEUE_SIZE, watermarks=watermarks
+    )
+    try:
+        return await pipeline.run(queries)
+    finally:
+        ingestion_runs[kind] = {
+            **pipeline.report(),
+            "queries": len(queries),
+            "completedAt": datetime.now(timezone.utc).isoformat()
+        }
+        await seen_links.save()
+
 
 async def fetch_and_store_all_news():
-    """Fetch news for all active queries from all APIs and store in database"""
+    """
+    Fetch news for all active queries from all APIs and store in database.
+    
+    Every query goes to every provider through the ingestion pipeline, with
+    each provider's requests bounded by its adapter limits; batches are
+    upserted as they arrive, so a story found by several queries is stored once.
+    """
     logger.info("=" * 60)
     logger.info("Starting scheduled news fetch from all sources...")
     logger.info("=" * 60)
     
     try:
+        # Pick up keyword set edits made through another worker process
+        await reload_relevance_filter()
+        
         # Get all active queries
         queries = await db.news_queries.find({"isActive": True}, {"_id": 0}).to_list(100)
         
@@ -828,205 +1768,20 @@ async def fetch_and_store_all_news():
             queries = [default_query]
             logger.info("Created default search query: electronics parts")
         
-        # Track all seen URLs across all queries and APIs for global deduplication
-        global_seen_urls = set()
-        
-        # Get existing URLs from database for duplicate detection
-        existing_articles = await db.news_articles.find({}, {"link": 1, "_id": 0}).to_list(10000)
-        for article in existing_articles:
-            if article.get("link"):
-                global_seen_urls.add(normalize_url(article["link"]))
-        
-        logger.info(f"Found {len(global_seen_urls)} existing articles in database")
-        
-        total_new_articles = 0
-        
-        for q in queries:
-            query_text = q["query"]
-            logger.info(f"\n--- Processing query: '{query_text}' ---")
-            
-            # Track URLs seen for this query (to avoid duplicates between APIs for same query)
-            query_seen_urls = set()
-            
-            # ========== SERPAPI ==========
-            serpapi_articles = await fetch_news_from_serpapi(query_text)
-            serpapi_new = 0
-            serpapi_existing_updated = 0
-            serpapi_filtered = 0
-            
-            for article in serpapi_articles:
-                link = article.get("link", "")
-                if not link:
-                    continue
-                    
-                normalized_link = normalize_url(link)
-                
-                # Skip if we've already processed this URL in this query batch
-                if normalized_link in query_seen_urls:
-                    continue
-                
-                query_seen_urls.add(normalized_link)
-                
-                # Check if article already exists in database
-                existing = await db.news_articles.find_one({"link": link})
-                
-                if existing:
-                    # Article exists - just add this query to its queries array
-                    await db.news_articles.update_one(
-                        {"link": link},
-                        {"$addToSet": {"queries": query_text}}
-                    )
-                    serpapi_existing_updated += 1
-                else:
-                    # Check relevance before storing
-                    title = article.get("title", "")
-                    snippet = article.get("snippet", "")
-                    source_name = article.get("source", {}).get("name", "")
-                    
-                    relevance = check_article_relevance(title, snippet, source_name)
-                    
-                    if not relevance["is_relevant"]:
-                        serpapi_filtered += 1
-                        logger.debug(f"[SerpAPI] Filtered irrelevant: {title[:50]}... Reason: {relevance['reason']}")
-                        continue
-                    
-                    # New article - create with queries array
-                    news_doc = {
-                        "id": str(uuid.uuid4()),
-                        "position": article.get("position", 0),
-                        "title": title,
-                        "source": article.get("source", {}),
-                        "link": link,
-                        "thumbnail": article.get("thumbnail"),
-                        "thumbnail_small": article.get("thumbnail_small"),
-                        "date": article.get("date"),
-                        "iso_date": article.get("iso_date"),
-                        "queries": [query_text],  # Array of queries this article belongs to
-                        "apiSource": "SerpAPI",
-                        "fetchedAt": datetime.now(timezone.utc).isoformat(),
-                        "isHidden": False,
-                        "relevanceScore": relevance["relevance_score"],
-                        "matchedKeywords": relevance.get("matched_keywords", [])
-                    }
-                    
-                    await db.news_articles.insert_one(news_doc)
-                    global_seen_urls.add(normalized_link)
-                    serpapi_new += 1
-            
-            total_new_articles += serpapi_new
-            
-            # Log SerpAPI fetch
-            serpapi_log = {
-                "id": str(uuid.uuid4()),
-                "api": "SerpAPI",
-                "query": query_text,
-                "articlesFound": len(serpapi_articles),
-                "newArticles": serpapi_new,
-                "existingUpdated": serpapi_existing_updated,
-                "filtered": serpapi_filtered,
-                "status": "success" if serpapi_articles else "no_results",
-                "fetchedAt": datetime.now(timezone.utc).isoformat()
-            }
-            await db.news_fetch_logs.insert_one(serpapi_log)
-            logger.info(f"[SerpAPI] Query '{query_text}': {len(serpapi_articles)} found, {serpapi_new} new, {serpapi_existing_updated} existing, {serpapi_filtered} filtered")
-            
-            # ========== GDELT ==========
-            gdelt_articles = await fetch_news_from_gdelt(query_text)
-            gdelt_new = 0
-            gdelt_existing_updated = 0
-            gdelt_filtered = 0
-            
-            for article in gdelt_articles:
-                link = article.get("url", "")
-                if not link:
-                    continue
-                    
-                normalized_link = normalize_url(link)
-                
-                # Skip if we've already processed this URL in this query batch
-                if normalized_link in query_seen_urls:
-                    continue
-                
-                query_seen_urls.add(normalized_link)
-                
-                # Check if article already exists in database
-                existing = await db.news_articles.find_one({"link": link})
-                
-                if existing:
-                    # Article exists - just add this query to its queries array
-                    await db.news_articles.update_one(
-                        {"link": link},
-                        {"$addToSet": {"queries": query_text}}
-                    )
-                    gdelt_existing_updated += 1
-                else:
-                    # Check relevance before storing
-                    title = article.get("title", "")
-                    source_name = article.get("domain", article.get("sourcecountry", ""))
-                    
-                    relevance = check_article_relevance(title, "", source_name)
-                    
-                    if not relevance["is_relevant"]:
-                        gdelt_filtered += 1
-                        logger.debug(f"[GDELT] Filtered irrelevant: {title[:50]}... Reason: {relevance['reason']}")
-                        continue
-                    
-                    # Parse GDELT date format (YYYYMMDDTHHMMSSZ)
-                    gdelt_date = article.get("seendate", "")
-                    iso_date = None
-                    if gdelt_date:
-                        try:
-                            # Convert GDELT date format to ISO
-                            iso_date = f"{gdelt_date[:4]}-{gdelt_date[4:6]}-{gdelt_date[6:8]}T{gdelt_date[9:11]}:{gdelt_date[11:13]}:{gdelt_date[13:15]}Z"
-                        except (IndexError, ValueError):
-                            iso_date = None
-                    
-                    # New article - create with queries array
-                    news_doc = {
-                        "id": str(uuid.uuid4()),
-                        "position": 0,
-                        "title": title,
-                        "source": {
-                            "name": source_name or "Unknown",
-                            "icon": None
-                        },
-                        "link": link,
-                        "thumbnail": article.get("socialimage"),
-                        "thumbnail_small": article.get("socialimage"),
-                        "date": gdelt_date,
-                        "iso_date": iso_date,
-                        "queries": [query_text],  # Array of queries this article belongs to
-                        "apiSource": "GDELT",
-                        "fetchedAt": datetime.now(timezone.utc).isoformat(),
-                        "isHidden": False,
-                        "relevanceScore": relevance["relevance_score"],
-                        "matchedKeywords": relevance.get("matched_keywords", [])
-                    }
-                    
-                    await db.news_articles.insert_one(news_doc)
-                    global_seen_urls.add(normalized_link)
-                    gdelt_new += 1
-            
-            total_new_articles += gdelt_new
-            
-            # Log GDELT fetch
-            gdelt_log = {
-                "id": str(uuid.uuid4()),
-                "api": "GDELT",
-                "query": query_text,
-                "articlesFound": len(gdelt_articles),
-                "newArticles": gdelt_new,
-                "existingUpdated": gdelt_existing_updated,
-                "filtered": gdelt_filtered,
-                "status": "success" if gdelt_articles else "no_results",
-                "fetchedAt": datetime.now(timezone.utc).isoformat()
-            }
-            await db.news_fetch_logs.insert_one(gdelt_log)
-            logger.info(f"[GDELT] Query '{query_text}': {len(gdelt_articles)} found, {gdelt_new} new, {gdelt_existing_updated} existing, {gdelt_filtered} filtered")
+        cache_before = relevance_cache.snapshot()
+        logger.info(f"Fetching {len(queries)} queries from {len(NEWS_ADAPTERS)} providers")
+        batches = await run_ingestion("scheduled", NEWS_ADAPTERS, [q["query"] for q in queries])
+        if batches:
+            await db.news_fetch_logs.insert_many([provider_fetch_log(batch) for batch in batches])
+        total_new_articles = sum(batch.counts["new"] for batch in batches)
+        run = ingestion_runs["scheduled"]
         
         logger.info("=" * 60)
-        logger.info("Scheduled news fetch complete!")
+        logger.info(f"Incremental requests: {run['incrementalRequests']}, unchanged responses skipped: {run['unchangedResponses']}")
+        logger.info(f"Scheduled news fetch complete in {run['wallSeconds']}s!")
         logger.info(f"Total new articles stored: {total_new_articles}")
+        analysis_cache_runs["ingestion"] = {**relevance_cache.delta(cache_before), "completedAt": datetime.now(timezone.utc).isoformat()}
+        logger.info(f"Relevance memo: {analysis_cache_runs['ingestion']}")
         logger.info("=" * 60)
         
         # Trigger background scraping for new articles
@@ -1045,156 +1800,18 @@ async def fetch_news_for_single_query(query_text: str):
     logger.info("=" * 60)
     
     try:
-        # Get existing URLs for duplicate detection
-        global_seen_urls = set()
-        existing_articles = await db.news_articles.find({}, {"link": 1, "_id": 0}).to_list(10000)
-        for article in existing_articles:
-            if article.get("link"):
-                global_seen_urls.add(normalize_url(article["link"]))
-        
-        total_new_articles = 0
-        total_filtered = 0
-        query_seen_urls = set()
-        
-        # ========== SERPAPI ==========
-        serpapi_articles = await fetch_news_from_serpapi(query_text)
-        serpapi_new = 0
-        serpapi_existing_updated = 0
-        serpapi_filtered = 0
-        
-        for article in serpapi_articles:
-            link = article.get("link", "")
-            if not link:
-                continue
-            
-            normalized_link = normalize_url(link)
-            
-            if normalized_link in query_seen_urls:
-                continue
-            
-            query_seen_urls.add(normalized_link)
-            
-            if normalized_link in global_seen_urls:
-                # Article exists - add query to its queries array
-                await db.news_articles.update_one(
-                    {"link": {"$regex": f"^{re.escape(link[:50])}", "$options": "i"}},
-                    {"$addToSet": {"queries": query_text}}
-                )
-                serpapi_existing_updated += 1
-            else:
-                # Check relevance before storing
-                title = article.get("title", "")
-                snippet = article.get("snippet", "")
-                source_name = article.get("source", {}).get("name", "")
-                
-                relevance = check_article_relevance(title, snippet, source_name)
-                
-                if not relevance["is_relevant"]:
-                    serpapi_filtered += 1
-                    total_filtered += 1
-                    continue
-                
-                # New article
-                article_doc = {
-                    "id": str(uuid.uuid4()),
-                    "position": article.get("position", 0),
-                    "title": title,
-                    "source": article.get("source", {}),
-                    "link": link,
-                    "thumbnail": article.get("thumbnail"),
-                    "thumbnail_small": article.get("thumbnail_small"),
-                    "date": article.get("date"),
-                    "iso_date": article.get("iso_date"),
-                    "queries": [query_text],
-                    "apiSource": "SerpAPI",
-                    "fetchedAt": datetime.now(timezone.utc).isoformat(),
-                    "isHidden": False,
-                    "relevanceScore": relevance["relevance_score"],
-                    "matchedKeywords": relevance.get("matched_keywords", [])
-                }
-                await db.news_articles.insert_one(article_doc)
-                global_seen_urls.add(normalized_link)
-                serpapi_new += 1
-                total_new_articles += 1
-        
-        logger.info(f"[SerpAPI] Query '{query_text}': {len(serpapi_articles)} found, {serpapi_new} new, {serpapi_existing_updated} existing, {serpapi_filtered} filtered")
-        
-        # ========== GDELT ==========
-        gdelt_articles = await fetch_news_from_gdelt(query_text)
-        gdelt_new = 0
-        gdelt_existing_updated = 0
-        gdelt_filtered = 0
-        
-        for article in gdelt_articles:
-            link = article.get("url", "")
-            if not link:
-                continue
-            
-            normalized_link = normalize_url(link)
-            
-            if normalized_link in query_seen_urls:
-                continue
-            
-            query_seen_urls.add(normalized_link)
-            
-            if normalized_link in global_seen_urls:
-                await db.news_articles.update_one(
-                    {"link": {"$regex": f"^{re.escape(link[:50])}", "$options": "i"}},
-                    {"$addToSet": {"queries": query_text}}
-                )
-                gdelt_existing_updated += 1
-            else:
-                # Check relevance before storing
-                title = article.get("title", "")
-                source_name = article.get("domain", "")
-                
-                relevance = check_article_relevance(title, "", source_name)
-                
-                if not relevance["is_relevant"]:
-                    gdelt_filtered += 1
-                    total_filtered += 1
-                    continue
-                
-                # Parse GDELT date format
-                iso_date = None
-                gdelt_date = article.get("seendate", "")
-                if gdelt_date:
-                    try:
-                        dt = datetime.strptime(gdelt_date, "%Y%m%dT%H%M%SZ")
-                        iso_date = dt.replace(tzinfo=timezone.utc).isoformat()
-                    except:
-                        pass
-                
-                article_doc = {
-                    "id": str(uuid.uuid4()),
-                    "position": 0,
-                    "title": title,
-                    "source": {"name": source_name or "Unknown", "icon": None},
-                    "link": link,
-                    "thumbnail": article.get("socialimage"),
-                    "thumbnail_small": article.get("socialimage"),
-                    "date": gdelt_date,
-                    "iso_date": iso_date,
-                    "queries": [query_text],
-                    "apiSource": "GDELT",
-                    "fetchedAt": datetime.now(timezone.utc).isoformat(),
-                    "isHidden": False,
-                    "relevanceScore": relevance["relevance_score"],
-                    "matchedKeywords": relevance.get("matched_keywords", [])
-                }
-                await db.news_articles.insert_one(article_doc)
-                global_seen_urls.add(normalized_link)
-                gdelt_new += 1
-                total_new_articles += 1
-        
-        logger.info(f"[GDELT] Query '{query_text}': {len(gdelt_articles)} found, {gdelt_new} new, {gdelt_existing_updated} existing, {gdelt_filtered} filtered")
+        # A new query is fetched in full, whatever marks a former query of
+        # the same text left behind
+        batches = await run_ingestion("singleQuery", NEWS_ADAPTERS, [query_text], incremental=False)
+        total_new_articles = sum(batch.counts["new"] for batch in batches)
+        total_filtered = sum(batch.counts["filtered"] for batch in batches)
         
         # Log fetch to news_fetch_logs
         log_entry = {
             "id": str(uuid.uuid4()),
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "queriesProcessed": 1,
-            "articlesFound": len(serpapi_articles) + len(gdelt_articles),
+            "articlesFound": sum(len(batch.results) for batch in batches),
             "newArticlesStored": total_new_articles,
             "filtered": total_filtered,
             "api": "SerpAPI+GDELT (New Query)",
@@ -1229,100 +1846,11 @@ async def fetch_mediastack_news():
             logger.info("[MediaStack] No active queries found")
             return
         
-        # Get existing URLs for duplicate detection
-        global_seen_urls = set()
-        existing_articles = await db.news_articles.find({}, {"link": 1, "_id": 0}).to_list(10000)
-        for article in existing_articles:
-            if article.get("link"):
-                global_seen_urls.add(normalize_url(article["link"]))
-        
-        total_new_articles = 0
-        total_filtered = 0
-        
-        for q in queries:
-            query_text = q["query"]
-            logger.info(f"[MediaStack] Processing query: '{query_text}'")
-            
-            mediastack_articles = await fetch_news_from_mediastack(query_text)
-            mediastack_new = 0
-            mediastack_existing_updated = 0
-            mediastack_filtered = 0
-            
-            for article in mediastack_articles:
-                link = article.get("url", "")
-                if not link:
-                    continue
-                
-                normalized_link = normalize_url(link)
-                
-                # Check if article already exists
-                existing = await db.news_articles.find_one({"link": link})
-                
-                if existing:
-                    # Add this query to existing article
-                    await db.news_articles.update_one(
-                        {"link": link},
-                        {"$addToSet": {"queries": query_text}}
-                    )
-                    mediastack_existing_updated += 1
-                else:
-                    # Check relevance before storing
-                    title = article.get("title", "")
-                    description = article.get("description", "")
-                    source_name = article.get("source", "")
-                    
-                    relevance = check_article_relevance(title, description, source_name)
-                    
-                    if not relevance["is_relevant"]:
-                        mediastack_filtered += 1
-                        total_filtered += 1
-                        continue
-                    
-                    # Parse MediaStack date format
-                    published_at = article.get("published_at", "")
-                    iso_date = published_at if published_at else None
-                    
-                    news_doc = {
-                        "id": str(uuid.uuid4()),
-                        "position": 0,
-                        "title": title,
-                        "source": {
-                            "name": source_name or "Unknown",
-                            "icon": None
-                        },
-                        "link": link,
-                        "thumbnail": article.get("image"),
-                        "thumbnail_small": article.get("image"),
-                        "date": published_at,
-                        "iso_date": iso_date,
-                        "queries": [query_text],
-                        "apiSource": "MediaStack",
-                        "fetchedAt": datetime.now(timezone.utc).isoformat(),
-                        "isHidden": False,
-                        "relevanceScore": relevance["relevance_score"],
-                        "matchedKeywords": relevance.get("matched_keywords", [])
-                    }
-                    
-                    await db.news_articles.insert_one(news_doc)
-                    global_seen_urls.add(normalized_link)
-                    mediastack_new += 1
-            
-            total_new_articles += mediastack_new
-            
-            # Log MediaStack fetch
-            mediastack_log = {
-                "id": str(uuid.uuid4()),
-                "api": "MediaStack",
-                "query": query_text,
-                "articlesFound": len(mediastack_articles),
-                "newArticles": mediastack_new,
-                "existingUpdated": mediastack_existing_updated,
-                "filtered": mediastack_filtered,
-                "status": "success" if mediastack_articles else "no_results",
-                "fetchedAt": datetime.now(timezone.utc).isoformat()
-            }
-            await db.news_fetch_logs.insert_one(mediastack_log)
-            logger.info(f"[MediaStack] Query '{query_text}': {len(mediastack_articles)} found, {mediastack_new} new, {mediastack_existing_updated} existing, {mediastack_filtered} filtered")
+        batches = await run_ingestion("mediastack", [mediastack_adapter], [q["query"] for q in queries])
+        if batches:
+            await db.news_fetch_logs.insert_many([provider_fetch_log(batch) for batch in batches])
+        total_new_articles = sum(batch.counts["new"] for batch in batches)
+        total_filtered = sum(batch.counts["filtered"] for batch in batches)
         
         logger.info("=" * 60)
         logger.info("[MediaStack] Weekly news fetch complete!")
@@ -1366,11 +1894,64 @@ async def lifespan(app: FastAPI):
     # MediaStack: Weekly on Monday at 2:30 AM UTC (8:00 AM IST)
     scheduler.add_job(fetch_mediastack_news, 'cron', day_of_week='mon', hour=2, minute=30, id='mediastack_weekly')
     
+    # Effective risk band: every 15 minutes, for articles leaving the recency window
+    scheduler.add_job(refresh_effective_risk, 'interval', minutes=15, id='risk_effective_refresh')
+    
     scheduler.start()
     logger.info("News scheduler started:")
     logger.info("  - News Fetch: 3x daily at 8:00 AM, 2:00 PM, 10:00 PM UTC")
     logger.info("  - Article Scraping: 3x daily at 9:00 AM, 3:00 PM, 11:00 PM UTC")
     logger.info("  - MediaStack: Weekly on Monday at 8:00 AM IST (2:30 AM UTC)")
+    logger.info("  - Effective Risk Refresh: every 15 minutes")
+    
+    # Compile the risk engine from the admin-editable trigger config
+    try:
+        await reload_risk_engine()
+    except Exception as e:
+        logger.error(f"[RiskEngine] Failed to load trigger config, using built-in triggers: {str(e)}")
+    
+    # Index used to find articles scored by an older engine version
+    await db.news_articles.create_index("riskEngineVersion")
+    # Inverted trigger-term index (multikey) for targeted re-scoring
+    await db.news_articles.create_index("riskTerms")
+    # Articles that will leave the recency window, and materialized band counts
+    await db.news_articles.create_index([("riskRecent", 1), ("riskPublishedAt", 1)])
+    await db.news_articles.create_index("effective_band")
+    # Category filters and counts test bits of the compact mask
+    await db.news_articles.create_index("risk_category_mask")
+    await backfill_category_fields()
+    # Persistent tier of the risk memo; entries of old engine versions age out
+    await db.analysis_cache.create_index("createdAt", expireAfterSeconds=ANALYSIS_CACHE_TTL_DAYS * 86400)
+    # Shadow comparisons are diagnostics only and age out
+    await db.risk_shadow_results.create_index("createdAt", expireAfterSeconds=SHADOW_RESULTS_TTL_DAYS * 86400)
+    await db.risk_shadow_results.create_index([("bandAgree", 1), ("createdAt", -1)])
+    await load_shadow_config()
+    
+    # Relevance keyword set and spam blocklist, if edited by an admin
+    try:
+        await reload_relevance_filter()
+    except Exception as e:
+        logger.error(f"[Relevance] Failed to load filter config, using built-in keywords: {str(e)}")
+    
+    # Relevance job listings are paginated by seq and age out
+    await db.relevance_job_results.create_index([("jobId", 1), ("seq", 1)])
+    await db.relevance_job_results.create_index("createdAt", expireAfterSeconds=RELEVANCE_JOB_RESULTS_TTL_DAYS * 86400)
+    await resume_relevance_jobs()
+    
+    # Ingestion upserts on normalizedLink; older articles are backfilled and merged first
+    await migrate_normalized_links()
+    await db.news_fetch_watermarks.create_index([("query", 1), ("provider", 1)], unique=True)
+    try:
+        await seen_links.load()
+    except Exception as e:
+        logger.error(f"[SeenLinks] Failed to load, every link counts as possibly seen: {str(e)}")
+    
+    # Resume a re-score job interrupted by the last shutdown
+    rescore_job = await db.risk_rescore_jobs.find_one({"id": RESCORE_JOB_ID, "status": "running"})
+    if rescore_job:
+        start_rescore_job()
+    
+    http_pool.start()
     
     # Run initial fetch on startup (only SerpAPI + GDELT, not MediaStack due to rate limits)
     await fetch_and_store_all_news()
@@ -1379,6 +1960,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     scheduler.shutdown()
+    risk_analyzer.shutdown()
+    shadow_analyzer.shutdown()
+    await http_pool.close()
     client.close()
 
 # Create the main app with lifespan
@@ -1916,6 +2500,45 @@ class RiskCategoryConfig(BaseModel):
     order: int = 0
     createdAt: Optional[str] = None
 
+class RiskScoringPolicyUpdate(BaseModel):
+    """Partial update of the risk scoring policy; omitted fields keep their value"""
+    bands: Optional[Dict[str, List[int]]] = None
+    strong_strength: Optional[int] = None
+    medium_strength: Optional[int] = None
+    medium_min_count: Optional[int] = None
+    high_severity_categories: Optional[List[str]] = None
+    medium_severity_categories: Optional[List[str]] = None
+    high_severity: Optional[int] = None
+    medium_severity: Optional[int] = None
+    base_severity: Optional[int] = None
+    no_category_severity: Optional[int] = None
+    horizon_scores: Optional[Dict[str, int]] = None
+    recency_bonus: Optional[int] = None
+    immediacy_cap: Optional[int] = None
+    component_weight: Optional[int] = None
+    procurement_weight: Optional[int] = None
+    capacity_weight: Optional[int] = None
+    procurement_cap: Optional[int] = None
+    official_specificity: Optional[int] = None
+    credible_specificity: Optional[int] = None
+    numbers_specificity: Optional[int] = None
+    generic_specificity: Optional[int] = None
+    context_gate_relevance: Optional[int] = None
+    context_gate_max_score: Optional[int] = None
+
+class RiskShadowConfigUpdate(BaseModel):
+    """Shadow evaluation settings; omitted fields keep their value"""
+    enabled: Optional[bool] = None
+    engine: Optional[str] = None  # rule_based, vectorized or ml
+    sampleRate: Optional[float] = None
+    triggerConfigs: Optional[List[dict]] = None  # rule_based only: candidate risk_category_configs
+    policy: Optional[Dict] = None  # rule_based only: scoring policy overrides
+
+class RelevanceFilterConfigUpdate(BaseModel):
+    """Relevance keyword set and spam blocklist; omitted fields keep their value"""
+    keywords: Optional[List[str]] = None
+    spamBlocklist: Optional[List[str]] = None
+
 # Product Model
 class ProductFeature(BaseModel):
     text: str
@@ -2906,6 +3529,7 @@ async def create_risk_category_config(input: RiskCategoryConfigCreate):
         createdAt=datetime.now(timezone.utc).isoformat()
     )
     await db.risk_category_configs.insert_one(config.model_dump())
+    await reload_risk_engine(rescore_affected=True)
     return config
 
 @api_router.put("/risk-categories/config/{category}", response_model=RiskCategoryConfig)
@@ -2922,6 +3546,7 @@ async def update_risk_category_config(category: str, input: RiskCategoryConfigUp
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Category not found")
     
+    await reload_risk_engine(rescore_affected=True)
     config = await db.risk_category_configs.find_one({"category": category}, {"_id": 0})
     return config
 
@@ -2931,6 +3556,7 @@ async def delete_risk_category_config(category: str):
     result = await db.risk_category_configs.delete_one({"category": category})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Category not found")
+    await reload_risk_engine(rescore_affected=True)
     return {"success": True}
 
 @api_router.post("/risk-categories/config/seed")
@@ -2947,8 +3573,111 @@ async def seed_risk_category_configs():
         )
         await db.risk_category_configs.insert_one(config.model_dump())
     
+    await reload_risk_engine(rescore_affected=True)
     return {"message": f"Seeded {len(DEFAULT_RISK_CATEGORIES)} risk categories", "seeded": True}
 
+@api_router.get("/risk-categories/engine")
+async def get_risk_engine_info():
+    """Get the version and trigger set of the active risk engine"""
+    return engine_registry.info()
+
+@api_router.post("/risk-categories/engine/reload")
+async def reload_risk_engine_endpoint():
+    """Force the risk engine to recompile from the stored category configs"""
+    version = await reload_risk_engine(rescore_affected=True)
+    return {"success": True, "version": version}
+
+@api_router.get("/risk-categories/policy")
+async def get_risk_scoring_policy():
+    """Get the scoring policy (weights, thresholds, band edges) of the active risk engine"""
+    policy = engine_registry.get().policy
+    return {"version": policy.version, "policy": policy.to_dict()}
+
+@api_router.put("/risk-categories/policy")
+async def update_risk_scoring_policy(input: RiskScoringPolicyUpdate):
+    """
+    Update the scoring policy.
+    
+    Articles are re-scored from their stored feature records, so no article
+    text is re-read for a policy-only change.
+    """
+    update_data = {k: v for k, v in input.model_dump().items() if v is not None}
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    if "bands" in update_data and any(len(edges) != 2 or edges[0] > edges[1] for edges in update_data["bands"].values()):
+        raise HTTPException(status_code=400, detail="Each band needs [low, high] edges with low <= high")
+    
+    policy = ScoringPolicy.from_dict({**engine_registry.get().policy.to_dict(), **update_data})
+    await db.risk_scoring_policy.replace_one(
+        {"id": SCORING_POLICY_ID},
+        {"id": SCORING_POLICY_ID, **policy.to_dict(), "updatedAt": datetime.now(timezone.utc).isoformat()},
+        upsert=True
+    )
+    version = await reload_risk_engine(rescore_affected=True)
+    return {"success": True, "version": version, "policy": policy.to_dict()}
+
+@api_router.delete("/risk-categories/policy")
+async def reset_risk_scoring_policy():
+    """Reset the scoring policy to the built-in defaults"""
+    await db.risk_scoring_policy.delete_one({"id": SCORING_POLICY_ID})
+    version = await reload_risk_engine(rescore_affected=True)
+    return {"success": True, "version": version}
+
+@api_router.get("/risk-shadow")
+async def get_risk_shadow():
+    """Get the shadow evaluation config and its latency/agreement telemetry"""
+    return {
+        "config": _shadow_config,
+        "running": _shadow_task is not None and not _shadow_task.done(),
+        "primaryVersion": engine_registry.version,
+        "stats": shadow_stats.to_dict(),
+        "storedResults": await db.risk_shadow_results.count_documents({})
+    }
+
+@api_router.put("/risk-shadow")
+async def update_risk_shadow(input: RiskShadowConfigUpdate):
+    """
+    Configure shadow evaluation of a candidate engine.
+    
+    Telemetry restarts whenever the configuration changes, so the stats
+    always describe one candidate.
+    """
+    update_data = {k: v for k, v in input.model_dump().items() if v is not None}
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    config = {"enabled": False, "engine": "vectorized", "sampleRate": 0.1, **(_shadow_config or {}), **update_data}
+    if config["engine"] not in ("rule_based", "vectorized", "ml"):
+        raise HTTPException(status_code=400, detail="engine must be rule_based, vectorized or ml")
+    if not 0 <= config["sampleRate"] <= 1:
+        raise HTTPException(status_code=400, detail="sampleRate must be between 0 and 1")
+    config["id"] = SHADOW_CONFIG_ID
+    config["updatedAt"] = datetime.now(timezone.utc).isoformat()
+    
+    # Fail now rather than on every sampled batch
+    try:
+        build_candidate_engine(shadow_engine_spec(config), engine_registry.get())
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    await db.risk_shadow_config.replace_one({"id": SHADOW_CONFIG_ID}, config, upsert=True)
+    await load_shadow_config()
+    shadow_stats.reset()
+    return {"success": True, "config": _shadow_config}
+
+@api_router.delete("/risk-shadow")
+async def disable_risk_shadow():
+    """Stop shadow evaluation and reset its telemetry (stored results age out)"""
+    await db.risk_shadow_config.update_one({"id": SHADOW_CONFIG_ID}, {"$set": {"enabled": False}})
+    await load_shadow_config()
+    shadow_stats.reset()
+    return {"success": True}
+
+@api_router.get("/risk-shadow/results", response_model=List[dict])
+async def get_risk_shadow_results(limit: int = 50, skip: int = 0, disagreements: bool = False):
+    """Get recent per-article shadow comparisons, optionally only band disagreements"""
+    query = {"bandAgree": False} if disagreements else {}
+    return await db.risk_shadow_results.find(query, {"_id": 0}).sort("createdAt", -1).skip(skip).limit(limit).to_list(limit)
+
 # =============================================
 # PRODUCTS ENDPOINTS
 # =============================================
@@ -3443,10 +4172,19 @@ class NewsFetchLog(BaseModel):
     errorMessage: Optional[str] = None
     fetchedAt: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Bookkeeping fields of stored articles (token memo, feature record, term
+# index, recency split, dedup key, versions) left out of API responses
+ARTICLE_INTERNAL_FIELDS = (
+    "textTokens", "riskFeatures", "riskFeaturesVersion", "riskTerms", "riskPublishedAt",
+    "riskRecent", "riskEngineVersion", "risk_category_mask", "category_strength_array",
+    "recent_risk_score", "recent_risk_band", "effective_score", "effective_band",
+    "normalizedLink", "relevanceVersion"
+)
+
 # News API Endpoints
 @api_router.get("/news", response_model=List[dict])
-async def get_news(limit: int = 50, skip: int = 0, query: Optional[str] = None):
-    """Get stored news articles with pagination"""
+async def get_news(limit: int = 50, skip: int = 0, query: Optional[str] = None, category: Optional[str] = None):
+    """Get stored news articles with pagination, optionally in one risk category"""
     # Filter out articles without valid links or content
     filter_query = {
         "isHidden": False,
@@ -3456,11 +4194,19 @@ async def get_news(limit: int = 50, skip: int = 0, query: Optional[str] = None):
     }
     if query:
         filter_query["query"] = query
+    if category:
+        filter_query.update(category_mask_filter(category))
     
-    articles = await db.news_articles.find(
-        filter_query, 
-        {"_id": 0}
-    ).sort("fetchedAt", -1).skip(skip).limit(limit).to_list(limit)
+    # risk_score/risk_band are returned as of now (see effective_risk_expressions)
+    pipeline = [
+        {"$match": filter_query},
+        {"$sort": {"fetchedAt": -1}},
+        {"$skip": skip},
+        {"$limit": limit},
+        {"$addFields": effective_risk_expressions()},
+        {"$project": {"_id": 0, **{field: 0 for field in ARTICLE_INTERNAL_FIELDS}}}
+    ]
+    articles = await db.news_articles.aggregate(pipeline).to_list(limit)
     
     return articles
 
@@ -3506,10 +4252,10 @@ async def get_news_stats():
     risk_results = await db.news_articles.aggregate(risk_pipeline).to_list(50)
     risk_categories = {item["_id"]: item["count"] for item in risk_results if item["_id"]}
     
-    # Counts by risk band
+    # Counts by risk band, as of now
     band_pipeline = [
         {"$match": {**base_filter, "risk_band": {"$exists": True}}},
-        {"$group": {"_id": "$risk_band", "count": {"$sum": 1}}},
+        {"$group": {"_id": effective_risk_expressions()["risk_band"], "count": {"$sum": 1}}},
         {"$sort": {"_id": 1}}
     ]
     band_results = await db.news_articles.aggregate(band_pipeline).to_list(10)
@@ -3584,6 +4330,7 @@ async def delete_news_query(query_id: str):
         {"queries": query_name},
         {"$pull": {"queries": query_name}}
     )
+    await forget_fetch_watermarks(query_name)
     
     logger.info(f"[Queries] Deleted query '{query_name}' and removed tag from {tag_removal.modified_count} articles")
     
@@ -3605,6 +4352,8 @@ async def remove_tag_from_articles(tag_name: str):
         {"queries": tag_name},
         {"$pull": {"queries": tag_name}}
     )
+    # Articles fetched under the tag must be fetched (and tagged) again
+    await forget_fetch_watermarks(tag_name)
     
     logger.info(f"[Tags] Removed tag '{tag_name}' from {result.modified_count} articles")
     return {
@@ -3717,12 +4466,14 @@ async def trigger_risk_analysis(limit: int = 100, force: bool = False):
     """Manually trigger risk analysis for articles missing risk data"""
     try:
         if force:
-            # Reset risk data for all articles to re-analyze
-            result = await db.news_articles.update_many(
-                {},
-                {"$unset": {"risk_score": "", "risk_band": "", "risk_categories": "", "confidence": "", "time_horizon": "", "category_strength": "", "riskAnalyzedAt": ""}}
-            )
-            logger.info(f"[RiskEngine] Force mode: Reset risk data for {result.modified_count} articles")
+            # Re-score every article not scored by the active engine version in the
+            # background; existing scores stay visible until replaced
+            started = start_rescore_job()
+            return {
+                "success": True,
+                "message": "Re-score job started" if started else "Re-score job already running",
+                "version": engine_registry.version
+            }
         
         # Run risk analysis
         analyzed_count = await compute_risk_for_unanalyzed_articles(limit=limit)
@@ -3792,6 +4543,67 @@ async def trigger_risk_computation(limit: int = 500):
     asyncio.create_task(compute_risk_for_unanalyzed_articles(limit=limit))
     return {"success": True, "message": f"Risk computation started for up to {limit} articles"}
 
+@api_router.post("/news/rescore")
+async def trigger_rescore():
+    """Start (or resume) re-scoring of articles with a stale engine version"""
+    started = start_rescore_job()
+    return {"success": True, "started": started, "version": engine_registry.version}
+
+@api_router.get("/news/rescore-status", response_model=dict)
+async def get_rescore_status():
+    """Get progress of the background re-score job"""
+    job = await db.risk_rescore_jobs.find_one({"id": RESCORE_JOB_ID}, {"_id": 0, "lastId": 0})
+    version = engine_registry.version
+    targeted = await db.risk_rescore_jobs.find_one({"id": TARGETED_RESCORE_JOB_ID}, {"_id": 0})
+    if targeted:
+        targeted["running"] = _targeted_rescore_task is not None and not _targeted_rescore_task.done()
+    if not job:
+        return {"status": "idle", "version": version, "done": 0, "total": 0, "lastTargeted": targeted}
+    
+    done = job.get("done", 0)
+    total = job.get("total", 0)
+    rate = job.get("rate") or 0
+    remaining = max(total - done, 0)
+    return {
+        **job,
+        "activeVersion": version,
+        "running": _rescore_task is not None and not _rescore_task.done(),
+        "progress": round(done / total * 100, 1) if total > 0 else 100.0,
+        "etaSeconds": round(remaining / rate) if rate > 0 and job.get("status") == "running" else None,
+        "stale": await db.news_articles.count_documents({"riskEngineVersion": {"$ne": version}}),
+        "lastTargeted": targeted
+    }
+
+@api_router.get("/news/analysis-cache", response_model=dict)
+async def get_analysis_cache_stats():
+    """Get hit/miss counters of the risk and relevance memo, overall and for the last runs"""
+    return {
+        "risk": risk_cache.stats(),
+        "relevance": relevance_cache.stats(),
+        "lastRuns": analysis_cache_runs
+    }
+
+@api_router.get("/news/http-pool", response_model=dict)
+async def get_http_pool_stats():
+    """Get pool utilization, connection reuse and DNS cache counters of the shared HTTP client"""
+    return http_pool.metrics()
+
+@api_router.get("/news/seen-links", response_model=dict)
+async def get_seen_links_stats():
+    """Get size, fill and hit counters of the seen-link Bloom filter used by ingestion"""
+    return seen_links.stats()
+
+@api_router.get("/news/ingestion-pipeline", response_model=dict)
+async def get_ingestion_pipeline_stats():
+    """Get per-stage latency and throughput of the last run of each ingestion kind"""
+    return {
+        "providers": {adapter.name: adapter.limits() for adapter in NEWS_ADAPTERS + [mediastack_adapter]},
+        "queueSize": INGESTION_QUEUE_SIZE,
+        "incrementalFetch": INCREMENTAL_FETCH,
+        "watermarks": await db.news_fetch_watermarks.count_documents({}),
+        "lastRuns": ingestion_runs
+    }
+
 @api_router.get("/news/risk-stats", response_model=dict)
 async def get_risk_stats():
     """Get risk analysis statistics"""
@@ -3799,11 +4611,11 @@ async def get_risk_stats():
     analyzed = await db.news_articles.count_documents({"risk_score": {"$exists": True}})
     unanalyzed = total - analyzed
     
-    # Count by risk band
-    low = await db.news_articles.count_documents({"risk_band": "LOW"})
-    watch = await db.news_articles.count_documents({"risk_band": "WATCH"})
-    high = await db.news_articles.count_documents({"risk_band": "HIGH"})
-    critical = await db.news_articles.count_documents({"risk_band": "CRITICAL"})
+    # Count by materialized effective band
+    low = await db.news_articles.count_documents({"effective_band": "LOW"})
+    watch = await db.news_articles.count_documents({"effective_band": "WATCH"})
+    high = await db.news_articles.count_documents({"effective_band": "HIGH"})
+    critical = await db.news_articles.count_documents({"effective_band": "CRITICAL"})
     
     return {
         "total": total,
@@ -3821,14 +4633,24 @@ async def get_risk_stats():
 @api_router.get("/news/risk-categories")
 async def get_risk_category_counts():
     """Get counts of articles per risk category"""
-    results = []
-    
-    for category in RISK_CATEGORIES:
-        count = await db.news_articles.count_documents({
-            "risk_categories": category
-        })
-        if count > 0:
-            results.append({"category": category, "count": count})
+    # One pass over articles with any category bit set; each category's
+    # count is the sum of its bit
+    pipeline = [
+        {"$match": {"risk_category_mask": {"$gt": 0}}},
+        {"$group": {
+            "_id": None,
+            **{
+                category: {"$sum": {"$mod": [{"$floor": {"$divide": ["$risk_category_mask", 1 << slot]}}, 2]}}
+                for category, slot in CATEGORY_SLOTS.items()
+            }
+        }}
+    ]
+    counts = await db.news_articles.aggregate(pipeline).to_list(1)
+    results = [
+        {"category": category, "count": int(count)}
+        for category, count in (counts[0] if counts else {}).items()
+        if category != "_id" and count > 0
+    ]
     
     # Sort by count descending
     results.sort(key=lambda x: x["count"], reverse=True)
@@ -3901,96 +4723,258 @@ async def check_article_relevance_endpoint(title: str, snippet: str = "", source
     result = check_article_relevance(title, snippet, source)
     return result
 
-@api_router.post("/news/cleanup-irrelevant")
-async def cleanup_irrelevant_articles(dry_run: bool = True):
-    """
-    Find and optionally remove irrelevant articles from the database.
-    Set dry_run=False to actually delete articles.
+# Batch relevance screening: items per scoring step, largest accepted item,
+# and result bytes held in memory before the spool moves to disk
+RELEVANCE_BATCH_CHUNK = 1000
+RELEVANCE_BATCH_MAX_ITEM_BYTES = 64 * 1024
+RELEVANCE_BATCH_SPOOL_BYTES = 4 * 1024 * 1024
+
+async def iter_json_objects(chunks, max_item_bytes: int = RELEVANCE_BATCH_MAX_ITEM_BYTES):
     """
-    # Find articles that fail relevance check
-    all_articles = await db.news_articles.find(
-        {},
-        {"_id": 0, "id": 1, "title": 1, "link": 1, "source": 1}
-    ).to_list(10000)
+    Decode the objects of a JSON array or NDJSON body as its chunks arrive.
     
-    irrelevant_articles = []
-    for article in all_articles:
-        title = article.get("title", "")
-        source_name = article.get("source", {}).get("name", "") if isinstance(article.get("source"), dict) else ""
-        
-        relevance = check_article_relevance(title, "", source_name)
-        
-        if not relevance["is_relevant"]:
-            irrelevant_articles.append({
-                "id": article.get("id"),
-                "title": title[:80] + "..." if len(title) > 80 else title,
-                "link": article.get("link", "")[:60] + "..." if len(article.get("link", "")) > 60 else article.get("link", ""),
-                "reason": relevance["reason"]
-            })
+    Commas, brackets and whitespace between objects are skipped, so both
+    formats need only one object in memory at a time. Raises ValueError on
+    anything else, or on an object larger than max_item_bytes.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += utf8.decode(chunk)
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+                pos += 1
+            if pos == len(buffer):
+                break
+            if buffer[pos] != "{":
+                raise ValueError(f"expected a JSON object, found {buffer[pos:pos + 20]!r}")
+            try:
+                obj, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # incomplete object; wait for more data
+            yield obj
+        buffer = buffer[pos:]
+        if len(buffer) > max_item_bytes:
+            raise ValueError(f"object larger than {max_item_bytes} bytes")
+    buffer += utf8.decode(b"", final=True)
+    if buffer.strip(" \t\r\n,[]"):
+        raise ValueError("truncated JSON object at end of body")
+
+def score_relevance_items(matcher: RelevanceFilter, items: List[dict], start: int, out) -> tuple:
+    """
+    Score one chunk of batch items and write their NDJSON result lines to out.
     
-    if not dry_run and irrelevant_articles:
-        # Delete irrelevant articles
-        ids_to_delete = [a["id"] for a in irrelevant_articles]
-        result = await db.news_articles.delete_many({"id": {"$in": ids_to_delete}})
-        
-        # Log the cleanup
-        cleanup_log = {
-            "id": str(uuid.uuid4()),
-            "action": "cleanup_irrelevant",
-            "deletedCount": result.deleted_count,
-            "articles": irrelevant_articles[:20],  # Store first 20 for reference
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        }
-        await db.news_fetch_logs.insert_one(cleanup_log)
-        
-        return {
-            "success": True,
-            "dryRun": False,
-            "deletedCount": result.deleted_count,
-            "deletedArticles": irrelevant_articles
-        }
+    Items without a string title get an error line instead. Returns the
+    number of (relevant, invalid) items.
+    """
+    valid, inputs = [], []
+    for item in items:
+        source = item.get("source") or ""
+        if isinstance(source, dict):
+            source = source.get("name") or ""
+        snippet = item.get("snippet") or item.get("description") or ""
+        if isinstance(item.get("title"), str) and isinstance(source, str) and isinstance(snippet, str):
+            valid.append(True)
+            inputs.append((item["title"], snippet, source))
+        else:
+            valid.append(False)
+    results = iter(matcher.check_batch(inputs))
+    relevant = invalid = 0
+    lines = []
+    for offset, (item, ok) in enumerate(zip(items, valid)):
+        line = {"index": start + offset, "id": item.get("id")}
+        if ok:
+            result = next(results)
+            relevant += result["is_relevant"]
+            line.update(result)
+        else:
+            invalid += 1
+            line["error"] = "title, snippet and source must be strings"
+        lines.append(json.dumps(line))
+    out.write(("\n".join(lines) + "\n").encode("utf-8"))
+    return relevant, invalid
+
+def iter_spool(spool, block_size: int = 64 * 1024):
+    """Stream a spooled response body from the start, closing it at the end"""
+    try:
+        spool.seek(0)
+        while True:
+            block = spool.read(block_size)
+            if not block:
+                break
+            yield block
+    finally:
+        spool.close()
+
+@api_router.post("/news/check-relevance/batch")
+async def check_article_relevance_batch(request: Request):
+    """
+    Pre-screen many headlines with the relevance filter.
+    
+    The body is a JSON array or NDJSON stream of {"title", "snippet",
+    "source", "id"} objects (only title is required). Items are decoded and
+    scored RELEVANCE_BATCH_CHUNK at a time as the body arrives; the response
+    is NDJSON, one line per item in input order ({"index", "id", and the
+    check-relevance fields, or "error"}), then a {"summary": ...} line.
+    
+    The response is deferred, not incremental: no result line is sent before
+    the whole body has been read. Result lines are spooled (to disk past
+    RELEVANCE_BATCH_SPOOL_BYTES) meanwhile and then streamed back, so memory
+    stays bounded for any number of items and HTTP/1.1 clients that send the
+    full request before reading the response cannot deadlock. (Interleaving
+    is not offered at all: StreamingResponse reads the request channel to
+    watch for disconnects, which would swallow the rest of the body.)
+    """
+    matcher = relevance_filter  # one keyword set for the whole request
+    spool = tempfile.SpooledTemporaryFile(max_size=RELEVANCE_BATCH_SPOOL_BYTES)
+    counts = {"relevant": 0, "invalid": 0}
+    count = 0
+    
+    async def score_chunk(chunk: List[dict]):
+        relevant, invalid = await asyncio.to_thread(score_relevance_items, matcher, chunk, count, spool)
+        counts["relevant"] += relevant
+        counts["invalid"] += invalid
+    
+    start_time = time.perf_counter()
+    chunk = []
+    try:
+        async for item in iter_json_objects(request.stream()):
+            chunk.append(item)
+            if len(chunk) >= RELEVANCE_BATCH_CHUNK:
+                await score_chunk(chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            await score_chunk(chunk)
+            count += len(chunk)
+    except ValueError as e:
+        spool.close()
+        raise HTTPException(status_code=400, detail=f"Invalid body after {count + len(chunk)} items: {str(e)}")
+    except BaseException:
+        spool.close()
+        raise
+    
+    summary = {
+        "items": count,
+        "relevant": counts["relevant"],
+        "filtered": count - counts["relevant"] - counts["invalid"],
+        "invalid": counts["invalid"],
+        "version": matcher.version,
+        "seconds": round(time.perf_counter() - start_time, 3),
+    }
+    spool.write((json.dumps({"summary": summary}) + "\n").encode("utf-8"))
+    return StreamingResponse(iter_spool(spool), media_type="application/x-ndjson")
+
+@api_router.get("/news/relevance-filter")
+async def get_relevance_filter():
+    """Get the version, keyword set and spam blocklist of the active relevance filter"""
+    return relevance_filter.info()
+
+@api_router.put("/news/relevance-filter")
+async def update_relevance_filter(input: RelevanceFilterConfigUpdate):
+    """
+    Replace the relevance keyword set and/or spam blocklist.
     
+    The compiled filter is swapped in immediately; stored relevance scores are
+    not recomputed (use /news/apply-relevance-scores?rescore=true).
+    """
+    update_data = {k: normalize_keywords(v) for k, v in input.model_dump().items() if v is not None}
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    if "keywords" in update_data and not update_data["keywords"]:
+        raise HTTPException(status_code=400, detail="keywords must not be empty")
+    update_data["updatedAt"] = datetime.now(timezone.utc).isoformat()
+    await db.relevance_filter_config.update_one(
+        {"id": RELEVANCE_CONFIG_ID}, {"$set": update_data}, upsert=True
+    )
+    await reload_relevance_filter()
+    return {"success": True, **relevance_filter.info()}
+
+@api_router.delete("/news/relevance-filter")
+async def reset_relevance_filter():
+    """Reset the relevance keyword set and spam blocklist to the built-in defaults"""
+    await db.relevance_filter_config.delete_one({"id": RELEVANCE_CONFIG_ID})
+    version = await reload_relevance_filter()
+    return {"success": True, "version": version}
+
+@api_router.post("/news/cleanup-irrelevant")
+async def cleanup_irrelevant_articles(dry_run: bool = True):
+    """
+    Start a background job that finds and optionally removes irrelevant articles.
+    Set dry_run=False to actually delete articles. Follow it with
+    /news/relevance-jobs/{job_id} and list the articles with .../results.
+    """
+    job_id, started = await start_relevance_job("cleanup", dry_run)
+    return {"success": True, "jobId": job_id, "started": started, "dryRun": dry_run}
+
+@api_router.post("/news/apply-relevance-scores")
+async def apply_relevance_scores_to_existing(dry_run: bool = False, rescore: bool = False):
+    """
+    Start a background job that applies relevance scores to existing articles
+    that don't have them. With rescore, every article not scored by the
+    current keyword set is recomputed, e.g. after a relevance filter edit.
+    With dry_run, the scores are only listed.
+    """
+    job_id, started = await start_relevance_job("rescore" if rescore else "apply", dry_run)
+    return {"success": True, "jobId": job_id, "started": started, "dryRun": dry_run}
+
+@api_router.get("/news/relevance-jobs", response_model=List[dict])
+async def get_relevance_jobs(limit: int = 20):
+    """Get the most recent cleanup/apply relevance jobs"""
+    return await db.relevance_jobs.find({}, {"_id": 0, "lastId": 0}).sort("startedAt", -1).limit(limit).to_list(limit)
+
+@api_router.get("/news/relevance-jobs/{job_id}", response_model=dict)
+async def get_relevance_job(job_id: str):
+    """Get progress of a relevance job"""
+    job = await db.relevance_jobs.find_one({"id": job_id}, {"_id": 0, "lastId": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    scanned = job.get("scanned", 0)
+    total = job.get("total", 0)
+    rate = job.get("rate") or 0
+    task = _relevance_tasks.get(job["kind"])
     return {
-        "success": True,
-        "dryRun": True,
-        "irrelevantCount": len(irrelevant_articles),
-        "irrelevantArticles": irrelevant_articles
+        **job,
+        "running": job["status"] == "running" and task is not None and not task.done(),
+        "progress": round(scanned / total * 100, 1) if total > 0 else 100.0,
+        "etaSeconds": round(max(total - scanned, 0) / rate) if rate > 0 and job["status"] == "running" else None
     }
 
-@api_router.post("/news/apply-relevance-scores")
-async def apply_relevance_scores_to_existing():
-    """Apply relevance scores to existing articles that don't have them"""
-    # Find articles without relevance score
-    articles = await db.news_articles.find(
-        {"relevanceScore": {"$exists": False}},
-        {"_id": 0, "id": 1, "title": 1, "source": 1}
-    ).to_list(10000)
-    
-    if not articles:
-        return {"success": True, "message": "All articles already have relevance scores", "updated": 0}
-    
-    updated_count = 0
-    for article in articles:
-        title = article.get("title", "")
-        source_name = article.get("source", {}).get("name", "") if isinstance(article.get("source"), dict) else ""
-        
-        relevance = check_article_relevance(title, "", source_name)
-        
-        await db.news_articles.update_one(
-            {"id": article["id"]},
-            {"$set": {
-                "relevanceScore": relevance["relevance_score"],
-                "matchedKeywords": relevance.get("matched_keywords", [])
-            }}
-        )
-        updated_count += 1
-    
+@api_router.get("/news/relevance-jobs/{job_id}/results", response_model=dict)
+async def get_relevance_job_results(job_id: str, limit: int = 100, skip: int = 0):
+    """
+    Get a page of the articles a relevance job listed: irrelevant articles of
+    a cleanup, or the computed scores of a dry run. Live apply/rescore jobs
+    list nothing.
+    """
+    limit = max(1, min(limit, 1000))
+    job = await db.relevance_jobs.find_one({"id": job_id}, {"_id": 0, "kind": 1, "dryRun": 1, "matched": 1})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    results = await db.relevance_job_results.find(
+        {"jobId": job_id, "seq": {"$gte": skip}}, {"_id": 0, "jobId": 0, "createdAt": 0}
+    ).sort("seq", 1).limit(limit).to_list(limit)
     return {
-        "success": True,
-        "message": f"Applied relevance scores to {updated_count} articles",
-        "updated": updated_count
+        "total": job.get("matched", 0) if relevance_job_lists_articles(job["kind"], job["dryRun"]) else 0,
+        "skip": skip,
+        "limit": limit,
+        "results": results
     }
 
+@api_router.post("/news/relevance-jobs/{job_id}/cancel")
+async def cancel_relevance_job(job_id: str):
+    """Stop a running relevance job; batches already written stay applied"""
+    job = await db.relevance_jobs.find_one({"id": job_id}, {"_id": 0, "kind": 1, "status": 1})
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    task = _relevance_tasks.get(job["kind"])
+    if job["status"] != "running" or task is None or task.done():
+        return {"success": False, "status": job["status"]}
+    task.cancel()
+    return {"success": True}
+
 
 class AdminLoginRequest(BaseModel):
     password: str
@@ -0,0 +1,198 @@
+"""
+Text Normalization
+
+One normalized form of an article's text, shared by the relevance filter and
+the risk engines so each scorer does not build its own copy:
+
+    - title, body and source name, lowercased (phrase matching is plain
+      case-insensitive substring matching, so nothing else is folded)
+    - tokens: the distinct whitespace-separated words, which the word-level
+      scanners (VectorizedRiskEngine, RelevanceFilter.scan_batch) match
+
+For risk analysis the body is the article content after the text budget; for
+the relevance check it is the feed snippet.
+
+Splitting a long page into its distinct words costs far more than
+lowercasing it, so the token set of an article's risk text is stored on the
+article (textTokens, see token_fields). The record is keyed by the
+normalization version, the text budget and a checksum of the inputs, and is
+ignored once any of them changes.
+
+Only the word-level scanners reuse that record. RuleBasedRiskEngine matches
+phrases as substrings of the whole normalized text, which the token set
+cannot stand in for, so it still lowercases the (budgeted) fullContent on
+every text scan; its re-analysis is avoided by the stored feature record
+(riskFeatures) and the content-keyed analysis cache instead.
+"""
+
+import os
+import zlib
+from typing import FrozenSet, Optional, Tuple
+
+# Bump when the normalized form changes, to invalidate stored token records
+NORMALIZATION_VERSION = 1
+
+
+def article_inputs(article: dict) -> Tuple[str, str, str]:
+    """
+    The article text analysis depends on: (title, content, source name).
+
+    Two articles with the same inputs (up to case) get the same analysis,
+    apart from published_at.
+    """
+    # Build text from available fields
+    title = article.get("title", "") or ""
+    content = article.get("fullContent") or article.get("summary") or ""
+
+    # Get source name
+    source = article.get("source", {})
+    if isinstance(source, dict):
+        source_name = source.get("name", "") or ""
+    else:
+        source_name = str(source) if source else ""
+    return title, content, source_name
+
+
+# Content characters analyzed per article; 0 analyzes everything
+DEFAULT_TEXT_BUDGET = int(os.environ.get("RISK_TEXT_BUDGET", "0"))
+
+# Share of the budget spent on the lead; the rest is split into tail windows
+TEXT_BUDGET_LEAD_SHARE = 0.6
+TEXT_BUDGET_TAIL_WINDOWS = 4
+
+# Joins the sampled parts. No trigger phrase or feature pattern matches
+# across it, so sampling never creates a hit the full text lacks.
+TEXT_BUDGET_SEPARATOR = " \u2026 "
+
+
+def _last_break(text: str, start: int, end: int) -> int:
+    """Position of the last whitespace in text[start:end], or end (a hard cut) if there is none"""
+    position = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+    return position if position > start else end
+
+
+def _next_break(text: str, start: int, end: int) -> int:
+    """Position of the first whitespace in text[start:end], or start (a hard cut) if there is none"""
+    breaks = [p for p in (text.find(" ", start, end), text.find("\n", start, end)) if p >= 0]
+    return min(breaks, default=start)
+
+
+def apply_text_budget(content: str, budget: int) -> Tuple[str, bool]:
+    """
+    Bound the content analyzed to about `budget` characters.
+
+    Keeps the lead (cut at a paragraph break where possible) and samples
+    evenly spaced windows from the rest, so a very long page costs no more
+    than `budget` characters. Parts are cut at whitespace, so no word is
+    split into a fragment that matches something the word does not; text
+    without whitespace in reach (CJK, encoded blobs) is cut at the part
+    bounds instead. The title is never part of the budget.
+
+    Returns:
+        (content to analyze, whether it was truncated)
+    """
+    if budget <= 0 or len(content) <= budget:
+        return content, False
+
+    lead_limit = int(budget * TEXT_BUDGET_LEAD_SHARE)
+    lead_end = content.rfind("\n", lead_limit // 2, lead_limit)
+    if lead_end < 0:
+        lead_end = _last_break(content, 0, lead_limit)
+    parts = [content[:lead_end]]
+
+    window = (budget - lead_end) // TEXT_BUDGET_TAIL_WINDOWS
+    step = (len(content) - lead_end) // TEXT_BUDGET_TAIL_WINDOWS
+    for i in range(1, TEXT_BUDGET_TAIL_WINDOWS + 1):
+        if i == TEXT_BUDGET_TAIL_WINDOWS:
+            end = len(content)
+        else:
+            end = _last_break(content, lead_end, lead_end + step * i)
+        start = _next_break(content, max(lead_end, end - window), end)
+        parts.append(content[start:end])
+    return TEXT_BUDGET_SEPARATOR.join(part.strip() for part in parts if part.strip()), True
+
+
+class NormalizedText:
+    """Lowercased text fields of one article; token sets are built on first use"""
+
+    __slots__ = ("title", "body", "source", "truncated", "_stored_tokens",
+                 "_title_tokens", "_body_tokens", "_tokens")
+
+    def __init__(self, title: str, body: str, source: str, truncated: bool = False,
+                 stored_tokens: Optional[str] = None):
+        self.title = title
+        self.body = body
+        self.source = source
+        self.truncated = truncated
+        self._stored_tokens = stored_tokens
+        self._title_tokens: Optional[FrozenSet[str]] = None
+        self._body_tokens: Optional[FrozenSet[str]] = None
+        self._tokens: Optional[FrozenSet[str]] = None
+
+    @property
+    def text(self) -> str:
+        """Title and body, as the risk engines scan them"""
+        return f"{self.title} {self.body}"
+
+    @property
+    def title_tokens(self) -> FrozenSet[str]:
+        if self._title_tokens is None:
+            self._title_tokens = frozenset(self.title.split())
+        return self._title_tokens
+
+    @property
+    def body_tokens(self) -> FrozenSet[str]:
+        if self._body_tokens is None:
+            self._body_tokens = frozenset(self.body.split())
+        return self._body_tokens
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        """Distinct words of title + body (the words of self.text)"""
+        if self._tokens is None:
+            if self._stored_tokens is not None:
+                self._tokens = frozenset(self._stored_tokens.split())
+            else:
+                self._tokens = self.title_tokens | self.body_tokens
+        return self._tokens
+
+
+def normalize_fields(title: str, body: str = "", source: str = "", truncated: bool = False) -> NormalizedText:
+    """Normalized form of loose text fields (e.g. a feed title and snippet)"""
+    return NormalizedText((title or "").lower(), (body or "").lower(), (source or "").lower(), truncated)
+
+
+def token_key(title: str, content: str, text_budget: int) -> str:
+    """Identifies the token set of an article's risk text"""
+    checksum = zlib.crc32(content.encode("utf-8"), zlib.crc32(title.encode("utf-8")))
+    return f"{NORMALIZATION_VERSION}:{text_budget}:{len(title)}:{len(content)}:{checksum:08x}"
+
+
+def _stored_tokens(article: dict, title: str, content: str, text_budget: int) -> Optional[str]:
+    """The article's textTokens string, if the record matches its current inputs"""
+    stored = article.get("textTokens")
+    if isinstance(stored, dict) and stored.get("key") == token_key(title, content, text_budget):
+        return stored.get("tokens")
+    return None
+
+
+def normalize_article(article: dict, text_budget: int = 0) -> NormalizedText:
+    """
+    Normalized risk text of an article: title, content after the text
+    budget, and source name. A current stored textTokens record is reused
+    instead of splitting the text again.
+    """
+    title, content, source_name = article_inputs(article)
+    stored_tokens = _stored_tokens(article, title, content, text_budget)
+    budgeted, truncated = apply_text_budget(content, text_budget)
+    return NormalizedText(title.lower(), budgeted.lower(), source_name.lower(), truncated, stored_tokens)
+
+
+def token_fields(article: dict, text_budget: int = 0) -> dict:
+    """$set payload caching an article's token set, or {} if the stored one is current"""
+    title, content, _ = article_inputs(article)
+    if _stored_tokens(article, title, content, text_budget) is not None:
+        return {}
+    budgeted, _ = apply_text_budget(content, text_budget)
+    tokens = normalize_fields(title, budgeted).tokens
+    return {"textTokens": {"key": token_key(title, content, text_budget), "tokens": " ".join(sorted(tokens))}}
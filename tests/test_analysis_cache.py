@@ -0,0 +1,84 @@
+import asyncio
+
+from analysis_cache import AnalysisCache, content_key
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for AnalysisCache: find by _id $in, bulk upserts"""
+
+    def __init__(self, docs=None, fail=False):
+        self.docs = dict(docs or {})
+        self.fail = fail
+        self.finds = 0
+
+    def find(self, query, projection=None):
+        self.finds += 1
+        if self.fail:
+            raise RuntimeError("store down")
+        keys = query["_id"]["$in"]
+        docs = [{"_id": key, "result": self.docs[key]["result"]} for key in keys if key in self.docs]
+
+        async def cursor():
+            for doc in docs:
+                yield doc
+        return cursor()
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise RuntimeError("store down")
+        for operation in operations:
+            doc = operation._doc["$setOnInsert"]
+            self.docs.setdefault(operation._filter["_id"], doc)
+
+
+def test_content_key_case_folds_but_keeps_whitespace_and_version():
+    assert content_key("risk", "v1", "Chip Shortage", None) == content_key("risk", "v1", "chip shortage", "")
+    assert content_key("risk", "v1", "chip shortage") != content_key("risk", "v1", "chip  shortage")
+    assert content_key("risk", "v1", "a") != content_key("risk", "v2", "a")
+    assert content_key("risk", "v1", "a") != content_key("relevance", "v1", "a")
+    # Part boundaries are part of the key
+    assert content_key("risk", "v1", "ab", "c") != content_key("risk", "v1", "a", "bc")
+
+
+def test_lru_evicts_least_recently_used():
+    cache = AnalysisCache("risk", maxsize=2)
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    assert cache.get("a") == {"n": 1}
+    cache.put("c", {"n": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_get_many_counts_memory_store_and_misses():
+    store = FakeCollection({"s": {"result": {"n": "store"}}})
+    cache = AnalysisCache("risk", collection=store)
+    cache.put("m", {"n": "memory"})
+    before = cache.snapshot()
+
+    found = asyncio.run(cache.get_many(["m", "s", "x", "m"]))
+
+    assert found == {"m": {"n": "memory"}, "s": {"n": "store"}}
+    delta = cache.delta(before)
+    assert (delta["memoryHits"], delta["storeHits"], delta["misses"]) == (1, 1, 1)
+    assert delta["hitRate"] == 66.7
+    # Store hits are promoted to memory
+    assert cache.get("s") == {"n": "store"}
+
+
+def test_put_many_writes_through_without_overwriting():
+    store = FakeCollection({"k": {"result": {"n": "old"}}})
+    cache = AnalysisCache("risk", collection=store)
+    asyncio.run(cache.put_many({"k": {"n": "new"}, "j": {"n": 1}}))
+    assert store.docs["k"]["result"] == {"n": "old"}
+    assert store.docs["j"]["result"] == {"n": 1}
+    assert store.docs["j"]["kind"] == "risk"
+
+
+def test_store_errors_are_misses():
+    cache = AnalysisCache("risk", collection=FakeCollection(fail=True))
+    assert asyncio.run(cache.get_many(["a"])) == {}
+    asyncio.run(cache.put_many({"a": {"n": 1}}))
+    assert cache.get("a") == {"n": 1}
+    assert cache.stats()["misses"] == 1
@@ -0,0 +1,227 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlparse
+
+from pymongo.errors import BulkWriteError
+
+from news_ingestion import WATERMARK_OVERLAP, GdeltAdapter, IngestionPipeline, ProviderBatch
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _results(query, count, start=START):
+    """GDELT results published an hour apart from `start`"""
+    return [
+        {"url": f"https://news.example.com/{query}/{i}", "title": f"Chip shortage {query} {i}",
+         "domain": "example.com", "seendate": (start + timedelta(hours=i)).strftime("%Y%m%dT%H%M%SZ")}
+        for i in range(count)
+    ]
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        if isinstance(self.data, Exception):
+            raise self.data
+
+    def json(self):
+        return self.data
+
+
+class FakePool:
+    """Serves canned GDELT responses by query and records the requested URLs"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.urls = []
+
+    async def get(self, url, profile=None, headers=None):
+        self.urls.append(url)
+        query = parse_qs(urlparse(url).query)["query"][0]
+        return FakeResponse(self.responses.get(query, {"articles": []}))
+
+
+class FakeSink:
+    """Stores written links and watermarks like write_news_batch; fails for `fail_queries`"""
+
+    def __init__(self, fail_queries=()):
+        self.fail_queries = set(fail_queries)
+        self.links = []
+        self.watermarks = {}
+
+    async def __call__(self, batch):
+        if batch.query in self.fail_queries:
+            raise RuntimeError("write failed")
+        self.links.extend(document["normalizedLink"] for document in batch.relevant)
+        batch.counts = {"new": len(batch.relevant)}
+        if batch.watermark is not None:
+            self.watermarks[(batch.query, batch.provider)] = batch.watermark
+
+
+def relevant(title, snippet, source):
+    return {"is_relevant": True, "relevance_score": 1, "matched_keywords": [], "reason": ""}
+
+
+def _run(responses, queries, sink=None, relevance=relevant, watermarks=None):
+    pool = FakePool(responses)
+    pipeline = IngestionPipeline(
+        [GdeltAdapter(pool, min_interval=0)], relevance, lambda link: False, sink or FakeSink(),
+        queue_size=2, watermarks=watermarks
+    )
+    done = asyncio.run(pipeline.run(queries))
+    return pipeline, done, pool
+
+
+def test_every_query_is_written():
+    sink = FakeSink()
+    responses = {"a": {"articles": _results("a", 3)}, "b": {"articles": _results("b", 2)}}
+    pipeline, done, _ = _run(responses, ["a", "b"], sink)
+    assert sorted(batch.query for batch in done) == ["a", "b"]
+    assert len(sink.links) == 5
+    assert all(metrics["errors"] == 0 for metrics in pipeline.report()["stages"].values())
+
+
+def test_malformed_response_costs_only_its_batch():
+    sink = FakeSink()
+    responses = {"a": {"articles": _results("a", 3)}, "bad": {"articles": ["not an article"]},
+                 "c": {"articles": _results("c", 2)}}
+    pipeline, done, _ = _run(responses, ["a", "bad", "c"], sink)
+    assert sorted(batch.query for batch in done) == ["a", "c"]
+    assert len(sink.links) == 5
+    assert pipeline.report()["stages"]["fetch"]["errors"] == 1
+
+
+def test_failed_request_gives_an_empty_batch():
+    sink = FakeSink()
+    pipeline, done, _ = _run({"a": RuntimeError("503"), "b": {"articles": _results("b", 2)}}, ["a", "b"], sink)
+    assert {batch.query: len(batch.results) for batch in done} == {"a": 0, "b": 2}
+    assert len(sink.links) == 2
+
+
+def test_stage_error_drops_only_its_batch():
+    def relevance(title, snippet, source):
+        if "boom" in title:
+            raise ValueError("scorer failed")
+        return relevant(title, snippet, source)
+
+    sink = FakeSink()
+    responses = {"a": {"articles": _results("a", 3)}, "boom": {"articles": _results("boom", 2)}}
+    pipeline, done, _ = _run(responses, ["a", "boom"], sink, relevance=relevance)
+    assert [batch.query for batch in done] == ["a"]
+    assert pipeline.report()["stages"]["relevance"]["errors"] == 1
+
+
+def test_sink_error_drops_only_its_batch():
+    sink = FakeSink(fail_queries={"a"})
+    responses = {"a": {"articles": _results("a", 3)}, "b": {"articles": _results("b", 2)}}
+    pipeline, done, _ = _run(responses, ["a", "b"], sink)
+    assert [batch.query for batch in done] == ["b"]
+    assert len(sink.links) == 2
+    assert pipeline.report()["stages"]["sink"]["errors"] == 1
+
+
+def test_mark_is_the_newest_publish_time():
+    sink = FakeSink()
+    _run({"a": {"articles": _results("a", 3)}}, ["a"], sink)
+    mark = sink.watermarks[("a", "GDELT")]
+    assert mark["lastPublishedAt"] == (START + timedelta(hours=2)).isoformat()
+    assert mark["fingerprint"]
+
+
+def test_unchanged_fingerprint_skips_per_article_stages():
+    start = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(days=1)
+    responses = {"a": {"articles": _results("a", 3, start)}}
+    first = FakeSink()
+    _run(responses, ["a"], first)
+
+    sink = FakeSink()
+    pipeline, (batch,), pool = _run(responses, ["a"], sink, watermarks=dict(first.watermarks))
+    assert batch.unchanged
+    assert batch.candidates == [] and batch.relevant == []
+    assert batch.watermark is None and sink.watermarks == {}
+    report = pipeline.report()
+    assert (report["incrementalRequests"], report["unchangedResponses"]) == (1, 1)
+    since = start + timedelta(hours=2) - WATERMARK_OVERLAP
+    assert f"startdatetime={since.strftime('%Y%m%d%H%M%S')}" in pool.urls[0]
+
+
+def test_changed_response_never_moves_the_mark_back():
+    stored = {("a", "GDELT"): {"lastPublishedAt": (START + timedelta(days=5)).isoformat(), "fingerprint": "old"}}
+    sink = FakeSink()
+    _, (batch,), _ = _run({"a": {"articles": _results("a", 3)}}, ["a"], sink, watermarks=stored)
+    assert not batch.unchanged and len(batch.relevant) == 3
+    assert sink.watermarks[("a", "GDELT")]["lastPublishedAt"] == stored[("a", "GDELT")]["lastPublishedAt"]
+    assert sink.watermarks[("a", "GDELT")]["fingerprint"] != "old"
+
+
+def test_empty_or_failed_responses_keep_the_mark():
+    stored = {(query, "GDELT"): {"lastPublishedAt": START.isoformat(), "fingerprint": "old"} for query in ("a", "b")}
+    sink = FakeSink()
+    _, done, _ = _run({"a": {"articles": []}, "b": RuntimeError("503")}, ["a", "b"], sink, watermarks=stored)
+    assert [batch.watermark for batch in done] == [None, None]
+    assert sink.watermarks == {}
+
+
+def test_failed_stage_keeps_the_mark():
+    def relevance(title, snippet, source):
+        raise ValueError("scorer failed")
+
+    sink = FakeSink()
+    _, done, _ = _run({"a": {"articles": _results("a", 3)}}, ["a"], sink, relevance=relevance)
+    assert done == [] and sink.watermarks == {}
+
+
+class FakeCollection:
+    def __init__(self, error=None):
+        self.error = error
+        self.updates = []
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.error is not None:
+            raise self.error
+
+        class Result:
+            bulk_api_result = {"writeErrors": [], "nUpserted": len(operations), "nMatched": 0}
+        return Result()
+
+    async def update_one(self, query, update, upsert=False):
+        self.updates.append((query, update))
+
+
+class FakeDb:
+    def __init__(self, write_error):
+        self.news_articles = FakeCollection(write_error)
+        self.news_fetch_watermarks = FakeCollection()
+
+
+def _write_batch(monkeypatch, write_error):
+    import server
+
+    fake_db = FakeDb(write_error)
+    monkeypatch.setattr(server, "db", fake_db)
+    batch = ProviderBatch(GdeltAdapter(FakePool({})), "a", _results("a", 2))
+    batch.relevant = [{"title": f"t{i}", "normalizedLink": f"https://news.example.com/a/{i}"} for i in range(2)]
+    batch.watermark = {"lastPublishedAt": START.isoformat(), "fingerprint": "new"}
+    asyncio.run(server.write_news_batch(batch))
+    return batch, fake_db.news_fetch_watermarks.updates
+
+
+def test_sink_stores_the_mark_once_every_article_is_written(monkeypatch):
+    batch, updates = _write_batch(monkeypatch, None)
+    assert batch.counts["new"] == 2
+    ((query, update),) = updates
+    assert query == {"query": "a", "provider": "GDELT"}
+    assert update["$set"]["fingerprint"] == "new"
+
+
+def test_sink_keeps_the_mark_when_an_article_write_fails(monkeypatch):
+    error = BulkWriteError({"writeErrors": [{"index": 0, "errmsg": "E11000"}], "nUpserted": 1, "nMatched": 0})
+    batch, updates = _write_batch(monkeypatch, error)
+    assert batch.counts["new"] == 1
+    assert updates == []
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+
+from server import iter_json_objects  # noqa: E402
+
+
+def _decode(chunks, **kwargs):
+    async def body():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect():
+        return [item async for item in iter_json_objects(body(), **kwargs)]
+    return asyncio.run(collect())
+
+
+def _split(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+ITEMS = [{"id": i, "title": f"Chip news {i}", "snippet": "wafer, [fab] {x}"} for i in range(20)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, 4096])
+def test_json_array_in_any_chunking(size):
+    assert _decode(_split(json.dumps(ITEMS).encode(), size)) == ITEMS
+
+
+@pytest.mark.parametrize("size", [1, 5, 4096])
+def test_ndjson_in_any_chunking(size):
+    body = "".join(json.dumps(item) + "\r\n" for item in ITEMS).encode()
+    assert _decode(_split(body, size)) == ITEMS
+
+
+def test_multibyte_characters_split_across_chunks():
+    items = [{"title": "Halbleiter – Lieferkette 半導体 🔌"}]
+    assert _decode(_split(json.dumps(items, ensure_ascii=False).encode(), 1)) == items
+
+
+def test_empty_bodies():
+    assert _decode([]) == []
+    assert _decode([b"[]"]) == []
+    assert _decode([b" \n"]) == []
+
+
+def test_rejects_non_objects():
+    with pytest.raises(ValueError, match="expected a JSON object"):
+        _decode([b'[{"title": "a"}, "b"]'])
+
+
+def test_rejects_truncated_body():
+    with pytest.raises(ValueError, match="truncated"):
+        _decode([b'[{"title": "a"}, {"title": "b'])
+
+
+def test_rejects_oversized_items():
+    big = json.dumps({"title": "x" * 500}).encode()
+    with pytest.raises(ValueError, match="larger than"):
+        _decode(_split(big, 100), max_item_bytes=200)
+    assert _decode(_split(big, 100), max_item_bytes=1000) == [{"title": "x" * 500}]
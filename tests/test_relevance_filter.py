@@ -0,0 +1,85 @@
+import random
+
+from relevance_filter import RelevanceFilter, relevance_version, score_relevance
+
+KEYWORDS = ["semiconductor", "chip", "supply chain", "wafer fab", "ic", "lead time"]
+SPAM = ["horoscope", "potato chip", "celebrity gossip"]
+
+TITLES = [
+    "Semiconductor shortage hits chip supply chain",
+    "Potato chip prices rise",
+    "Celebrity gossip: horoscope for the week",
+    "New wafer fab opens in Arizona",
+    "Supply-chain woes: lead times stretch",
+    "Chips and ICs",
+    "Lead time for wafer",
+    "Nothing to see here",
+    "",
+]
+SNIPPETS = ["", "the supply chain for chips", "lead time grows", "music and sports", "Fab wafer output"]
+SOURCES = ["", "Reuters", "Chip News", "Supply Chain Dive"]
+
+
+def _corpus(count=300, seed=7):
+    rnd = random.Random(seed)
+    return [(rnd.choice(TITLES), rnd.choice(SNIPPETS), rnd.choice(SOURCES)) for _ in range(count)]
+
+
+def test_scan_batch_matches_scan():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    items = _corpus()
+    assert matcher.scan_batch(items) == [matcher.scan(*item) for item in items]
+
+
+def test_scan_batch_is_stable_across_batches_and_cache_resets():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    items = _corpus()
+    first = matcher.scan_batch(items)
+    assert matcher.scan_batch(items) == first
+    matcher.word_cache_size = 0
+    matcher.scan_batch(items[:1])  # clears the oversized cache
+    assert matcher.scan_batch(items) == first
+
+
+def test_scan_batch_keeps_input_order_and_empty_batches():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    assert matcher.scan_batch([]) == []
+    hits = matcher.scan_batch([("Nothing to see here", "", ""), ("Chip news", "", "")])
+    assert hits[0].keywords == []
+    assert hits[1].keywords == ["chip"]
+
+
+def test_keywords_match_as_substrings_like_the_original_loops():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    (hits,) = matcher.scan_batch([("Semiconductor news", "", "")])
+    assert hits.keywords == ["ic", "semiconductor"]
+
+
+def test_multi_word_phrases_need_the_whole_phrase():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    spread, together = matcher.scan_batch([
+        ("wafer output at the fab", "", ""),
+        ("new wafer fab", "", ""),
+    ])
+    assert "wafer fab" not in spread.keywords
+    assert together.keywords == ["wafer fab"]
+    assert together.title_keywords == ["wafer fab"]
+
+
+def test_title_hits_exclude_snippet_and_source():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    (hits,) = matcher.scan_batch([("Horoscope", "supply chain update", "Chip News")])
+    assert hits.keywords == ["chip", "supply chain"]
+    assert hits.title_keywords == []
+    assert hits.title_spam == ["horoscope"]
+
+
+def test_check_batch_scores_like_score_relevance():
+    matcher = RelevanceFilter(KEYWORDS, SPAM)
+    items = _corpus(50)
+    assert matcher.check_batch(items) == [score_relevance(matcher.scan(*item)) for item in items]
+
+
+def test_version_ignores_case_order_and_duplicates():
+    assert RelevanceFilter(["Chip", "wafer", "chip "], SPAM).version == relevance_version(["wafer", "chip"], SPAM)
+    assert relevance_version(["chip"], []) != relevance_version([], ["chip"])
@@ -0,0 +1,39 @@
+"""
+RuleBasedRiskEngine output pinned against the engine before the compiled
+trigger matcher: tests/data/risk_engine_baseline.json holds a fixed corpus
+with the score, band, categories, strengths, confidence, time horizon and
+matched triggers the original substring loops produced for each article.
+Dates are old enough that the 48-hour recency bonus never applies.
+"""
+
+import json
+import os
+
+import pytest
+
+from risk_engine import CATEGORY_TRIGGERS, RuleBasedRiskEngine
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "data", "risk_engine_baseline.json")
+
+with open(BASELINE_PATH) as f:
+    CASES = json.load(f)["cases"]
+
+PINNED_FIELDS = ("risk_score", "risk_band", "risk_categories", "category_strength", "confidence", "time_horizon")
+TRIGGERS = {trigger for levels in CATEGORY_TRIGGERS.values() for level in ("strong", "medium") for trigger in levels.get(level, [])}
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return RuleBasedRiskEngine()
+
+
+@pytest.mark.parametrize("case", CASES, ids=[str(i) for i in range(len(CASES))])
+def test_matches_baseline(engine, case):
+    result = engine.analyze(case["article"]).to_dict()
+    expected = case["expected"]
+    assert {name: result[name] for name in PINNED_FIELDS} == {name: expected[name] for name in PINNED_FIELDS}
+    assert sorted(set(result["trigger_terms"]) & TRIGGERS) == expected["matched_triggers"]
+
+
+def test_corpus_covers_every_band():
+    assert {case["expected"]["risk_band"] for case in CASES} == {"LOW", "WATCH", "HIGH", "CRITICAL"}
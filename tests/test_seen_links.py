@@ -0,0 +1,137 @@
+import asyncio
+
+from bson import ObjectId
+
+from seen_links import BloomFilter, SeenLinkIndex
+
+
+def _links(count, prefix="https://news.example.com/story-"):
+    return [f"{prefix}{i}" for i in range(count)]
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(5000, 0.01)
+    links = _links(5000)
+    for link in links:
+        bloom.add(link)
+    assert all(link in bloom for link in links)
+
+
+def test_false_positive_rate_near_configured_rate():
+    bloom = BloomFilter(5000, 0.01)
+    for link in _links(5000):
+        bloom.add(link)
+    false_positives = sum(link in bloom for link in _links(20000, "https://other.example.com/"))
+    assert false_positives / 20000 < 0.02
+
+
+def test_add_reports_new_items_and_counts_them_once():
+    bloom = BloomFilter(100)
+    assert bloom.add("https://a.com/1")
+    assert not bloom.add("https://a.com/1")
+    assert bloom.add("https://a.com/2")
+    assert bloom.count == 2
+    assert "https://a.com/3" not in bloom
+
+
+def test_bits_round_trip():
+    bloom = BloomFilter(1000, 0.01)
+    for link in _links(300):
+        bloom.add(link)
+    restored = BloomFilter(1000, 0.01, bytes(bloom.bits), bloom.count)
+    assert restored.num_bits == bloom.num_bits and restored.num_hashes == bloom.num_hashes
+    assert all(link in restored for link in _links(300))
+    assert restored.fill_ratio() == bloom.fill_ratio() > 0
+
+
+def test_size_follows_capacity_and_error_rate():
+    assert BloomFilter(1000, 0.001).num_bits > BloomFilter(1000, 0.01).num_bits
+    assert BloomFilter(2000, 0.01).num_bits > BloomFilter(1000, 0.01).num_bits
+    assert BloomFilter(0).capacity == 1
+
+
+class FakeArticles:
+    """Just enough of a Motor collection for SeenLinkIndex.catch_up: find by _id $gt, sorted by _id"""
+
+    def __init__(self, links):
+        self.docs = [{"_id": ObjectId(), "normalizedLink": link} for link in links]
+
+    def insert(self, link):
+        self.docs.append({"_id": ObjectId(), "normalizedLink": link})
+
+    def find(self, query, projection=None):
+        since = query.get("_id", {}).get("$gt")
+        docs = [doc for doc in self.docs if since is None or doc["_id"] > since]
+
+        class Cursor:
+            def sort(self, key, direction):
+                docs.sort(key=lambda doc: doc[key])
+                return self
+
+            async def __aiter__(self):
+                for doc in docs:
+                    yield doc
+        return Cursor()
+
+
+class FakeSnapshots:
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        return self.docs.get(query["id"])
+
+    async def replace_one(self, query, doc, upsert=False):
+        self.docs[query["id"]] = doc
+
+
+def test_index_is_permissive_until_loaded():
+    index = SeenLinkIndex(FakeArticles([]), FakeSnapshots(), capacity=100)
+    assert index.might_contain("https://a.com/1")
+    assert index.checks == 0
+
+
+def test_index_builds_snapshots_and_warm_starts():
+    articles, snapshots = FakeArticles(_links(50)), FakeSnapshots()
+
+    async def run():
+        index = SeenLinkIndex(articles, snapshots, capacity=1000)
+        await index.load()
+        assert index.filter.count == 50
+        assert all(index.might_contain(link) for link in _links(50))
+        assert not index.might_contain("https://other.example.com/new")
+        assert index.definitely_new == 1
+
+        articles.insert("https://news.example.com/later")
+        warm = SeenLinkIndex(articles, snapshots, capacity=1000)
+        await warm.load()
+        assert warm.might_contain("https://news.example.com/later")
+        assert warm.filter.count == 51
+        assert snapshots.docs["news_links"]["count"] == 51
+    asyncio.run(run())
+
+
+def test_index_rebuilds_at_twice_the_capacity_when_full():
+    articles = FakeArticles(_links(30))
+
+    async def run():
+        index = SeenLinkIndex(articles, FakeSnapshots(), capacity=20)
+        await index.load()
+        assert index.filter.capacity == 40
+        assert all(index.might_contain(link) for link in _links(30))
+    asyncio.run(run())
+
+
+def test_add_many_marks_the_filter_dirty_only_for_new_links():
+    async def run():
+        snapshots = FakeSnapshots()
+        index = SeenLinkIndex(FakeArticles(_links(5)), snapshots, capacity=100)
+        await index.load()
+        assert not index.dirty
+        index.add_many(_links(5))
+        assert not index.dirty
+        index.add_many(["https://news.example.com/new"])
+        assert index.dirty
+        await index.save()
+        assert not index.dirty and snapshots.docs["news_links"]["count"] == 6
+    asyncio.run(run())
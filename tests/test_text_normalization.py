@@ -0,0 +1,39 @@
+import random
+
+from text_normalization import TEXT_BUDGET_SEPARATOR, apply_text_budget
+
+
+def _words(count, seed=1):
+    rnd = random.Random(seed)
+    return " ".join("".join(rnd.choice("abcdef") for _ in range(rnd.randint(2, 9))) for _ in range(count))
+
+
+def test_short_content_is_unchanged():
+    assert apply_text_budget("chip shortage", 1000) == ("chip shortage", False)
+    assert apply_text_budget(_words(5000), 0) == (_words(5000), False)
+
+
+def test_budget_bounds_length_and_keeps_whole_words():
+    content = _words(5000)
+    text, truncated = apply_text_budget(content, 1000)
+    assert truncated
+    assert len(text) <= 1000 + 4 * len(TEXT_BUDGET_SEPARATOR)
+    words = set(content.split())
+    assert all(word in words for part in text.split(TEXT_BUDGET_SEPARATOR) for word in part.split())
+
+
+def test_lead_and_end_are_kept():
+    content = "lead paragraph about allocation\n" + _words(5000) + " final words here"
+    text, _ = apply_text_budget(content, 1000)
+    assert text.startswith("lead paragraph about allocation")
+    assert text.endswith("final words here")
+
+
+def test_content_without_whitespace_is_hard_cut():
+    text, truncated = apply_text_budget("x" * 20000, 1000)
+    assert truncated
+    assert 600 <= len(text.replace(TEXT_BUDGET_SEPARATOR, "")) <= 1000
+
+    text, _ = apply_text_budget("半导体短缺" * 6000, 2000)
+    assert text.startswith("半导体短缺")
+    assert len(text.replace(TEXT_BUDGET_SEPARATOR, "")) <= 2000
@@ -0,0 +1,93 @@
+"""
+VectorizedRiskEngine must produce exactly what RuleBasedRiskEngine.analyze
+produces, including where multi-word phrases meet punctuation, line breaks
+and word boundaries.
+"""
+
+import json
+import os
+
+import pytest
+
+from risk_engine import RuleBasedRiskEngine, VectorizedRiskEngine
+from text_normalization import TEXT_BUDGET_SEPARATOR
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "data", "risk_engine_baseline.json")
+
+with open(BASELINE_PATH) as f:
+    BASELINE_ARTICLES = [case["article"] for case in json.load(f)["cases"]]
+
+CUSTOM_TRIGGERS = {
+    "SUPPLY_SHORTAGE": {
+        "strong": ["out of stock", "end-of-life", "allocation"],
+        "medium": ["lead time", "stock"],
+    },
+    "GEOPOLITICAL": {
+        "strong": ["u.s. export controls", "export controls"],
+        "medium": ["tariff", "trade war"],
+    },
+}
+
+SEPARATOR_TEXTS = [
+    "Parts are out of stock at every distributor",
+    "OUT OF STOCK: controllers",
+    "out of stock, again; lead time 52 weeks",
+    "Out of\nstock through Q3",
+    "out  of stock (two spaces)",
+    "out of\tstock",
+    "the blackout of stockpiles",  # the phrase spans the inside of three words
+    "outof stock",
+    "lead-time grows; lead time grows",
+    "end-of-life notice and end of life notice",
+    "U.S. export controls tighten",
+    "new us export controls",
+    "trade war" + TEXT_BUDGET_SEPARATOR + "tariff",
+    "allocation...allocation",
+    "",
+]
+
+
+def _articles(texts):
+    articles = []
+    for i, text in enumerate(texts):
+        articles.append({"title": text, "fullContent": "", "source": {"name": "Wire"}, "iso_date": "2020-01-01"})
+        articles.append({"title": f"Update {i}", "fullContent": text, "source": "Wire", "iso_date": "2020-01-01"})
+    # A phrase split between title and body
+    articles.append({"title": "Distributors report parts out of", "fullContent": "stock for weeks", "iso_date": "2020-01-01"})
+    return articles
+
+
+def _assert_parity(rule, vectorized, articles):
+    expected = [rule.analyze(article).to_dict() for article in articles]
+    assert [result.to_dict() for result in vectorized.analyze_batch(articles)] == expected
+
+
+def test_baseline_corpus_parity():
+    _assert_parity(RuleBasedRiskEngine(), VectorizedRiskEngine(), BASELINE_ARTICLES)
+
+
+def test_builtin_triggers_across_separators():
+    _assert_parity(RuleBasedRiskEngine(), VectorizedRiskEngine(), _articles(SEPARATOR_TEXTS))
+
+
+def test_custom_multi_word_phrases_across_separators():
+    rule = RuleBasedRiskEngine(CUSTOM_TRIGGERS)
+    vectorized = VectorizedRiskEngine(CUSTOM_TRIGGERS)
+    articles = _articles(SEPARATOR_TEXTS)
+    _assert_parity(rule, vectorized, articles)
+    # The cases above exercise both outcomes of a multi-word phrase
+    terms = [set(rule.analyze(article).to_dict()["trigger_terms"]) for article in articles]
+    assert any("out of stock" in found for found in terms)
+    assert any("stock" in found and "out of stock" not in found for found in terms)
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 5000])
+def test_results_do_not_depend_on_batching(batch_size):
+    articles = _articles(SEPARATOR_TEXTS) + BASELINE_ARTICLES[:20]
+    _assert_parity(RuleBasedRiskEngine(), VectorizedRiskEngine(batch_size=batch_size), articles)
+
+
+def test_text_budget_parity():
+    long_text = " ".join(["filler words"] * 2000 + ["out of stock"] + ["more filler"] * 2000)
+    articles = _articles([long_text, "lead time " * 500])
+    _assert_parity(RuleBasedRiskEngine(text_budget=1000), VectorizedRiskEngine(text_budget=1000), articles)